@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+"""
+Banco de pruebas del rendimiento de la simulación de Logix.
+
+Ejecuta el sistema con semillas fijas para cada escenario, en un proceso nuevo por escenario, y registra el tiempo
+de ejecución, los eventos programados por segundo, la memoria máxima y la cantidad de filas de datos en un archivo
+.json. Dos archivos de resultados pueden compararse para detectar regresiones. La memoria máxima no se mide en
+plataformas sin el módulo resource, como Windows.
+
+Uso:
+    python benchmarks/benchmark_logix.py ejecutar resultados.json [--escenarios dia semana] [--repeticiones 3]
+    python benchmarks/benchmark_logix.py comparar base.json nuevo.json [--umbral 0.1]
+"""
+
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import multiprocessing
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+import logix
+
+# Escenarios del banco de pruebas: nombre, horizonte y opciones del sistema. Los escenarios de alta carga reducen
+# el tiempo entre llegadas de camiones o amplían la capacidad del sistema
+ESCENARIOS = [
+    ("dia", "dia", {}),
+    ("semana", "semana", {}),
+    ("mes", "mes", {}),
+    ("semana eventos", "semana", {"esperas_por_eventos": True}),
+    ("semana llegadas x2", "semana", {"llegadas": logix.LlegadasUniformes(escala=2)}),
+    ("semana llegadas x5", "semana", {"llegadas": logix.LlegadasUniformes(escala=5)}),
+    ("semana capacidad 40", "semana", {"capacidad_sistema": 40}),
+    ("semana llegadas x2 capacidad 40", "semana", {"llegadas": logix.LlegadasUniformes(escala=2),
+                                                   "capacidad_sistema": 40})]
+
+SEMILLA = 55
+
+
+def medir_escenario(tarea):
+    """
+    Ejecuta una replica del escenario y mide su ejecución. Se ejecuta en un proceso nuevo, de modo que la
+    memoria máxima del proceso corresponde solo al escenario.
+
+    :type tarea: tuple
+    """
+    horizonte, opciones, semilla = tarea
+
+    sistema = logix.Sistema(conservar_datos=False, semilla=semilla, **opciones)
+    registro = sistema.agregar_registro(logix.RegistroResumen())
+
+    # Los eventos programados se cuentan envolviendo la programación de eventos del sistema
+    eventos = [0]
+    programar = sistema.schedule
+
+    def programar_contando(evento, *argumentos):
+        eventos[0] += 1
+        programar(evento, *argumentos)
+
+    sistema.schedule = programar_contando
+
+    inicio = time.time()
+    sistema.ejecutar_replica(horizonte)
+    tiempo = time.time() - inicio
+
+    return {"Tiempo": tiempo,
+            "Eventos": eventos[0],
+            "Eventos por segundo": eventos[0] / tiempo if tiempo else float("nan"),
+            "Memoria maxima (KB)": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource else None,
+            "Filas": registro.filas_registradas}
+
+
+def memoria(kilobytes):
+    """
+    Formatea la memoria máxima de una medición, que no se mide en plataformas sin el módulo resource.
+
+    :type kilobytes: int
+    """
+    return "-" if kilobytes is None else "%d" % kilobytes
+
+
+def ejecutar(archivo, escenarios=None, repeticiones=1):
+    """
+    Ejecuta los escenarios indicados, por defecto todos, y guarda los resultados en un archivo .json.
+    Con varias repeticiones se conserva la medición de menor tiempo.
+
+    :type archivo: str
+    :type escenarios: list
+    :type repeticiones: int
+    """
+    resultados = {"Python": platform.python_version(),
+                  "Plataforma": platform.platform(),
+                  "Fecha": time.strftime("%Y-%m-%d %H:%M:%S"),
+                  "Semilla": SEMILLA,
+                  "Escenarios": {}}
+
+    for nombre, horizonte, opciones in ESCENARIOS:
+        if escenarios and nombre not in escenarios:
+            continue
+
+        mediciones = []
+        for _ in range(repeticiones):
+            grupo = multiprocessing.Pool(1)
+            try:
+                mediciones.append(grupo.apply(medir_escenario, ((horizonte, opciones, SEMILLA),)))
+            finally:
+                grupo.close()
+                grupo.join()
+
+        medicion = min(mediciones, key=lambda m: m["Tiempo"])
+        medicion["Horizonte"] = horizonte
+        medicion["Opciones"] = dict((opcion, valor if isinstance(valor, (bool, int, float)) else repr(valor))
+                                    for opcion, valor in opciones.items())
+        resultados["Escenarios"][nombre] = medicion
+
+        print("%-35s %10.2f s %12.0f eventos/s %10s KB %8d filas"
+              % (nombre, medicion["Tiempo"], medicion["Eventos por segundo"], memoria(medicion["Memoria maxima (KB)"]),
+                 medicion["Filas"]))
+
+    with open(archivo, "w") as salida:
+        json.dump(resultados, salida, indent=2, sort_keys=True)
+
+    return resultados
+
+
+def comparar(archivo_base, archivo_nuevo, umbral=0.1):
+    """
+    Compara dos archivos de resultados. Un escenario presenta una regresión si su tiempo o su memoria máxima
+    aumentan en más del umbral relativo, o si cambia su cantidad de filas. La memoria solo se compara si fue medida
+    en ambos archivos. Retorna la lista de regresiones.
+
+    :type archivo_base: str
+    :type archivo_nuevo: str
+    :type umbral: float
+    """
+    with open(archivo_base) as entrada:
+        base = json.load(entrada)["Escenarios"]
+    with open(archivo_nuevo) as entrada:
+        nuevo = json.load(entrada)["Escenarios"]
+
+    regresiones = []
+
+    print("%-35s %10s %10s %8s %10s %10s %8s" % ("Escenario", "Base (s)", "Nuevo (s)", "Cambio",
+                                               "Base (KB)", "Nuevo (KB)", "Cambio"))
+
+    for nombre in sorted(set(base) & set(nuevo)):
+        b, n = base[nombre], nuevo[nombre]
+        cambio_tiempo = n["Tiempo"] / b["Tiempo"] - 1
+        cambio_memoria = None
+        texto_memoria = "-"
+        if b["Memoria maxima (KB)"] is not None and n["Memoria maxima (KB)"] is not None:
+            cambio_memoria = float(n["Memoria maxima (KB)"]) / b["Memoria maxima (KB)"] - 1
+            texto_memoria = "%+.1f%%" % (100 * cambio_memoria)
+
+        print("%-35s %10.2f %10.2f %+7.1f%% %10s %10s %8s"
+              % (nombre, b["Tiempo"], n["Tiempo"], 100 * cambio_tiempo, memoria(b["Memoria maxima (KB)"]),
+                 memoria(n["Memoria maxima (KB)"]), texto_memoria))
+
+        if cambio_tiempo > umbral:
+            regresiones.append((nombre, "Tiempo", cambio_tiempo))
+        if cambio_memoria is not None and cambio_memoria > umbral:
+            regresiones.append((nombre, "Memoria maxima (KB)", cambio_memoria))
+        if n["Filas"] != b["Filas"]:
+            regresiones.append((nombre, "Filas", n["Filas"] - b["Filas"]))
+
+    for nombre in sorted(set(base) ^ set(nuevo)):
+        print("%-35s solo en %s" % (nombre, archivo_base if nombre in base else archivo_nuevo))
+
+    for nombre, medida, cambio in regresiones:
+        print("REGRESION %s: %s %s" % (nombre, medida, cambio))
+
+    return regresiones
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Banco de pruebas del rendimiento de Logix")
+    comandos = parser.add_subparsers(dest="comando")
+
+    parser_ejecutar = comandos.add_parser("ejecutar", help="Ejecuta los escenarios y guarda los resultados")
+    parser_ejecutar.add_argument("archivo")
+    parser_ejecutar.add_argument("--escenarios", nargs="+", choices=[e[0] for e in ESCENARIOS])
+    parser_ejecutar.add_argument("--repeticiones", type=int, default=1)
+
+    parser_comparar = comandos.add_parser("comparar", help="Compara dos archivos de resultados")
+    parser_comparar.add_argument("base")
+    parser_comparar.add_argument("nuevo")
+    parser_comparar.add_argument("--umbral", type=float, default=0.1)
+
+    argumentos = parser.parse_args()
+
+    if argumentos.comando == "ejecutar":
+        ejecutar(argumentos.archivo, argumentos.escenarios, argumentos.repeticiones)
+    else:
+        sys.exit(1 if comparar(argumentos.base, argumentos.nuevo, argumentos.umbral) else 0)
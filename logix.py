@@ -7,9 +7,53 @@ SIMULACIÓN DE OPERACIONES LOGÍSTICAS EN ALPASUR S.A. - KEMFA S.A.
 """
 
 import os
+import sys
+import io
+import zipfile
+import array
+import hashlib
 import simpy
 import random
 import csv
+import json
+import collections
+import multiprocessing
+import time
+import math
+import bisect
+import heapq
+import inspect
+import functools
+import pickle
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Tiempo de simulación en minutos para cada horizonte
+HORIZONTES = {"dia": 24 * 60, "semana": 3 * 24 * 60, "mes": 4 * 6 * 24 * 60}
+
+# Columnas de las filas de datos registradas por las operaciones
+COLUMNAS_DATOS = ["Camion", "Carga", "Tipo", "Peso Final", "Operacion", "Recurso", "Dia",
+                  "Arribo", "Espera M. O/D", "Espera R", "Espera P.", "Espera T.", "Inicio", "Fin",
+                  "Medio de Almacenamiento", "Nivel"]
+
+# Códigos de carga con los que se identifican los camiones
+CODIGOS_CARGA = {"Harina de Soya - Hi Pro/Pellet de Soya": "HP", "Harina de Soya - Full Fat": "FF",
+                 "Torta de Soya": "TS", "Torta de Girasol": "TS", "Aceite de Soya": "AS", "Grano de Soya": "GS",
+                 "Azucar": "AZ", "Fierro": "FI", "Contenedor 20": "C2", "Contenedor 40": "C4"}
+
+# Tipo de cada columna en los registros columnares. Las columnas "categoria" se guardan como códigos enteros
+# junto a la lista de categorias, y los valores "-" de las columnas "f8" se guardan como NaN
+TIPOS_COLUMNAS_DATOS = {"Camion": "i8", "Carga": "categoria", "Tipo": "categoria", "Peso Final": "f8",
+                        "Operacion": "categoria", "Recurso": "categoria", "Dia": "i4", "Arribo": "f8",
+                        "Espera M. O/D": "f8", "Espera R": "f8", "Espera P.": "f8", "Espera T.": "f8",
+                        "Inicio": "f8", "Fin": "f8", "Medio de Almacenamiento": "categoria", "Nivel": "f8"}
+
+# Columnas del resumen de cada camion, generado cuando el camion concluye su atencion y sale de la instalacion
+COLUMNAS_CAMIONES = ["Camion", "Carga", "Tipo", "Peso Final", "Llegada", "Salida", "Tiempo en sistema",
+                     "Espera T.", "Transbordo"]
 
 
 class Sistema(simpy.Environment):
@@ -18,272 +62,137 @@ class Sistema(simpy.Environment):
     Subclase de simpy.Environment
     """
 
-    def __init__(self):
+    def __init__(self, esperas_por_eventos=False, traza=None, conservar_datos=True, flujos_independientes=True,
+                 capacidad_sistema=20, longitud_cola_aceptable=10, longitud_cola_aceptable_cuadrillas=8,
+                 muestreo_por_bloques=False, configuracion=None, semilla=55, perfilador=None,
+                 llegadas=None):
         """
         Definicion del sistema de forma predeterminada en su estado original
+
+        :type esperas_por_eventos: bool
+        :type traza: Traza
+        :type conservar_datos: bool
+        :type flujos_independientes: bool
+        :type capacidad_sistema: int
+        :type longitud_cola_aceptable: int
+        :type longitud_cola_aceptable_cuadrillas: int
+        :type muestreo_por_bloques: bool
+        :type configuracion: Configuracion
+        :type semilla: int
+        :type perfilador: Perfilador
+        :type llegadas: ProcesoLlegadas
         """
         super(Sistema, self).__init__()
 
-        self.datos = []
-
-        self.productos = ["Harina de Soya - Hi Pro/Pellet de Soya", "Harina de Soya - Full Fat", "Torta de Soya",
-                          "Torta de Girasol", "Aceite de Soya", "Grano de Soya",
-                          "Azucar", "Fierro", "Contenedor 20", "Contenedor 40"]
-
-        self.colas_espera_transbordo = {
-            "Harina de Soya - Hi Pro/Pellet de Soya":
-                {"Descarga": [], "Carga": []},
-            "Harina de Soya - Full Fat":
-                {"Descarga": [], "Carga": []},
-            "Torta de Soya":
-                {"Descarga": [], "Carga": []},
-            "Torta de Girasol":
-                {"Descarga": [], "Carga": []},
-            "Grano de Soya":
-                {"Descarga": [], "Carga": []},
-            "Azucar":
-                {"Descarga": [], "Carga": []},
-            "Fierro":
-                {"Descarga": [], "Carga": []}
-        }
+        # Número de eventos programados, con el que se ordenan los eventos programados para un mismo tiempo
+        self.eventos_programados = 0
+
+        # Opciones con las que se crea el sistema, necesarias para restaurarlo desde un punto de control
+        self.opciones = {"esperas_por_eventos": esperas_por_eventos, "conservar_datos": conservar_datos,
+                         "flujos_independientes": flujos_independientes, "capacidad_sistema": capacidad_sistema,
+                         "longitud_cola_aceptable": longitud_cola_aceptable,
+                         "longitud_cola_aceptable_cuadrillas": longitud_cola_aceptable_cuadrillas,
+                         "muestreo_por_bloques": muestreo_por_bloques, "llegadas": llegadas}
+
+        # Cambios de políticas durante la simulación, con el tiempo en que se realizan, que se repiten al
+        # restaurar el sistema desde un punto de control
+        self.cambios_politicas = []
+
+        # Configuración de la instalación, por defecto la de ALPASUR S.A.
+        self.configuracion = configuracion if configuracion is not None else cargar_configuracion()
+
+        # Longitudes de cola a partir de las cuales se buscan alternativas de manipuleo de granos
+        self.longitud_cola_aceptable = longitud_cola_aceptable
+        self.longitud_cola_aceptable_cuadrillas = longitud_cola_aceptable_cuadrillas
+
+        # Si es verdadero, las llegadas, cargas, tipos y tiempos de servicio de cada operación usan flujos de
+        # números aleatorios independientes. En caso contrario comparten un único flujo, como en la version 1.2
+        self.flujos_independientes = flujos_independientes
+        self.flujos_aleatorios = {}
+
+        # Si es verdadero, las llegadas y los tiempos de servicio se leen de bloques de muestras generados con NumPy
+        if muestreo_por_bloques and not flujos_independientes:
+            raise ValueError("El muestreo por bloques requiere flujos independientes")
+        self.muestreo_por_bloques = muestreo_por_bloques
+
+        # Filas de datos en memoria. Si no se conservan, las filas solo se envian a los registros
+        self.datos = [] if conservar_datos else None
+        self.datos_camiones = [] if conservar_datos else None
+        self.registros = []
+
+        # Registro de mensajes de la simulación, por defecto solo de errores
+        self.traza = traza if traza is not None else Traza()
+
+        # Medición opcional de llamadas, tiempos y eventos durante la ejecución de las replicas
+        self.perfilador = perfilador
+
+        # Proceso de generación de camiones, iniciado una sola vez
+        self.generacion = None
+
+        # Si es verdadero, los camiones en espera duermen hasta que se emite alguna de las señales de las que
+        # depende su verificación o vence su paciencia, en lugar de verificar la disponibilidad minuto a minuto.
+        # El reloj de esperas los despierta en la posición de la verificación minuto a minuto que corresponde,
+        # por lo que los resultados no cambian
+        self.esperas_por_eventos = esperas_por_eventos
+        self.reloj_esperas = RelojDeEsperas(self) if esperas_por_eventos else None
+
+        # Versión del estado del sistema, incrementada con cada señal emitida
+        self.version_estado = 0
+
+        # Señales publicadas con cualquier cambio de estado del sistema y cuando un camion pasa a transbordo
+        self.cambio_estado = Senal(self)
+        self.inicio_transbordo = Senal(self)
+
+        self.productos = list(self.configuracion.productos)
+
+        self.colas_espera_transbordo = dict(
+            (producto, {"Descarga": [], "Carga": []}) for producto in self.configuracion.productos_transbordo)
 
         self.camiones_en_sistema = []
-        self.capacidad_sistema = 20
+        self.capacidad_sistema = capacidad_sistema
+
+        # Proceso de llegadas de camiones, por defecto entre 5 y 15 minutos entre llegadas
+        self.llegadas = llegadas if llegadas is not None else LlegadasUniformes()
+
+        # Camiones en sistema pendientes de manipuleo, por carga y tipo, y por medios de destino y tipo
+        self.camiones_pendientes = {}
+
+        # Señales publicadas cuando se libera capacidad o cambian las existencias del sistema
+        self.capacidad_liberada = Senal(self)
+        self.existencias_modificadas = Senal(self)
 
         # Definición de Recursos de Atención
-        horarios = {
-            "horario 1": {"L-V": {"Ingreso": 7.5, "I. Descanso": 13.0, "F. Descanso": 14.0, "Salida": 16.5},
-                          "SAB": {"Ingreso": 8.5, "Salida": 12.5}},
-            "horario 2": {"L-V": {"Ingreso": 8.0, "I. Descanso": 12.0, "F. Descanso": 13.0, "Salida": 17.0},
-                          "SAB": {"Ingreso": 8.5, "Salida": 12.5}}
-        }
-
-        self.recursos_atencion = {
-            "Ventanilla Recepcion":
-                Recurso(self, "Ventanilla Recepcion",
-                        horarios["horario 1"],
-                        capacity=1),
-            "Ventanilla Despacho":
-                Recurso(self, "Ventanilla Despacho",
-                        horarios["horario 1"],
-                        capacity=1),
-            "Balanza 2":
-                Recurso(self, "Balanza 2",
-                        horarios["horario 1"],
-                        capacity=1),
-            "Estacion Volcadora":
-                Recurso(self, "Estacion Volcadora",
-                        horarios["horario 2"],
-                        capacity=1),
-            "Estacion Tolva/Balanza 3":
-                Recurso(self, "Estacion Tolva/Balanza 3",
-                        horarios["horario 2"],
-                        capacity=1),
-            "Pala Mecanica":
-                Recurso(self, "Pala Mecanica",
-                        horarios["horario 2"],
-                        capacity=1),
-            "Cuadrilla de Estibaje":
-                Recurso(self, "Cuadrillas de Estibaje",
-                        horarios["horario 2"],
-                        capacity=3),
-            "Cabina de Recepcion - T1":
-                Recurso(self, "Cabina de Recepcion - T1",
-                        horarios["horario 2"],
-                        capacity=1),
-            "Cabina de Despacho - T1":
-                Recurso(self, "Cabina de Despacho - T1",
-                        horarios["horario 2"],
-                        capacity=1),
-            "Cabina de Recepcion - T2":
-                Recurso(self, "Cabina de Recepcion - T2",
-                        horarios["horario 2"],
-                        capacity=1),
-            "Cabina de Despacho - T2":
-                Recurso(self, "Cabina de Despacho - T2",
-                        horarios["horario 2"],
-                        capacity=1),
-            "Grua":
-                Recurso(self, "Grua",
-                        horarios["horario 2"],
-                        capacity=1)}
+        calendarios = self.configuracion.calendarios
+
+        self.recursos_atencion = dict(
+            (recurso.clave, Recurso(self, recurso.nombre, calendarios[recurso.horario], capacity=recurso.capacidad))
+            for recurso in self.configuracion.recursos)
 
         # Definición de medios de almacenamiento
-        niv_tolva = {
-            "Harina de Soya - Hi Pro/Pellet de Soya": 0
-        }
-        niv_almacen_1 = {
-            "Harina de Soya - Hi Pro/Pellet de Soya": 500
-        }
-        niv_almacen_2 = {
-            "Harina de Soya - Full Fat": 100,
-            "Torta de Soya": 100,
-            "Torta de Girasol": 100,
-            "Azucar": 100
-        }
-        niv_almacen_ext = {
-            "Grano de Soya": 0
-        }
-        niv_tanque_1 = {
-            "Aceite de Soya": 0
-        }
-        niv_tanque_2 = {
-            "Aceite de Soya": 0
-        }
-        niv_patio_cont = {
-            "Contenedor 20": 0,
-            "Contenedor 40": 0
-        }
-        self.medios_almacenamiento = {
-            "Tolva":
-                MedioDeAlmacenamiento(self, "Tolva", 2, niv_tolva, 400),
-            "Almacen 1":
-                MedioDeAlmacenamiento(self, "Almacen 1", 3, niv_almacen_1, 2500),
-            "Almacen 2":
-                MedioDeAlmacenamiento(self, "Almacen 2", 1, niv_almacen_2, 1500),
-            "Almacen Ext":
-                MedioDeAlmacenamiento(self, "Almacen Ext", 3, niv_almacen_ext, 1500),
-            "Tanque 1":
-                MedioDeAlmacenamiento(self, "Tanque 1", 2, niv_tanque_1, 400),
-            "Tanque 2":
-                MedioDeAlmacenamiento(self, "Tanque 2", 2, niv_tanque_2, 500),
-            "Patio de Contenedores":
-                MedioDeAlmacenamiento(self, "Patio de Contenedores", 1, niv_patio_cont, 2500)}
-
-        # Definicion de Operaciones # TODO Ingresar datos reales
-        operaciones_manipuleo = {
-            "Descarga con volcadora":
-                OperacionManipuleo("Descarga con volcadora",
-                                   self.recursos_atencion["Estacion Volcadora"],
-                                   "uniforme", [14, 20],
-                                   self.datos),
-            "Descarga a pulso - Sacos":
-                OperacionManipuleo("Descarga a pulso - Sacos",
-                                   self.recursos_atencion["Cuadrilla de Estibaje"],
-                                   "uniforme", [30, 45],
-                                   self.datos),
-            "Descarga a pulso - Granos":
-                OperacionManipuleo("Descarga a pulso - Granos",
-                                   self.recursos_atencion["Cuadrilla de Estibaje"],
-                                   "uniforme", [40, 60],
-                                   self.datos),
-            "Descarga con bombas electricas - T1":
-                OperacionManipuleo("Descarga con bombas electricas",
-                                   self.recursos_atencion["Cabina de Recepcion - T1"],
-                                   "uniforme", [40, 50],
-                                   self.datos),
-            "Descarga con bombas electricas - T2":
-                OperacionManipuleo("Descarga con bombas electricas",
-                                   self.recursos_atencion["Cabina de Recepcion - T2"],
-                                   "uniforme", [40, 50],
-                                   self.datos),
-            "Descarga con grua":
-                OperacionManipuleo("Descarga con grua",
-                                   self.recursos_atencion["Grua"],
-                                   "uniforme", [15, 20],
-                                   self.datos),
-            "Carga con tolva":
-                OperacionManipuleo("Carga con tolva",
-                                   self.recursos_atencion["Estacion Tolva/Balanza 3"],
-                                   "uniforme", [14, 20],
-                                   self.datos),
-            "Carga con pala mecanica":
-                OperacionManipuleo("Carga con pala mecanica",
-                                   self.recursos_atencion["Pala Mecanica"],
-                                   "uniforme", [18, 30],
-                                   self.datos),
-            "Carga a pulso - Sacos":
-                OperacionManipuleo("Carga a pulso - Sacos",
-                                   self.recursos_atencion["Cuadrilla de Estibaje"],
-                                   "uniforme", [45, 70],
-                                   self.datos),
-            "Carga a pulso - Granos":
-                OperacionManipuleo("Carga a pulso - Granos",
-                                   self.recursos_atencion["Cuadrilla de Estibaje"],
-                                   "uniforme", [60, 90],
-                                   self.datos),
-            "Carga con bombas electricas - T1":
-                OperacionManipuleo("Carga con bombas electricas",
-                                   self.recursos_atencion["Cabina de Despacho - T1"],
-                                   "uniforme", [45, 60],
-                                   self.datos),
-            "Carga con bombas electricas - T2":
-                OperacionManipuleo("Carga con bombas electricas",
-                                   self.recursos_atencion["Cabina de Despacho - T2"],
-                                   "uniforme", [45, 60],
-                                   self.datos),
-            "Carga con grua":
-                OperacionManipuleo("Carga con grua",
-                                   self.recursos_atencion["Grua"],
-                                   "uniforme", [15, 22],
-                                   self.datos),
-            "Transbordo en sistema mecanizado (D)":
-                OperacionManipuleo("Transbordo en sistema mecanizado (D)",
-                                   self.recursos_atencion["Estacion Volcadora"],
-                                   "uniforme", [14, 25],
-                                   self.datos),
-            "Transbordo en sistema mecanizado (C)":
-                OperacionManipuleo("Transbordo en sistema mecanizado (C)",
-                                   self.recursos_atencion["Estacion Tolva/Balanza 3"],
-                                   "uniforme", [14, 25],
-                                   self.datos),
-            "Transbordo a pulso - Sacos":
-                OperacionManipuleo("Transbordo a pulso - Sacos",
-                                   self.recursos_atencion["Cuadrilla de Estibaje"],
-                                   "uniforme", [40, 60],
-                                   self.datos),
-            "Transbordo a pulso - Granos":
-                OperacionManipuleo("Transbordo a pulso - Sacos",
-                                   self.recursos_atencion["Cuadrilla de Estibaje"],
-                                   "uniforme", [45, 65],
-                                   self.datos),
-            "Transbordo con grua":
-                OperacionManipuleo("Transbordo con grua",
-                                   self.recursos_atencion["Grua"],
-                                   "uniforme", [15, 20],
-                                   self.datos)}
-
-        operaciones_complementarias = {
-            "Atencion recepcion 1":
-                Operacion("Atencion recepcion 1",
-                          self.recursos_atencion["Ventanilla Recepcion"],
-                          "uniforme", [2, 10],
-                          self.datos),
-            "Atencion despacho 1":
-                Operacion("Atencion despacho 1",
-                          self.recursos_atencion["Ventanilla Despacho"],
-                          "uniforme", [2, 10],
-                          self.datos),
-            "Primer pesaje":
-                Operacion("Primer pesaje",
-                          self.recursos_atencion["Balanza 2"],
-                          "uniforme", [3, 6],
-                          self.datos),
-            "Segundo pesaje":
-                Operacion("Segundo pesaje",
-                          self.recursos_atencion["Balanza 2"],
-                          "uniforme", [3, 6],
-                          self.datos),
-            "Primer pesaje - B3":
-                Operacion("Primer pesaje - B3",
-                          self.recursos_atencion["Estacion Tolva/Balanza 3"],
-                          "uniforme", [3, 6],
-                          self.datos),
-            "Segundo pesaje - B3":
-                Operacion("Segundo pesaje -B3",
-                          self.recursos_atencion["Estacion Tolva/Balanza 3"],
-                          "uniforme", [3, 6],
-                          self.datos),
-            "Atencion recepcion 2":
-                Operacion("Atencion recepcion 2",
-                          self.recursos_atencion["Ventanilla Recepcion"],
-                          "uniforme", [4, 8],
-                          self.datos),
-            "Atencion despacho 2":
-                Operacion("Atencion despacho 2",
-                          self.recursos_atencion["Ventanilla Despacho"],
-                          "uniforme", [2, 5],
-                          self.datos)}
+        self.medios_almacenamiento = dict(
+            (medio.nombre, MedioDeAlmacenamiento(self, medio.nombre, medio.espacios_de_atencion, dict(medio.niveles),
+                                                 medio.capacidad))
+            for medio in self.configuracion.medios_almacenamiento)
+
+        # Indice de medios de almacenamiento por producto. Los productos con los mismos medios de
+        # almacenamiento comparten la misma tupla
+        self.medios_por_producto = {}
+        grupos_de_medios = {}
+        for producto, nombres_medios in self.configuracion.medios_por_producto:
+            if nombres_medios not in grupos_de_medios:
+                grupos_de_medios[nombres_medios] = tuple(self.medios_almacenamiento[ma] for ma in nombres_medios)
+            self.medios_por_producto[producto] = grupos_de_medios[nombres_medios]
+
+        # Definicion de Operaciones
+        operaciones_manipuleo = dict(
+            (operacion.clave, OperacionManipuleo(operacion.nombre, self.recursos_atencion[operacion.recurso],
+                                                 operacion.distribucion, operacion.parametros))
+            for operacion in self.configuracion.operaciones_manipuleo)
+
+        operaciones_complementarias = dict(
+            (operacion.clave, Operacion(operacion.nombre, self.recursos_atencion[operacion.recurso],
+                                        operacion.distribucion, operacion.parametros))
+            for operacion in self.configuracion.operaciones_complementarias)
 
         # Diccionario general de operaciones
         self.operaciones = {
@@ -292,40 +201,118 @@ class Sistema(simpy.Environment):
             "Operaciones complementarias":
                 operaciones_complementarias}
 
+        self.sembrar(semilla)
+
+    def schedule(self, event, priority=simpy.events.NORMAL, delay=0):
+        """
+        Programa un evento con la prioridad y demora indicadas, igual que simpy.Environment, numerando los
+        eventos con el contador propio del sistema para que el reloj de esperas pueda ubicar entre ellos las
+        verificaciones que no programa.
+
+        :type event: simpy.events.Event
+        :type priority: int
+        :type delay: float
+        """
+        heapq.heappush(self._queue, (self._now + delay, priority, self.eventos_programados, event))
+        self.eventos_programados += 1
+
+    def programar_en(self, evento, tiempo, orden, valor=None):
+        """
+        Dispara un evento para que sea procesado en el tiempo indicado, ubicado entre los eventos de ese tiempo
+        como si hubiese sido programado con el número de orden indicado, que puede ser fraccionario.
+
+        :type evento: simpy.events.Event
+        :type tiempo: float
+        :type orden: float
+        """
+        evento._ok = True
+        evento._value = valor
+        heapq.heappush(self._queue, (tiempo, simpy.events.NORMAL, orden, evento))
+
+    def step(self):
+        """
+        Procesa el siguiente evento. En esperas por eventos, el reloj de esperas registra antes su posición.
+        """
+        if self.reloj_esperas is not None:
+            self.reloj_esperas.antes_de_procesar(self._queue)
+
+        simpy.Environment.step(self)
+
+    def flujo_aleatorio(self, nombre):
+        """
+        Obtiene el flujo de números aleatorios con el nombre indicado.
+
+        :type nombre: str
+        """
+        return self.flujos_aleatorios[nombre if self.flujos_independientes else "Sistema"]
+
+    def sembrar(self, semilla):
+        """
+        Inicializa los flujos de números aleatorios del sistema a partir de una semilla.
+        La semilla de cada flujo depende solo de la semilla y del nombre del flujo, de forma que dos sistemas
+        con la misma semilla generan las mismas llegadas aunque difieran en el resto de su configuración.
+
+        :type semilla: int
+        """
+        self.semilla = semilla
+        self.tiempo_siembra = self.now
+
+        if self.flujos_independientes:
+            self.flujos_aleatorios = {}
+
+            for nombre in self.configuracion.nombres_flujos:
+                semilla_flujo = int(hashlib.md5("%s/%s" % (semilla, nombre)).hexdigest()[0:16], 16)
+
+                if self.muestreo_por_bloques and (nombre == "Llegadas" or nombre.startswith("Operacion ")):
+                    self.flujos_aleatorios[nombre] = FlujoPorBloques(semilla_flujo % 2 ** 32)
+                else:
+                    self.flujos_aleatorios[nombre] = random.Random(semilla_flujo)
+        else:
+            self.flujos_aleatorios = {"Sistema": random.Random(semilla)}
+
+        for operaciones in self.operaciones.values():
+            for nombre, operacion in operaciones.items():
+                operacion.aleatorio = self.flujo_aleatorio("Operacion " + nombre)
+
+    def iniciar(self):
+        """
+        Inicia el proceso de generación de camiones, si aún no fue iniciado.
+        """
+        if self.generacion is None:
+            self.generacion = self.process(self.generar_camiones())
+        return self.generacion
+
     def generar_camiones(self):
         """
         Genera camiones en el entorno de simulación
         """
 
-        camiones = {
-            "Harina de Soya - Hi Pro/Pellet de Soya":
-                {"Descarga": [], "Carga": []},
-            "Harina de Soya - Full Fat":
-                {"Descarga": [], "Carga": []},
-            "Torta de Soya":
-                {"Descarga": [], "Carga": []},
-            "Torta de Girasol":
-                {"Descarga": [], "Carga": []},
-            "Aceite de Soya":
-                {"Descarga": [], "Carga": []},
-            "Grano de Soya":
-                {"Descarga": [], "Carga": []},
-            "Azucar":
-                {"Descarga": [], "Carga": []},
-            "Fierro":
-                {"Descarga": [], "Carga": []},
-            "Contenedor 20":
-                {"Descarga": [], "Carga": []},
-            "Contenedor 40":
-                {"Descarga": [], "Carga": []}}
-
+        # Los camiones no se conservan, solo los procesos en curso mantienen referencias a ellos
         i = 0
 
+        # Los camiones registrados en el proceso de llegadas se crean con su carga y tipo, y llegan luego de su
+        # intervalo registrado
+        if self.llegadas.reproduce_camiones:
+            for intervalo, carga, tipo in self.llegadas.camiones(self):
+                camion = Camion(self, i + 1, carga, tipo)
+
+                yield self.process(camion.llega_a_instalacion(self, iter([intervalo])))
+                self.process(self.atender_camion(camion))
+
+                i += 1
+            return
+
+        intervalos = self.llegadas.intervalos(self)
+
         while True:
             camion = Camion(self, i + 1)
-            camiones[camion.carga][camion.tipo].append(camion)
 
-            yield self.process(camion.llega_a_instalacion(self))
+            llego = yield self.process(camion.llega_a_instalacion(self, intervalos))
+
+            # Concluyeron las llegadas del proceso de llegadas
+            if not llego:
+                break
+
             self.process(self.atender_camion(camion))
 
             i += 1
@@ -339,6 +326,7 @@ class Sistema(simpy.Environment):
 
         :type camion: Camion
         """
+        camion.llegada = self.now
 
         # Operaciones Complementarias Ingreso
         yield self.process(
@@ -352,6 +340,27 @@ class Sistema(simpy.Environment):
         yield self.process(
             self.atencion_salida(camion))
 
+        self.concluir_camion(camion)
+
+    def concluir_camion(self, camion):
+        """
+        Registra el resumen de un camion que concluyo su atencion. Luego del registro el sistema no conserva
+        referencias al camion.
+
+        :type camion: Camion
+        """
+        fila_camion = [camion.nombre, camion.carga, camion.tipo, camion.peso, camion.llegada, self.now,
+                       self.now - camion.llegada, camion.espera, camion.transbordo]
+
+        if self.datos_camiones is not None:
+            self.datos_camiones.append(fila_camion)
+
+        for registro in self.registros:
+            registro.registrar_camion(fila_camion)
+
+        for medio in self.medios_almacenamiento.values():
+            medio.disponibilidad.pop(camion, None)
+
     def atencion_manipuleo(self, camion):
         """
         Simula la atención de operaciones de manipuleo divididas en:
@@ -393,6 +402,10 @@ class Sistema(simpy.Environment):
         operaciones = self.operaciones["Operaciones manipuleo"]
         operaciones_complementarias = self.operaciones["Operaciones complementarias"]
 
+        # Longitudes de cola aceptables de los recursos y de las cuadrillas
+        cola_aceptable = self.longitud_cola_aceptable
+        cola_aceptable_cuadrillas = self.longitud_cola_aceptable_cuadrillas
+
         # Manipuleo de camion por cargar
         if camion.tipo == "Carga":
 
@@ -402,9 +415,9 @@ class Sistema(simpy.Environment):
                 # Si la cola de la tolva es aceptable, o si la cola de la pala mecanica y de las cuadrillas
                 # son muy largas, o si no se dispone producto en almacen 1, entonces, se trata de cargar a
                 # partir de un transbordo en sistema mecanizado
-                if len(self.recursos_atencion["Estacion Tolva/Balanza 3"].cola) <= 10 \
-                        or (len(operaciones["Carga con pala mecanica"].recurso.cola) > 10 and
-                            len(self.recursos_atencion["Cuadrilla de Estibaje"].cola) > 8) \
+                if len(self.recursos_atencion["Estacion Tolva/Balanza 3"].cola) <= cola_aceptable \
+                        or (len(operaciones["Carga con pala mecanica"].recurso.cola) > cola_aceptable and
+                            len(self.recursos_atencion["Cuadrilla de Estibaje"].cola) > cola_aceptable_cuadrillas) \
                         or not camion.dispone_producto_espacio_medio_almacenamiento(
                             self.medios_almacenamiento["Almacen 1"]):
 
@@ -418,8 +431,8 @@ class Sistema(simpy.Environment):
 
                         # Si la cola de la pala mecanica es aceptable o la cola de las cuadrillas es muy larga,
                         # y se dispone producto en almacenes, entonces, se carga con pala mecanica
-                        if (len(operaciones["Carga con pala mecanica"].recurso.cola) <= 10 or
-                            len(self.recursos_atencion["Cuadrilla de Estibaje"].cola) > 8) \
+                        if (len(operaciones["Carga con pala mecanica"].recurso.cola) <= cola_aceptable or
+                            len(self.recursos_atencion["Cuadrilla de Estibaje"].cola) > cola_aceptable_cuadrillas) \
                                 and camion.dispone_producto_espacio_medio_almacenamiento(
                                     self.medios_almacenamiento["Almacen 1"]):
 
@@ -436,7 +449,7 @@ class Sistema(simpy.Environment):
 
                         # En otro caso, si la cola de las cuadrillas es aceptable y se dipone producto en almacenes,
                         # entonces, se transborda o carga a pulso
-                        elif len(self.recursos_atencion["Cuadrilla de Estibaje"].cola) <= 8 \
+                        elif len(self.recursos_atencion["Cuadrilla de Estibaje"].cola) <= cola_aceptable_cuadrillas \
                                 and camion.dispone_producto_espacio_medio_almacenamiento(
                                     self.medios_almacenamiento["Almacen 1"]):
 
@@ -470,12 +483,13 @@ class Sistema(simpy.Environment):
 
                         # Si ningun caso anterior fue satisfecho se genera y muestra un error
                         else:
-                            print "\tERROR " + str(camion) + " NO FUE MANIPULADO - Hora:" + str(self.now)
+                            self.traza.registrar("error", Traza.ERROR, "\tERROR %s NO FUE MANIPULADO - Hora:%s",
+                                                 camion, self.now)
 
                 # En otro caso, si la cola de la pala mecánica es aceptable o la cola de las cuadrillas es muy larga,
                 # entonces, se carga con pala mecanica.
-                elif len(operaciones["Carga con pala mecanica"].recurso.cola) <= 10 \
-                        or len(self.recursos_atencion["Cuadrilla de Estibaje"].cola) > 8:
+                elif len(operaciones["Carga con pala mecanica"].recurso.cola) <= cola_aceptable \
+                        or len(self.recursos_atencion["Cuadrilla de Estibaje"].cola) > cola_aceptable_cuadrillas:
 
                     yield self.process(operaciones_complementarias["Primer pesaje - B3"]
                                        .ejecutar(self, camion))
@@ -488,14 +502,14 @@ class Sistema(simpy.Environment):
                     yield self.process(operaciones_complementarias["Segundo pesaje - B3"].ejecutar(self, camion))
 
                 # En otro caso, si la cola de cuadrillas es aceptable, entonces, se transborda o carga a pulso.
-                elif len(self.recursos_atencion["Cuadrilla de Estibaje"].cola) <= 8:
+                elif len(self.recursos_atencion["Cuadrilla de Estibaje"].cola) <= cola_aceptable_cuadrillas:
 
                     yield self.process(operaciones_complementarias["Primer pesaje - B3"]
                                        .ejecutar(self, camion))
 
                     # Si no hay posibilidad de que arriben camiones para transbordo, se carga a pulso
-                    if len(self.recursos_atencion["Estacion Volcadora"].cola) > 10 \
-                            and len(self.recursos_atencion["Cuadrilla de Estibaje"].cola) <= 8:
+                    if len(self.recursos_atencion["Estacion Volcadora"].cola) > cola_aceptable \
+                            and len(self.recursos_atencion["Cuadrilla de Estibaje"].cola) <= cola_aceptable_cuadrillas:
                         carga = operaciones["Carga a pulso - Granos"]
                         yield self.process(
                             carga.ejecutar(
@@ -520,7 +534,8 @@ class Sistema(simpy.Environment):
 
                 # Si ningun caso anterior fue satisfecho se genera y muestra un error
                 else:
-                    print "\tERROR " + str(camion) + " NO FUE MANIPULADO - Hora:" + str(self.now)
+                    self.traza.registrar("error", Traza.ERROR, "\tERROR %s NO FUE MANIPULADO - Hora:%s",
+                                         camion, self.now)
 
             # Manipuleo de carga a granel seca en almacenes externos
             elif camion.carga in ["Grano de Soya"]:
@@ -534,12 +549,13 @@ class Sistema(simpy.Environment):
 
                     # Si el camion espera se genera y muestra un error
                     if ejecucion_espera_o_interrumpe["Resultado"] != "Interrumpio espera":
-                        print "\tERROR " + str(camion) + " NO FUE MANIPULADO - Hora:" + str(self.now)
+                        self.traza.registrar("error", Traza.ERROR, "\tERROR %s NO FUE MANIPULADO - Hora:%s",
+                                             camion, self.now)
 
                 # En caso contrario, si la pala mecanica tiene una cola aceptable o la cola de las cuadrillas
                 # es muy larga, entonces, se carga con pala mecanica
-                elif len(self.recursos_atencion["Pala Mecanica"].cola) <= 10 \
-                        or len(self.recursos_atencion["Pala Mecanica"].cola) > 8:
+                elif len(self.recursos_atencion["Pala Mecanica"].cola) <= cola_aceptable \
+                        or len(self.recursos_atencion["Pala Mecanica"].cola) > cola_aceptable_cuadrillas:
 
                     carga = operaciones["Carga con pala mecanica"]
                     yield self.process(
@@ -592,8 +608,8 @@ class Sistema(simpy.Environment):
                         self.medios_almacenamiento["Tolva"]) or
                     not camion.dispone_producto_espacio_medio_almacenamiento(
                         self.medios_almacenamiento["Almacen 1"])) \
-                        and (len(self.recursos_atencion["Estacion Volcadora"].cola) <= 10 or
-                             len(self.recursos_atencion["Cuadrilla de Estibaje"].cola) > 8):
+                        and (len(self.recursos_atencion["Estacion Volcadora"].cola) <= cola_aceptable or
+                             len(self.recursos_atencion["Cuadrilla de Estibaje"].cola) > cola_aceptable_cuadrillas):
 
                     transbordo = operaciones["Transbordo en sistema mecanizado (D)"]
                     ejecucion_transbordo = yield self.process(
@@ -602,13 +618,14 @@ class Sistema(simpy.Environment):
 
                     # En caso que no se ejecute el transbordo segenera y muestra un error
                     if ejecucion_transbordo in ["No ejecutada por recurso", "No ejecutada por producto"]:
-                        print "\tERROR " + str(camion) + " NO FUE MANIPULADO - Hora:" + str(self.now)
+                        self.traza.registrar("error", Traza.ERROR, "\tERROR %s NO FUE MANIPULADO - Hora:%s",
+                                             camion, self.now)
 
                 # En otro caso, si se dispone espacio en Almacen 1 y, la cola de la volcadora es acepetable o
                 # la cola de cuadrillas es muy larga, entonces, se descarga con sistema mecanicado a almacen.
                 elif camion.dispone_producto_espacio_medio_almacenamiento(self.medios_almacenamiento["Almacen 1"]) \
-                        and (len(self.recursos_atencion["Estacion Volcadora"].cola) <= 10 or
-                             len(self.recursos_atencion["Cuadrilla de Estibaje"].cola) > 8):
+                        and (len(self.recursos_atencion["Estacion Volcadora"].cola) <= cola_aceptable or
+                             len(self.recursos_atencion["Cuadrilla de Estibaje"].cola) > cola_aceptable_cuadrillas):
 
                     descarga = operaciones["Descarga con volcadora"]
                     yield self.process(
@@ -618,11 +635,11 @@ class Sistema(simpy.Environment):
                 # En otro caso, si se dispone producto en almacen 1 y la cola de las cuadrillas es aceptable,
                 # entonces, se transborda o descarga a pulso.
                 elif camion.dispone_producto_espacio_medio_almacenamiento(self.medios_almacenamiento["Almacen 1"]) \
-                        and len(self.recursos_atencion["Cuadrilla de Estibaje"].cola) <= 8:
+                        and len(self.recursos_atencion["Cuadrilla de Estibaje"].cola) <= cola_aceptable_cuadrillas:
 
                     # Si no hay posibilidad de que arriben camiones para transbordo, se descarga a pulso
-                    if len(self.recursos_atencion["Estacion Tolva/Balanza 3"].cola) <= 10 \
-                            or len(self.recursos_atencion["Cuadrilla de Estibaje"].cola) > 8 \
+                    if len(self.recursos_atencion["Estacion Tolva/Balanza 3"].cola) <= cola_aceptable \
+                            or len(self.recursos_atencion["Cuadrilla de Estibaje"].cola) > cola_aceptable_cuadrillas \
                             or not camion.dispone_producto_espacio_medio_almacenamiento(
                                 self.medios_almacenamiento["Almacen 1"]):
 
@@ -650,7 +667,7 @@ class Sistema(simpy.Environment):
                 # En otro caso, si no se dispone producto en almacen 1 y la cola de las cuadrillas es aceptable,
                 # entonces, se transborda a pulso.
                 elif not camion.dispone_producto_espacio_medio_almacenamiento(self.medios_almacenamiento["Almacen 1"]) \
-                        and len(self.recursos_atencion["Cuadrilla de Estibaje"].cola) <= 8:
+                        and len(self.recursos_atencion["Cuadrilla de Estibaje"].cola) <= cola_aceptable_cuadrillas:
 
                     ejecucion_espera_o_interrumpe = yield self.process(
                         camion.espera_transbordo_o_interrumpe(self))
@@ -665,14 +682,15 @@ class Sistema(simpy.Environment):
 
                 # Si ningun caso anterior fue satisfecho se genera y muestra un error
                 else:
-                    print "\tERROR " + str(camion) + " NO FUE MANIPULADO - Hora:" + str(self.now)
+                    self.traza.registrar("error", Traza.ERROR, "\tERROR %s NO FUE MANIPULADO - Hora:%s",
+                                         camion, self.now)
 
             # Manipuleo de carga a granel en almacenes externos
             elif camion.carga in ["Grano de Soya"]:
 
                 # Si la cola de pala mecanica no es muy larga, se descarga a pulso.
-                if len(operaciones["Carga con pala mecanica"].recurso.cola) <= 10 \
-                        or len(self.recursos_atencion["Cuadrilla de Estibaje"].cola) > 8:
+                if len(operaciones["Carga con pala mecanica"].recurso.cola) <= cola_aceptable \
+                        or len(self.recursos_atencion["Cuadrilla de Estibaje"].cola) > cola_aceptable_cuadrillas:
 
                     descarga = operaciones["Descarga a pulso - Granos"]
                     yield self.process(
@@ -754,22 +772,22 @@ class Sistema(simpy.Environment):
                 if not camion.dispone_producto_espacio_medio_almacenamiento(self.medios_almacenamiento["Tanque 1"]) \
                         and camion.dispone_producto_espacio_medio_almacenamiento(
                             self.medios_almacenamiento["Tanque 2"]):
-                    print "T2"
+                    self.traza.registrar("operacion", Traza.DEBUG, "T2")
                     carga = operaciones["Carga con bombas electricas - T2"]
                     yield self.process(carga.ejecutar(self, camion, 200, self.medios_almacenamiento["Tanque 2"]))
                 else:
-                    print "T1"
+                    self.traza.registrar("operacion", Traza.DEBUG, "T1")
                     carga = operaciones["Carga con bombas electricas - T1"]
                     yield self.process(carga.ejecutar(self, camion, 200, self.medios_almacenamiento["Tanque 1"]))
             else:
                 if not camion.dispone_producto_espacio_medio_almacenamiento(self.medios_almacenamiento["Tanque 2"]) \
                         and camion.dispone_producto_espacio_medio_almacenamiento(
                             self.medios_almacenamiento["Tanque 1"]):
-                    print "T1"
+                    self.traza.registrar("operacion", Traza.DEBUG, "T1")
                     carga = operaciones["Carga con bombas electricas - T1"]
                     yield self.process(carga.ejecutar(self, camion, 200, self.medios_almacenamiento["Tanque 1"]))
                 else:
-                    print "T2"
+                    self.traza.registrar("operacion", Traza.DEBUG, "T2")
                     carga = operaciones["Carga con bombas electricas - T2"]
                     yield self.process(carga.ejecutar(self, camion, 200, self.medios_almacenamiento["Tanque 2"]))
 
@@ -781,22 +799,22 @@ class Sistema(simpy.Environment):
                 if not camion.dispone_producto_espacio_medio_almacenamiento(self.medios_almacenamiento["Tanque 1"]) \
                         and camion.dispone_producto_espacio_medio_almacenamiento(
                             self.medios_almacenamiento["Tanque 2"]):
-                    print "T2"
+                    self.traza.registrar("operacion", Traza.DEBUG, "T2")
                     descarga = operaciones["Descarga con bombas electricas - T2"]
                     yield self.process(descarga.ejecutar(self, camion, 200, self.medios_almacenamiento["Tanque 2"]))
                 else:
-                    print "T1"
+                    self.traza.registrar("operacion", Traza.DEBUG, "T1")
                     descarga = operaciones["Descarga con bombas electricas - T1"]
                     yield self.process(descarga.ejecutar(self, camion, 200, self.medios_almacenamiento["Tanque 1"]))
             else:
                 if not camion.dispone_producto_espacio_medio_almacenamiento(self.medios_almacenamiento["Tanque 2"]) \
                         and camion.dispone_producto_espacio_medio_almacenamiento(
                             self.medios_almacenamiento["Tanque 1"]):
-                    print "T1"
+                    self.traza.registrar("operacion", Traza.DEBUG, "T1")
                     descarga = operaciones["Descarga con bombas electricas - T1"]
                     yield self.process(descarga.ejecutar(self, camion, 200, self.medios_almacenamiento["Tanque 1"]))
                 else:
-                    print "T2"
+                    self.traza.registrar("operacion", Traza.DEBUG, "T2")
                     descarga = operaciones["Descarga con bombas electricas - T2"]
                     yield self.process(descarga.ejecutar(self, camion, 200, self.medios_almacenamiento["Tanque 2"]))
 
@@ -867,7 +885,7 @@ class Sistema(simpy.Environment):
 
         # Se interrumpio la espera, se procede con el transbordo
         elif ejecucion_espera_o_interrumpe["Resultado"] == "Espera interrumpida":
-            recurso_t = ejecucion_espera_o_interrumpe["Interrupcion"].trailer
+            recurso_t = ejecucion_espera_o_interrumpe["Interrupcion"].medio_de_transbordo(self)
             yield self.process(
                 transbordo.ejecutar(self, camion, tpaciencia_t, recurso_t))
 
@@ -913,1131 +931,3997 @@ class Sistema(simpy.Environment):
             yield self.process(operaciones["Atencion despacho 2"]
                                .ejecutar(self, camion))
 
-    def guardar_datos(self, archivo):
+    def ingresar_camion(self, camion):
         """
-        Guarda datos en un archivo .csv
+        Registra el ingreso de un camion al sistema
 
-        :type archivo: str
+        :type camion: Camion
         """
-        with open(archivo, "wb") as csv_file:
-            writer = csv.writer(csv_file, delimiter=';')
-            writer.writerow(
-                ["Camion", "Carga", "Tipo", "Peso Final", "Operacion", "Recurso", "Dia",
-                 "Arribo", "Espera M. O/D", "Espera R", "Espera P.", "Espera T.", "Inicio", "Fin",
-                 "Medio de Almacenamiento", "Nivel"])
-            for linea in self.datos:
-                writer.writerow(linea)
+        self.camiones_en_sistema.append(camion)
+        camion.en_sistema = True
 
-    def simular(self, horizonte=None):
-        """
-        Ejecuta la simulación del sistema.
-        """
+        if not camion.manipulado.triggered:
+            self.actualizar_camiones_pendientes(camion, 1)
 
-        print('Simulación de Operaciones Logísticas en ALPASUR S.A. - KEMFA S.A.')
+        self.existencias_modificadas.emitir()
 
-        tsim = 0
+    def retirar_camion(self, camion):
+        """
+        Registra la salida de un camion del sistema
 
-        # Tiempo de simulación
-        if horizonte == "dia":
-            tsim = 24 * 60
-        elif horizonte == "semana":
-            tsim = 3 * 24 * 60
-        elif horizonte == "mes":
-            tsim = 4 * 6 * 24 * 60
+        :type camion: Camion
+        """
+        self.camiones_en_sistema.remove(camion)
+        camion.en_sistema = False
 
-        # Semilla de aleatoriedad
-        random.seed(55)
+        if not camion.manipulado.triggered:
+            self.actualizar_camiones_pendientes(camion, -1)
 
-        if horizonte is not None:
-            self.process(self.generar_camiones())
-            self.run(until=tsim)
+        self.capacidad_liberada.emitir()
 
-            archivo = "C:\Users\AYAR\Documentos\Ingenieria Industrial" + \
-                      "\Documentos Tesis\Avances\Modelo de Simulacion\datos.csv"
+    def registrar_manipuleo(self, camion):
+        """
+        Registra la conclusión del manipuleo de un camion
 
-            self.guardar_datos(archivo)
-            os.startfile(archivo)
+        :type camion: Camion
+        """
+        camion.manipulado.succeed()
 
+        if camion.en_sistema:
+            self.actualizar_camiones_pendientes(camion, -1)
 
-class Camion(object):
-    """Clase para el modelado de camiones presentes en el sistema"""
+        self.existencias_modificadas.emitir()
 
-    def __init__(self, sistema, nombre):
+    def actualizar_camiones_pendientes(self, camion, cantidad):
         """
-        Define las propiedades principales de la clase Camion
+        Actualiza los contadores de camiones pendientes de manipuleo en el sistema
 
-        :type sistema: Sistema
-        :type nombre: int
+        :type camion: Camion
+        :type cantidad: int
         """
-        productos = sistema.productos
-
-        self.nombre = nombre
-        # TODO modificar con datos reales
-        self.carga = random.choice(productos)
+        for clave in [(camion.carga, camion.tipo), (camion.medios_destino, camion.tipo)]:
+            self.camiones_pendientes[clave] = self.camiones_pendientes.get(clave, 0) + cantidad
 
-        if random.random() <= 0.5:
-            self.tipo = "Descarga"
-            self.peso = 28  # TODO analizar eliminación
-        else:
-            self.peso = 0
-            self.tipo = "Carga"
+    def estadisticas_disponibilidad(self):
+        """
+        Resume los aciertos y fallos de las consultas de disponibilidad de producto o espacio
+        en los medios de almacenamiento.
+        """
+        estadisticas = {}
 
-        niveles = {self.carga: self.peso}
+        for medio in self.medios_almacenamiento.values():
+            estadisticas[medio.nombre] = {"Aciertos": medio.aciertos_disponibilidad,
+                                          "Fallos": medio.fallos_disponibilidad}
 
-        self.trailer = MedioDeAlmacenamiento(sistema, str(self.nombre), 1, niveles, 28, self.peso)
+        estadisticas["Total"] = {"Aciertos": sum(e["Aciertos"] for e in estadisticas.values()),
+                                 "Fallos": sum(e["Fallos"] for e in estadisticas.values())}
 
-        self.manipulado = sistema.event()
-        self.transbordo = "No"
+        return estadisticas
 
-    def __repr__(self):
-        """
-        Define la forma de representación de entidades de la clase Camion
+    def agregar_registro(self, registro):
         """
+        Agrega un registro al que se envian las filas de datos a medida que son generadas.
 
-        cod = ""
-
-        if self.carga == "Harina de Soya - Hi Pro/Pellet de Soya":
-            cod = "HP"
-        elif self.carga == "Harina de Soya - Full Fat":
-            cod = "FF"
-        elif self.carga == "Torta de Soya":
-            cod = "TS"
-        elif self.carga == "Torta de Girasol":
-            cod = "TS"
-        elif self.carga == "Aceite de Soya":
-            cod = "AS"
-        elif self.carga == "Grano de Soya":
-            cod = "GS"
-        elif self.carga == "Azucar":
-            cod = "AZ"
-        elif self.carga == "Fierro":
-            cod = "FI"
-        elif self.carga == "Contenedor 20":
-            cod = "C2"
-        elif self.carga == "Contenedor 40":
-            cod = "C4"
-        else:
-            print "ERROR CARGA DESCONOCIDA: " + self.carga
-
-        return str(self.nombre) + self.tipo[0] + cod
+        :type registro: Registro
+        """
+        self.registros.append(registro)
+        return registro
 
-    @staticmethod
-    def llega_a_instalacion(sistema):
+    def registrar(self, fila_de_datos):
         """
-        Genera la llegada del camion
+        Registra una fila de datos en memoria, si se conservan los datos, y en cada registro del sistema.
 
-        :type sistema: Sistema
+        :type fila_de_datos: list
         """
-        tell = random.uniform(5, 15)  # TODO Modificar con información real
+        if self.datos is not None:
+            self.datos.append(fila_de_datos)
 
-        yield sistema.timeout(int(round(tell, 0)))
+        for registro in self.registros:
+            registro.registrar(fila_de_datos)
 
-    def espera_transbordo(self, sistema, tespera):
+    def cerrar_registros(self):
         """
-        Simula la espera por un camion para realizar transbordo
-        Finalizada la espera se procede con una operacion de carga o descarga
-        Sin embargo, si otro camion llega se interrumpe la espera y se procede con un transbordo
-
-        :type sistema: Sistema
-        :type tespera: int
+        Concluye la escritura de los registros del sistema.
         """
-        # Inicia espera de camion para realizar transbordo
-        try:
+        for registro in self.registros:
+            registro.cerrar()
 
-            print "%s inicia espera Transbordo - Hora: %d" % (self, sistema.now)
-            yield sistema.timeout(tespera)
+    def reporte_recursos(self, tiempo=None):
+        """
+        Resume, para cada recurso, la capacidad disponible según su horario de atención hasta el tiempo indicado
+        (por defecto el tiempo actual), el tiempo ocupado, la utilización y la capacidad remanente, en minutos.
 
-            # Consluida la espera verifica si hay producto o espacio disponible en almacenes.
-            prod_o_esp_disp = self.dispone_producto_espacio_medios_almacenamiento(sistema)
+        :type tiempo: float
+        """
+        tiempo = self.now if tiempo is None else tiempo
+        reporte = {}
 
-            # Si producto o esapacio, termina su espera para realizar una carga o descarga
-            if prod_o_esp_disp:
+        for recurso in self.recursos_atencion.values():
+            disponible = recurso.capacity * recurso.calendario.minutos_de_atencion(0, tiempo)
+            reporte[recurso.nombre] = {
+                "Capacidad disponible": disponible,
+                "Tiempo ocupado": recurso.tiempo_ocupado,
+                "Utilizacion": float(recurso.tiempo_ocupado) / disponible if disponible else float("nan"),
+                "Capacidad remanente": disponible - recurso.tiempo_ocupado}
 
-                print str(self) + " termino espera - Hora: " + str(sistema.now)
+        return reporte
 
-            # De lo contrario continua esperando mientras no haya producto o espacio en almacenes
+    def estado(self):
+        """
+        Describe el estado de la simulación en el tiempo actual: niveles y espacio de los medios de
+        almacenamiento, colas de recursos y medios, colas de espera de transbordo, camiones en sistema,
+        eventos programados con los procesos que esperan cada uno, y el estado de los flujos de números
+        aleatorios.
+        """
+        def nombres(camiones):
+            return [camion.nombre for camion in camiones]
+
+        # Los procesos se identifican solo por nombre, para que el estado no dependa de las lineas del código
+        def proceso(retorno):
+            instancia = getattr(retorno, "__self__", None)
+            if isinstance(instancia, simpy.events.Process):
+                return instancia._generator.__name__
+            return getattr(retorno, "__name__", type(retorno).__name__)
+
+        def estado_flujo(flujo):
+            if isinstance(flujo, FlujoPorBloques):
+                generador = flujo.generador.get_state()
+                estado = (generador[0], generador[1].tolist()) + generador[2:], sorted(flujo.bloques.items())
             else:
+                estado = flujo.getstate()
+            return hashlib.md5(repr(estado)).hexdigest()
+
+        return {
+            "Tiempo": self.now,
+            "Medios de almacenamiento": dict(
+                (nombre, (sorted(medio.niveles.items()), medio.espacio, medio.level, nombres(medio.cola.lista())))
+                for nombre, medio in self.medios_almacenamiento.items()),
+            "Recursos": dict(
+                (recurso.nombre, (len(recurso.users), recurso.tiempo_ocupado, nombres(recurso.cola.lista())))
+                for recurso in self.recursos_atencion.values()),
+            "Colas de espera de transbordo": dict(
+                (producto, dict((tipo, [camion.nombre for camion, espera in cola]) for tipo, cola in colas.items()))
+                for producto, colas in self.colas_espera_transbordo.items()),
+            "Camiones en sistema": nombres(self.camiones_en_sistema),
+            "Eventos programados": [
+                (tiempo, prioridad, type(evento).__name__, [proceso(retorno) for retorno in evento.callbacks or []])
+                for tiempo, prioridad, eid, evento in sorted(self._queue)],
+            "Flujos aleatorios": dict(
+                (nombre, estado_flujo(flujo)) for nombre, flujo in self.flujos_aleatorios.items())}
+
+    def punto_de_control(self):
+        """
+        Genera un punto de control con la configuración, opciones, semilla y estado actual del sistema, a
+        partir del cual se puede volver a simular el sistema hasta el tiempo actual.
+        """
+        if self.tiempo_siembra > 0:
+            raise ValueError("El sistema fue sembrado durante la simulación y no puede restaurarse")
 
-                print str(self) + " continua espera Producto/Espacio no disponible - Hora:" + str(sistema.now)
-                while not prod_o_esp_disp:
-                    yield sistema.timeout(1)
-                    prod_o_esp_disp = self.dispone_producto_espacio_medios_almacenamiento(sistema)
+        return PuntoDeControl(self.configuracion, self.opciones, self.semilla, self.now, self.estado(),
+                              self.cambios_politicas)
 
-            sistema.exit({"Resultado": "Termino espera", "Interrupcion": None})
+    def cambiar_politica(self, politica, valor):
+        """
+        Cambia una política del sistema a partir del tiempo actual y registra el cambio, para repetirlo al
+        restaurar el sistema desde un punto de control. Los camiones que esperan capacidad del sistema vuelven
+        a verificarla con la nueva política.
 
-        # En caso que un camion llega, interrumpe la espera para proceder con el transbordo
-        except simpy.Interrupt as interrupcion:
+        :type politica: str
+        :type valor: int
+        """
+        if politica not in PuntoDeControl.POLITICAS:
+            raise ValueError("Politica desconocida: " + politica)
 
-            print str(self) + " espera interrumpida por " + str(interrupcion.cause) + " - Hora: " + str(
-                sistema.now)
-            self.transbordo = "Si"
-            sistema.exit({"Resultado": "Espera interrumpida", "Interrupcion": interrupcion.cause})
+        setattr(self, politica, valor)
+        self.cambios_politicas.append((self.now, politica, valor))
+        self.capacidad_liberada.emitir()
 
-    def interrumpe_espera_transbordo(self, proceso):
+    def guardar_datos(self, archivo):
         """
-        Interrumpe la espera de otro camion para realizar un transbordo.
-        Al interrumpir, el camion pasa a comportarse como medio de origen o destino de carga
+        Guarda datos en un archivo .csv
 
-        :type proceso: simpy.events.Process
+        :type archivo: str
         """
-        proceso.interrupt(self)
+        if self.datos is None:
+            raise ValueError("El sistema no conserva los datos, deben guardarse con un RegistroCSV")
 
-    def espera_transbordo_o_interrumpe(self, sistema, tespera=float("Inf")):  # TODO Cambiar de nombre
+        with open(archivo, "wb") as csv_file:
+            writer = csv.writer(csv_file, delimiter=';')
+            writer.writerow(COLUMNAS_DATOS)
+            for linea in self.datos:
+                writer.writerow(linea)
+
+    def ejecutar_replica(self, horizonte, semilla=None):
         """
-        Permite que un camion espere o interrumpa la espera de otro para realizar un transbordo
+        Ejecuta una replica de la simulación del sistema. Si se indica una semilla de aleatoriedad, reemplaza
+        a la semilla con la que fue creado el sistema.
 
-        :type tespera: int
-        :type sistema: Sistema
-        :type self: Camion
+        :type horizonte: str
+        :type semilla: int
         """
 
-        if self.tipo == "Carga":
-            tipo_camion_en_esp = "Descarga"
-        else:
-            tipo_camion_en_esp = "Carga"
+        # Semilla de aleatoriedad
+        if semilla is not None:
+            self.sembrar(semilla)
 
-        # Si hay un camion esperando con el que se puede realizar un transbordo, se interrumpe su espera
-        if len(sistema.colas_espera_transbordo[self.carga][tipo_camion_en_esp]) != 0:
+        if self.perfilador is not None:
+            self.perfilador.activar(self)
 
-            print str(self) + " Interrumpe espera  - Hora: " + str(sistema.now)
-            self.transbordo = "Si"
-            camion_en_espera = sistema.colas_espera_transbordo[self.carga][tipo_camion_en_esp][0][0]
-            espera_en_proceso = sistema.colas_espera_transbordo[self.carga][tipo_camion_en_esp][0][1]
+        try:
+            self.iniciar()
+            self.run(until=HORIZONTES[horizonte])
+        finally:
+            if self.perfilador is not None:
+                self.perfilador.desactivar(self)
 
-            self.interrumpe_espera_transbordo(espera_en_proceso)
+        self.cerrar_registros()
 
-            sistema.colas_espera_transbordo[self.carga][tipo_camion_en_esp].pop(0)  # TODO revisar
-            camion_interrumpido = camion_en_espera
+    def simular(self, horizonte=None, semilla=None, archivo=None):
+        """
+        Ejecuta la simulación del sistema y guarda los datos en un archivo .csv
+        Si el sistema no conserva los datos, las filas se escriben en el archivo durante la simulación.
+        Si no se indica una semilla de aleatoriedad, se usa la semilla con la que fue creado el sistema.
 
-            self.manipulado.succeed()
-            yield camion_interrumpido.manipulado
+        :type horizonte: str
+        :type semilla: int
+        :type archivo: str
+        """
 
-            sistema.exit({"Resultado": "Interrumpio espera", "Interrupcion": None})
+        print('Simulación de Operaciones Logísticas en ALPASUR S.A. - KEMFA S.A.')
 
-        # Si no hay camiones esperando entonces el camion espera
-        else:
+        if horizonte is not None:
 
-            espera_transbordo = sistema.process(self.espera_transbordo(sistema, tespera))
-            sistema.colas_espera_transbordo[self.carga][self.tipo].append([self, espera_transbordo])
+            if archivo is None:
+                archivo = "C:\Users\AYAR\Documentos\Ingenieria Industrial" + \
+                          "\Documentos Tesis\Avances\Modelo de Simulacion\datos.csv"
 
-            resultado_espera = yield espera_transbordo
+            if self.datos is None:
+                self.agregar_registro(RegistroCSV(archivo))
 
-            # Si el camion concluyo la espera, sale de la cola
-            if resultado_espera["Resultado"] == "Termino espera":
-                sistema.colas_espera_transbordo[self.carga][self.tipo].pop(0)  # TODO revisar
+            estadisticas = self.agregar_registro(RegistroEstadisticas())
+            self.ejecutar_replica(horizonte, semilla)
+            estadisticas.reporte()
 
-            sistema.exit(resultado_espera)
+            if self.perfilador is not None:
+                self.perfilador.reporte()
 
-    def espera_operacion_manipuleo(self, sistema, operacion, medio_de_almacenamiento, tpaciencia_t):
-        """
-        Simula la espera por disponibilidad de:
-        - Espacios de atencion en medios de almacenamiento
-        - Recursos de ejecución
-        - Producto o espacio en medios de origen/destino
+            if self.datos is not None:
+                self.guardar_datos(archivo)
 
-        :type sistema: Sistema
-        :type operacion: OperacionManipuleo
-        :type medio_de_almacenamiento: MedioDeAlmacenamiento
-        :type tpaciencia_t: int
-        """
-        espera_p_e = 0
-        espera_r_a = 0
-        espera_m_a = 0
-        espera_t = 0
+            if hasattr(os, "startfile"):
+                os.startfile(archivo)
 
-        while espera_t < tpaciencia_t:
 
-            if self.entre_primeros_cola_medio_de_almacenamiento(medio_de_almacenamiento):
+DefinicionRecurso = collections.namedtuple("DefinicionRecurso", ["clave", "nombre", "horario", "capacidad"])
+DefinicionMedio = collections.namedtuple("DefinicionMedio", ["nombre", "espacios_de_atencion", "niveles", "capacidad"])
+DefinicionOperacion = collections.namedtuple("DefinicionOperacion",
+                                             ["clave", "nombre", "recurso", "distribucion", "parametros"])
 
-                if self.entre_primeros_cola_recurso(operacion.recurso):
 
-                    if self.dispone_producto_espacio_medio_almacenamiento(medio_de_almacenamiento):
-                        break
-                    else:
-                        self.intenta_adelantar_camion_manipuleo(sistema, operacion, medio_de_almacenamiento)
-                        espera_p_e += 1
-                else:
-                    self.intenta_adelantar_camion_manipuleo(sistema, operacion, medio_de_almacenamiento)
+class Configuracion(object):
+    """
+    Clase para la configuración de una instalación: productos, horarios, recursos, medios de almacenamiento
+    y operaciones.
+    Se valida al crearse y es inmutable, de forma que puede usarse como plantilla para construir cualquier
+    cantidad de sistemas sin volver a leerla ni validarla.
+    """
 
-                    if self.dispone_producto_espacio_medios_almacenamiento(sistema):
-                        espera_r_a += 1
-                    else:
-                        espera_r_a += 1
-                        espera_p_e += 1
-            else:
+    __slots__ = ("productos", "productos_transbordo", "horarios", "recursos", "medios_almacenamiento",
+                 "operaciones_manipuleo", "operaciones_complementarias", "medios_por_producto", "nombres_flujos",
+                 "calendarios")
 
-                if self.entre_primeros_cola_recurso(operacion.recurso):
-                    self.intenta_adelantar_camion_manipuleo(sistema, operacion, medio_de_almacenamiento)
+    DISTRIBUCIONES = ("uniforme", "triangular")
 
-                    if self.dispone_producto_espacio_medios_almacenamiento(sistema):
-                        espera_m_a += 1
-                    else:
-                        espera_m_a += 1
-                        espera_p_e += 1
-                else:
+    def __init__(self, datos):
+        """
+        Crea la configuración a partir de un diccionario con la estructura de los archivos de configuración.
 
-                    if self.dispone_producto_espacio_medios_almacenamiento(sistema):
-                        espera_r_a += 1
-                        espera_m_a += 1
-                    else:
-                        espera_r_a += 1
-                        espera_m_a += 1
-                        espera_p_e += 1
+        :type datos: dict
+        """
+        try:
+            productos = tuple(texto(p) for p in datos["Productos"])
+            productos_transbordo = tuple(texto(p) for p in datos["Productos con transbordo"])
+
+            horarios = tuple(
+                (texto(nombre), tuple((texto(dias), tuple((texto(hito), float(hora)) for hito, hora in horas.items()))
+                                      for dias, horas in horario.items()))
+                for nombre, horario in datos["Horarios"].items())
+
+            recursos = tuple(
+                DefinicionRecurso(texto(r["Clave"]), texto(r["Nombre"]), texto(r["Horario"]), int(r["Capacidad"]))
+                for r in datos["Recursos"])
+
+            medios = tuple(
+                DefinicionMedio(texto(m["Nombre"]), int(m["Espacios de atencion"]),
+                                tuple((texto(producto), nivel) for producto, nivel in m["Niveles"].items()),
+                                m["Capacidad"])
+                for m in datos["Medios de almacenamiento"])
+
+            operaciones = [
+                tuple(DefinicionOperacion(texto(o["Clave"]), texto(o["Nombre"]), texto(o["Recurso"]),
+                                          texto(o["Distribucion"]), tuple(o["Parametros"]))
+                      for o in datos[seccion])
+                for seccion in ["Operaciones manipuleo", "Operaciones complementarias"]]
+
+        except KeyError as error:
+            raise ValueError("Falta la seccion o el campo " + str(error) + " en la configuracion")
+
+        nombres_horarios = [nombre for nombre, horario in horarios]
+        claves_recursos = [r.clave for r in recursos]
+
+        for producto in productos_transbordo:
+            if producto not in productos:
+                raise ValueError("Producto con transbordo desconocido: " + producto)
+        for recurso in recursos:
+            if recurso.horario not in nombres_horarios:
+                raise ValueError("Horario desconocido en el recurso " + recurso.clave + ": " + recurso.horario)
+        for medio in medios:
+            for producto, nivel in medio.niveles:
+                if producto not in productos:
+                    raise ValueError("Producto desconocido en el medio " + medio.nombre + ": " + producto)
+        for operacion in operaciones[0] + operaciones[1]:
+            if operacion.recurso not in claves_recursos:
+                raise ValueError("Recurso desconocido en la operacion " + operacion.clave + ": " + operacion.recurso)
+            if operacion.distribucion not in self.DISTRIBUCIONES:
+                raise ValueError("Distribucion desconocida en la operacion " + operacion.clave + ": " +
+                                 operacion.distribucion)
+
+        # Nombres de los medios de almacenamiento de cada producto
+        medios_por_producto = tuple(
+            (producto, tuple(m.nombre for m in medios if producto in dict(m.niveles)))
+            for producto in productos)
+
+        # Nombres de los flujos de números aleatorios del sistema
+        nombres_flujos = ("Llegadas", "Cargas", "Tipos") + \
+            tuple("Operacion " + o.clave for o in operaciones[0] + operaciones[1])
+
+        for atributo, valor in [("productos", productos), ("productos_transbordo", productos_transbordo),
+                                ("horarios", horarios), ("recursos", recursos), ("medios_almacenamiento", medios),
+                                ("operaciones_manipuleo", operaciones[0]),
+                                ("operaciones_complementarias", operaciones[1]),
+                                ("medios_por_producto", medios_por_producto), ("nombres_flujos", nombres_flujos)]:
+            object.__setattr__(self, atributo, valor)
+
+        # Calendarios compilados de cada horario, compartidos por los recursos de todos los sistemas
+        object.__setattr__(self, "calendarios", dict(
+            (nombre, Calendario.compilar(horario)) for nombre, horario in self.crear_horarios().items()))
+
+    def __setattr__(self, atributo, valor):
+        raise AttributeError("La configuracion es inmutable")
+
+    def __getstate__(self):
+        return dict((atributo, getattr(self, atributo)) for atributo in self.__slots__)
+
+    def __setstate__(self, estado):
+        for atributo, valor in estado.items():
+            object.__setattr__(self, atributo, valor)
+
+    def crear_horarios(self):
+        """
+        Genera los diccionarios de horarios usados por los recursos.
+        """
+        return dict((nombre, dict((dias, dict(horas)) for dias, horas in horario))
+                    for nombre, horario in self.horarios)
 
-            espera_t += 1
-            yield sistema.timeout(1)
 
-            # Si se espera por un Transbordo en sistema mecanizado (C), se deja de esperar solo si se dispone
-            # producto en almacen 1
-            if espera_t == tpaciencia_t and operacion.nombre == "Transbordo en sistema mecanizado (C)"\
-                    and not self.dispone_producto_espacio_medio_almacenamiento(
-                        sistema.medios_almacenamiento["Almacen 1"]):
-                tpaciencia_t += 1
+# Configuraciones ya cargadas, por archivo y fecha de modificación
+CONFIGURACIONES = {}
 
-        if self.dispone_producto_espacio_medio_almacenamiento(medio_de_almacenamiento) and espera_t <= tpaciencia_t \
-                and self.entre_primeros_cola_recurso(operacion.recurso) \
-                and self.entre_primeros_cola_medio_de_almacenamiento(medio_de_almacenamiento):
 
-            fin_espera_disponibilidad = sistema.now
+class PlantillaSistema(object):
+    """
+    Clase para la construcción repetida de sistemas con la misma configuración y opciones.
+    Los sistemas creados comparten la configuración, cargada y validada una sola vez, junto con sus calendarios
+    compilados y sus tablas de operaciones. Cada sistema construye sus propios recursos, medios de almacenamiento,
+    operaciones y flujos aleatorios, porque cambian durante la simulación, y se crea directamente con la semilla
+    de su replica.
+    """
 
-            yield sistema.process(self.espera_horario_atencion(sistema, operacion))
+    def __init__(self, configuracion=None, **opciones):
+        """
+        Define la configuración y las opciones de Sistema de la plantilla.
 
-            espera_r_a_extra = sistema.now - fin_espera_disponibilidad
+        :type configuracion: Configuracion
+        """
+        self.configuracion = configuracion if configuracion is not None else cargar_configuracion()
+        self.opciones = opciones
 
-            espera_r_a += espera_r_a_extra
-            espera_t += espera_r_a_extra
+    def crear(self, semilla=55, **opciones):
+        """
+        Crea un sistema nuevo. Las opciones indicadas reemplazan a las de la plantilla.
 
-            sistema.exit(["Inicia", espera_r_a, espera_p_e, espera_m_a, espera_t])
+        :type semilla: int
+        """
+        opciones_sistema = dict(self.opciones)
+        opciones_sistema.update(opciones)
+        return Sistema(configuracion=self.configuracion, semilla=semilla, **opciones_sistema)
 
-        else:
 
-            sistema.exit(["No inicia", espera_r_a, espera_p_e, espera_m_a, espera_t])
-
-    def espera_operacion(self, sistema, operacion):
-        """
-        Simula la espera por disponibilidad de:
-        - Recursos de atención
-        - Producto o espacio en sistema
-        - Capacidad de sistema disponible
+def medir_construccion(repeticiones=1000, **opciones):
+    """
+    Mide el tiempo medio de construcción de un sistema, en milisegundos, sin ejecutar la simulación.
 
-        :type sistema: Sistema
-        :type operacion: Operacion
-        """
-        espera = 0
-        while True:
-            if self.entre_primeros_cola_recurso(operacion.recurso):
+    :type repeticiones: int
+    """
+    plantilla = PlantillaSistema(**opciones)
 
-                if self.manipulado.triggered or operacion.recurso.nombre in ["Balanza 2", "Estacion Tolva/Balanza 3"]:
-                    break
+    inicio = time.time()
+    for semilla in range(repeticiones):
+        plantilla.crear(semilla)
 
-                elif self.dispone_producto_espacio_sistema(sistema) \
-                        and len(sistema.camiones_en_sistema) <= sistema.capacidad_sistema:
-                    break
+    return (time.time() - inicio) * 1000.0 / repeticiones
 
-                else:
-                    self.intenta_adelantar_camion_operacion(sistema, operacion)
 
-            espera += 1
-            yield sistema.timeout(1)
+class PuntoDeControl(object):
+    """
+    Clase para los puntos de control de un sistema en ejecución, restaurados por repetición.
+    Los procesos de la simulación son generadores que no pueden serializarse, por lo que el punto de control
+    no guarda el estado del sistema sino lo necesario para reconstruirlo (configuración, opciones y semilla),
+    junto con el tiempo y una descripción del estado para verificarlo. Cada restauración vuelve a simular
+    el sistema desde el inicio hasta ese tiempo, por lo que tiene el mismo costo que la simulación original.
+    """
 
-        yield sistema.process(self.espera_horario_atencion(sistema, operacion))
+    # Opciones del sistema que pueden cambiarse al restaurar, para continuar la simulación con otra política
+    POLITICAS = ("capacidad_sistema", "longitud_cola_aceptable", "longitud_cola_aceptable_cuadrillas")
 
-    def espera_horario_atencion(self, sistema, operacion):
+    def __init__(self, configuracion, opciones, semilla, tiempo, estado, cambios_politicas=()):
         """
-        Simula la espera de horarios de atención de los recursos.
+        Define el punto de control.
+
+        :type configuracion: Configuracion
+        :type opciones: dict
+        :type semilla: int
+        :type tiempo: float
+        :type estado: dict
+        :type cambios_politicas: list
+        """
+        self.configuracion = configuracion
+        self.opciones = dict(opciones)
+        self.semilla = semilla
+        self.tiempo = tiempo
+        self.estado = estado
+        self.cambios_politicas = list(cambios_politicas)
+
+    def restaurar(self, registros=(), **politicas):
+        """
+        Crea un sistema nuevo y lo simula hasta el tiempo del punto de control, verificando que alcance el
+        mismo estado. Los cambios de políticas del sistema original se repiten en el tiempo en que se realizaron,
+        y las politicas indicadas reemplazan a las del sistema original a partir del tiempo del punto de control.
+        Los registros indicados se agregan antes de repetir la simulación, por lo que reciben todas las filas
+        de datos desde el inicio, igual que los registros del sistema original.
 
-        :type sistema: Sistema
-        :type operacion: Operacion
+        :type registros: list
         """
+        for politica in politicas:
+            if politica not in self.POLITICAS:
+                raise ValueError("Politica desconocida: " + politica)
 
-        dia = round(sistema.now / (24 * 60) + 0.5)
-        t_dia = sistema.now - 24 * 60 * (dia - 1)
+        sistema = Sistema(configuracion=self.configuracion, semilla=self.semilla, **self.opciones)
+        for registro in registros:
+            sistema.agregar_registro(registro)
 
-        if dia % 6 != 0:
-            if t_dia < operacion.recurso.horario["L-V"]["Ingreso"] * 60:
-                espera_r_a_extra = int(operacion.recurso.horario["L-V"]["Ingreso"] * 60 - t_dia)
-                yield sistema.timeout(espera_r_a_extra)
+        sistema.iniciar()
 
-            elif operacion.recurso.horario["L-V"]["I. Descanso"] * 60 \
-                    <= t_dia < operacion.recurso.horario["L-V"]["F. Descanso"] * 60:
-                espera_r_a_extra = int(operacion.recurso.horario["L-V"]["F. Descanso"] * 60 - t_dia)
-                yield sistema.timeout(espera_r_a_extra)
+        for tiempo, politica, valor in self.cambios_politicas:
+            if tiempo > sistema.now:
+                sistema.run(until=tiempo)
+            sistema.cambiar_politica(politica, valor)
 
-            elif t_dia >= operacion.recurso.horario["L-V"]["Salida"] * 60:
-                print str(self) + " llego tarde, sale del sistema sin atención"
-                if dia % 5 != 0:
-                    espera_r_a_extra = int((operacion.recurso.horario["L-V"]["Ingreso"] + 24) * 60 - t_dia)
-                    yield sistema.timeout(espera_r_a_extra)
-                else:
-                    espera_r_a_extra = int((operacion.recurso.horario["SAB"]["Ingreso"] + 24) * 60 - t_dia)
-                    yield sistema.timeout(espera_r_a_extra)
-        else:
-            if t_dia < operacion.recurso.horario["SAB"]["Ingreso"] * 60:
-                espera_r_a_extra = int(operacion.recurso.horario["SAB"]["Ingreso"] * 60 - t_dia)
-                yield sistema.timeout(espera_r_a_extra)
-            elif t_dia >= operacion.recurso.horario["SAB"]["Salida"] * 60:
-                print str(self) + " llego tarde, sale del sistema sin atención"
-                espera_r_a_extra = int((operacion.recurso.horario["L-V"]["Ingreso"] + 24) * 60 - t_dia)
-                yield sistema.timeout(espera_r_a_extra)
+        if self.tiempo > sistema.now:
+            sistema.run(until=self.tiempo)
 
-    def intenta_adelantar_camion_operacion(self, sistema, operacion):
+        if sistema.estado() != self.estado:
+            raise RuntimeError("El sistema restaurado no alcanzo el estado del punto de control")
+
+        for politica, valor in sorted(politicas.items()):
+            sistema.cambiar_politica(politica, valor)
+
+        return sistema
+
+    def guardar(self, archivo):
         """
-        Simula el intento de adelantar camiones por detras siempre que sea factible y conveniente
+        Guarda el punto de control en un archivo.
 
-        :type sistema: Sistema
-        :type operacion: Operacion
+        :type archivo: str
         """
-        if not self.dispone_producto_espacio_sistema(sistema):
+        with open(archivo, "wb") as salida:
+            pickle.dump(self, salida, pickle.HIGHEST_PROTOCOL)
 
-            if any(c.dispone_producto_espacio_sistema(sistema) or c.manipulado.triggered
-                   for c in operacion.recurso.cola_detras_de_camion(self)):
-                camion_adelantado = [c for c in operacion.recurso.cola_detras_de_camion(self)
-                                     if c.dispone_producto_espacio_sistema(sistema) or c.manipulado.triggered][0]
+    @staticmethod
+    def cargar(archivo):
+        """
+        Carga un punto de control desde un archivo.
 
-                operacion.recurso.cola.remove(camion_adelantado)
-                operacion.recurso.cola = \
-                    operacion.recurso.cola[0:operacion.recurso.cola.index(self)] \
-                    + [camion_adelantado] + operacion.recurso.cola[operacion.recurso.cola.index(self):]
+        :type archivo: str
+        """
+        with open(archivo, "rb") as entrada:
+            return pickle.load(entrada)
 
-                print str(camion_adelantado) + " adelantado bajo criterio de " + str(self) + " " + str(sistema.now)
-                print "\t" + str(operacion.recurso.nombre) + ": " \
-                      + str(operacion.recurso.cola) + " Hora: " + str(sistema.now)
-        else:
 
-            if any(c.manipulado.triggered
-                   for c in operacion.recurso.cola_detras_de_camion(self)):
-                camion_adelantado = [c for c in operacion.recurso.cola_detras_de_camion(self)
-                                     if c.manipulado.triggered][0]
+def cargar_configuracion(archivo=None):
+    """
+    Carga una configuración desde un archivo .json, por defecto alpasur.json junto a este módulo.
+    Las configuraciones se guardan como plantillas, y solo se vuelven a leer si el archivo fue modificado.
 
-                operacion.recurso.cola.remove(camion_adelantado)
-                operacion.recurso.cola = \
-                    operacion.recurso.cola[0:operacion.recurso.cola.index(self)] \
-                    + [camion_adelantado] + operacion.recurso.cola[operacion.recurso.cola.index(self):]
+    :type archivo: str
+    """
+    if archivo is None:
+        archivo = os.path.join(os.path.dirname(os.path.abspath(__file__)), "alpasur.json")
 
-                print str(camion_adelantado) + " adelantado bajo criterio de " + str(self) + " " + str(sistema.now)
-                print "\t" + str(operacion.recurso.nombre) + ": " \
-                      + str(operacion.recurso.cola) + " Hora: " + str(sistema.now)
+    clave = (os.path.abspath(archivo), os.path.getmtime(archivo))
 
-    def solicita_adelanto(self, sistema, operacion, medio_de_almacenamiento):
-        """
-        Permite la solicitud de adelanto cuando un camion arriba a una operacion
+    if clave not in CONFIGURACIONES:
+        with open(archivo) as json_file:
+            CONFIGURACIONES[clave] = Configuracion(json.load(json_file, object_pairs_hook=collections.OrderedDict))
 
-        :type medio_de_almacenamiento: MedioDeAlmacenamiento
-        :type operacion: Operacion
-        :type sistema: Sistema
-        """
+    return CONFIGURACIONES[clave]
 
-        primeros_cola_r_a = operacion.recurso.cola[0:operacion.recurso.capacity]
-        primeros_cola_m_a = medio_de_almacenamiento.cola[0:medio_de_almacenamiento.espacios_de_atencion]
 
-        primeros_cola_r_a_disponen_p_e = \
-            all(camion.dispone_producto_espacio_medios_almacenamiento(sistema)
-                for camion in primeros_cola_r_a)
+def texto(valor):
+    """
+    Convierte los textos leidos de un archivo .json a str.
 
-        primeros_cola_m_a_disponen_p_e = \
-            all(camion.dispone_producto_espacio_medio_almacenamiento(medio_de_almacenamiento)  # TODO rev. posibles bugs
-                for camion in primeros_cola_m_a)
+    :type valor: unicode
+    """
+    if isinstance(valor, unicode):
+        return valor.encode("utf-8")
+    return str(valor)
 
-        primeros_cola_r_a_entre_primeros_colas_m_a = \
-            all(camion.entre_primeros_colas_medios_almacenamiento(sistema)
-                for camion in primeros_cola_r_a)
 
-        if operacion.nombre == "Transbordo en sistema mecanizado":
-            pass
+class ProcesoLlegadas(object):
+    """
+    Clase base para los procesos de llegada de camiones a la instalación.
+    Cada proceso genera de forma perezosa los intervalos entre llegadas, en minutos enteros, de una replica.
+    """
 
-        elif self.dispone_producto_espacio_medio_almacenamiento(medio_de_almacenamiento):
+    # Si es verdadero, el proceso genera también la carga y el tipo de cada camion
+    reproduce_camiones = False
 
-            if self.nombre == 9:
-                print primeros_cola_m_a
+    def __init__(self, escala=1.0):
+        """
+        Define la escala del proceso: con una escala de 2 llegan el doble de camiones en el mismo tiempo.
 
-            if self.entre_primeros_cola_medio_de_almacenamiento(medio_de_almacenamiento) \
-                    and (not primeros_cola_r_a_disponen_p_e or not primeros_cola_r_a_entre_primeros_colas_m_a):
-                primeros_cola_r_a[operacion.recurso.count].adelanta_camion(
-                    sistema, operacion, medio_de_almacenamiento, self, "Operacion")
+        :type escala: float
+        """
+        if escala <= 0:
+            raise ValueError("La escala de las llegadas debe ser positiva")
+        self.escala = float(escala)
 
-            if self.entre_primeros_cola_recurso(operacion.recurso) and not primeros_cola_m_a_disponen_p_e:
+    def intervalos(self, sistema):
+        """
+        Genera los intervalos entre llegadas de camiones al sistema. Las llegadas concluyen al agotarse el
+        generador.
 
-                primeros_cola_m_a[medio_de_almacenamiento.espacios_en_uso].adelanta_camion(
-                    sistema, operacion, medio_de_almacenamiento, self, "Almacen")
+        :type sistema: Sistema
+        """
+        raise NotImplementedError
 
-    def solicita_adelanto_operacion(self, sistema, operacion, medio_de_almacenamiento=None):
+    def __repr__(self):
+        return "%s(escala=%g)" % (self.__class__.__name__, self.escala)
+
+
+class LlegadasUniformes(ProcesoLlegadas):
+    """
+    Clase para llegadas con intervalos uniformes entre un mínimo y un máximo, divididos por la escala.
+    Con escala 1 cada intervalo se redondea a minutos por separado, como en la version original. Con otra escala
+    se redondea el tiempo de llegada acumulado: con escalas grandes muchos intervalos son 0, y redondearlos por
+    separado cambiaría la tasa de llegadas.
+    """
+
+    def __init__(self, minimo=5, maximo=15, escala=1.0):
         """
-        Permite la solicitud de adelanto cuando un camion arriba a una operacion
+        Define el intervalo mínimo y máximo entre llegadas, en minutos.
+
+        :type minimo: float
+        :type maximo: float
+        :type escala: float
+        """
+        super(LlegadasUniformes, self).__init__(escala)
+        self.minimo = minimo
+        self.maximo = maximo
+
+    def intervalos(self, sistema):
+        """
+        Genera intervalos uniformes con el flujo aleatorio de llegadas del sistema.
 
-        :type medio_de_almacenamiento: MedioDeAlmacenamiento
-        :type operacion: Operacion
         :type sistema: Sistema
         """
+        acumulado = 0.0
+        llegada = 0
 
-        primeros_cola_r_a = operacion.recurso.cola[0:operacion.recurso.capacity]
-        primeros_cola_r_a_disponen_p_e_s_o_manip =\
-            all(camion.dispone_producto_espacio_sistema(sistema) or camion.manipulado.triggered
-                for camion in primeros_cola_r_a)
+        while True:
+            # TODO Modificar con información real
+            tell = sistema.flujo_aleatorio("Llegadas").uniform(self.minimo, self.maximo) / self.escala
 
-        if operacion.recurso.nombre == "Balanza 2":
-            pass
-        elif operacion.nombre == "Primer pesaje - B3":
-            operacion.recurso.cola[operacion.recurso.count].adelanta_camion(
-                sistema, operacion, medio_de_almacenamiento, self, "Operacion")
-        elif (self.dispone_producto_espacio_sistema(sistema) or self.manipulado.triggered) \
-                and not primeros_cola_r_a_disponen_p_e_s_o_manip:
-            primeros_cola_r_a[operacion.recurso.count].adelanta_camion(
-                sistema, operacion, medio_de_almacenamiento, self, "Operacion")
+            if self.escala == 1:
+                yield int(round(tell, 0))
+            else:
+                acumulado += tell
+                siguiente = int(round(acumulado, 0))
+                yield siguiente - llegada
+                llegada = siguiente
 
-    def adelanta_camion(self, entorno, operacion, medio_de_origen_o_destino, camion, tipo):
+    def __repr__(self):
+        return "LlegadasUniformes(minimo=%g, maximo=%g, escala=%g)" % (self.minimo, self.maximo, self.escala)
+
+
+class LlegadasPorPerfil(ProcesoLlegadas):
+    """
+    Clase para llegadas de Poisson no estacionarias, con una tasa de camiones por hora para cada hora de un ciclo
+    que se repite. El ciclo puede ser un dia (24 tasas), una semana (168 tasas) o el ciclo del calendario de un
+    horario de atención. Las llegadas se generan por adelgazamiento a partir de la tasa máxima.
+    """
+
+    def __init__(self, tasas_por_hora, escala=1.0):
         """
-        Permite que el camion adelante a otro que este por detras en la cola del medio de almacenamiento
-        y/o del recurso de atencion
+        Define las tasas de llegada por hora del ciclo, en camiones por hora.
 
-        :type tipo: str
-        :type medio_de_origen_o_destino: MedioDeAlmacenamiento
-        :type entorno: Sistema
-        :type operacion: Operacion
-        :type camion: Camion
+        :type tasas_por_hora: list
+        :type escala: float
         """
-        # TODO mejorar implementacion
+        super(LlegadasPorPerfil, self).__init__(escala)
+        self.tasas_por_hora = None if tasas_por_hora is None else [float(t) for t in tasas_por_hora]
 
-        if tipo == "Operacion":
+        # Horario de atención al que se liga el perfil, si las tasas se calculan con su calendario
+        self.horario = None
+        self.tasa_en_horario = None
+        self.tasa_fuera_de_horario = None
+
+        if self.tasas_por_hora is not None and \
+                (not self.tasas_por_hora or min(self.tasas_por_hora) < 0 or max(self.tasas_por_hora) <= 0):
+            raise ValueError("Las tasas de llegada deben ser no negativas y al menos una positiva")
 
-            operacion.recurso.cola.remove(camion)
-            operacion.recurso.cola = \
-                operacion.recurso.cola[0:operacion.recurso.cola.index(self)] \
-                + [camion] + operacion.recurso.cola[operacion.recurso.cola.index(self):]
+    @classmethod
+    def desde_horario(cls, horario, tasa_en_horario, tasa_fuera_de_horario=0.0, escala=1.0):
+        """
+        Genera un perfil ligado a un horario de atención de la configuración del sistema: en cada hora del ciclo
+        del calendario la tasa es la tasa en horario o fuera de horario, en proporción a los minutos de atención
+        de la hora.
+
+        :type horario: str
+        :type tasa_en_horario: float
+        :type tasa_fuera_de_horario: float
+        :type escala: float
+        """
+        if min(tasa_en_horario, tasa_fuera_de_horario) < 0 or max(tasa_en_horario, tasa_fuera_de_horario) <= 0:
+            raise ValueError("Las tasas de llegada deben ser no negativas y al menos una positiva")
 
-            print str(camion) + " adelantado bajo criterio de " + str(self) + " " + str(entorno.now)
-            print "\tEn sistema: " + str(operacion.recurso.cola) + " Hora: " + str(entorno.now)
+        llegadas = cls(None, escala)
+        llegadas.horario = horario
+        llegadas.tasa_en_horario = float(tasa_en_horario)
+        llegadas.tasa_fuera_de_horario = float(tasa_fuera_de_horario)
+        return llegadas
 
-        elif tipo == "Almacen":
+    def perfil(self, sistema):
+        """
+        Obtiene las tasas por hora del ciclo, calculando las de un perfil ligado a un horario con el calendario
+        del horario en la configuración del sistema.
 
-            medio_de_origen_o_destino.cola.remove(camion)
-            medio_de_origen_o_destino.cola = \
-                medio_de_origen_o_destino.cola[0:medio_de_origen_o_destino.cola.index(self)] \
-                + [camion] + medio_de_origen_o_destino.cola[medio_de_origen_o_destino.cola.index(self):]
+        :type sistema: Sistema
+        """
+        if self.tasas_por_hora is not None:
+            return self.tasas_por_hora
 
-            print str(camion) + " adelantado bajo criterio de " + str(self) + " " + str(entorno.now)
-            print "\t" + medio_de_origen_o_destino.nombre + ":" \
-                  + str(medio_de_origen_o_destino.cola) + " Hora: " + str(entorno.now)
+        calendario = sistema.configuracion.calendarios[self.horario]
+        tasas = []
+        for hora in range(Calendario.DIAS_CICLO * 24):
+            atencion = calendario.minutos_de_atencion_en_ciclo(hora * 60, (hora + 1) * 60) / 60.0
+            tasas.append(self.tasa_en_horario * atencion + self.tasa_fuera_de_horario * (1 - atencion))
+        return tasas
 
-    def intenta_adelantar_camion_manipuleo(self, sistema, operacion, medio_de_almacenamiento):
+    def intervalos(self, sistema):
         """
-        Simula el intento de adelantar camiones por detras siempre que sea factible y conveniente
+        Genera los intervalos de llegadas de Poisson con la tasa de cada hora, con el flujo aleatorio de
+        llegadas del sistema.
 
         :type sistema: Sistema
-        :type operacion: Operacion
-        :type medio_de_almacenamiento: MedioDeAlmacenamiento
         """
+        tasas = [tasa * self.escala / 60 for tasa in self.perfil(sistema)]
+        tasa_maxima = max(tasas)
 
-        entre_primeros_cola_m_a = \
-            self.entre_primeros_cola_medio_de_almacenamiento(medio_de_almacenamiento)
+        # Un perfil ligado a un horario sin atención, con tasa nula fuera de horario, no tiene llegadas
+        if tasa_maxima <= 0:
+            raise ValueError("El perfil de llegadas no tiene ninguna tasa positiva")
+        flujo = sistema.flujo_aleatorio("Llegadas")
 
-        entre_primeros_cola_r_a = \
-            self.entre_primeros_cola_recurso(operacion.recurso)
+        tiempo = llegada = sistema.now
 
-        # El camion verifica si puede adelantar algun camion por detras en la cola del
-        # medio de almacenamiento que disponga producto/espacio y este por detras en la
-        # cola del recurso de atención
-        if entre_primeros_cola_m_a and entre_primeros_cola_r_a and \
-                any(c.dispone_producto_espacio_medio_almacenamiento(medio_de_almacenamiento) and
-                    c.atras_de_camion_en_cola_recurso(self, operacion.recurso)
-                    for c in medio_de_almacenamiento.cola_detras_de_camion(self)):
-            c_adelantado = [ca for ca in medio_de_almacenamiento.cola_detras_de_camion(self)
-                            if ca.dispone_producto_espacio_medios_almacenamiento(sistema) and
-                            ca.atras_de_camion_en_cola_recurso(self, operacion.recurso)][0]
+        while True:
+            tiempo -= math.log(1 - flujo.uniform(0, 1)) / tasa_maxima
 
-            self.adelanta_camion(sistema, operacion, medio_de_almacenamiento, c_adelantado, "Almacen")
+            if flujo.uniform(0, 1) * tasa_maxima <= tasas[int(tiempo // 60) % len(tasas)]:
+                siguiente = int(round(tiempo, 0))
+                yield max(0, siguiente - llegada)
+                llegada = max(llegada, siguiente)
 
-        # El camion verifica si puede adelantar algun camion por detras en la cola del
-        # medio de almacenamiento que disponga producto/espacio y este entre los primeros
-        # en alguna cola de recursos de atención
-        if entre_primeros_cola_m_a and \
-                any(c.dispone_producto_espacio_medio_almacenamiento(medio_de_almacenamiento) and
-                    c.entre_primeros_colas_recursos(sistema.recursos_atencion)
-                    for c in medio_de_almacenamiento.cola_detras_de_camion(self)):
-            c_adelantado = [ca for ca in medio_de_almacenamiento.cola_detras_de_camion(self)
-                            if ca.dispone_producto_espacio_medios_almacenamiento(sistema) and
-                            ca.entre_primeros_colas_recursos(sistema.recursos_atencion)][0]
 
-            self.adelanta_camion(sistema, operacion, medio_de_almacenamiento, c_adelantado, "Almacen")
+class LlegadasDesdeArchivo(ProcesoLlegadas):
+    """
+    Clase para llegadas leidas de un archivo .csv con el instante de llegada de cada camion, en minutos desde el
+    inicio de la simulación y en orden creciente. El archivo se lee a medida que llegan los camiones, sin
+    cargarlo en memoria. La escala comprime los instantes de llegada.
+    """
 
-        # El camion verifica si puede adelantar algun camion por detras en la cola del
-        # recurso de atención que disponga producto/espacio y este entre los primeros
-        # en alguna cola de medios de almacenamiento
-        if entre_primeros_cola_r_a and \
-                any(c.dispone_producto_espacio_y_entre_primeros_medios_almacenamiento(sistema)  # TODO rev. posib. bugs
-                    for c in operacion.recurso.cola_detras_de_camion(self)):
-            c_adelantado = [ca for ca in operacion.recurso.cola_detras_de_camion(self)
-                            if ca.dispone_producto_espacio_medios_almacenamiento(sistema) and
-                            ca.entre_primeros_colas_medios_almacenamiento(sistema)][0]
+    def __init__(self, archivo, columna="Llegada", escala=1.0, delimitador=";"):
+        """
+        Define el archivo y la columna con los instantes de llegada.
 
-            self.adelanta_camion(sistema, operacion, medio_de_almacenamiento, c_adelantado, "Operacion")
+        :type archivo: str
+        :type columna: str
+        :type escala: float
+        :type delimitador: str
+        """
+        super(LlegadasDesdeArchivo, self).__init__(escala)
+        self.archivo = archivo
+        self.columna = columna
+        self.delimitador = delimitador
 
-    def medios_almacenamiento_destino(self, sistema):
+    def filas(self, sistema, *columnas):
         """
-        Genera los medios de almacenamiento que puede usar el camion.
+        Genera el intervalo hasta cada llegada del archivo junto con los valores de las columnas indicadas.
 
         :type sistema: Sistema
+        :type columnas: str
         """
-        medios_de_almacenamiento_destino = []
-        for ma in sistema.medios_almacenamiento:
-            if self.carga in sistema.medios_almacenamiento[ma].niveles.keys():
-                medios_de_almacenamiento_destino.append(sistema.medios_almacenamiento[ma])
+        llegada = sistema.now
 
-        return medios_de_almacenamiento_destino
+        with open(self.archivo, "rb") as csv_file:
+            reader = csv.reader(csv_file, delimiter=self.delimitador)
+            encabezado = next(reader)
 
-    def dispone_camion_esperando_camion(self, sistema):
-        """
-        Identifica si hay algún camion esperando por transbordo.
+            try:
+                indice = encabezado.index(self.columna)
+                indices = [encabezado.index(columna) for columna in columnas]
+            except ValueError as error:
+                raise ValueError("Columna inexistente en " + self.archivo + ": " + str(error))
 
-        :type sistema: Sistema
-        """
+            for fila in reader:
+                siguiente = int(round(float(fila[indice]) / self.escala, 0))
 
-        if self.tipo == "Carga":
-            tipo_camion_en_espera = "Descarga"
-        else:
-            tipo_camion_en_espera = "Carga"
+                if siguiente < llegada:
+                    raise ValueError("Las llegadas de " + self.archivo + " no estan en orden creciente")
 
-        if len(sistema.colas_espera_transbordo[self.carga][tipo_camion_en_espera]) > 0:
-            return True
-        else:
-            return False
+                yield [siguiente - llegada] + [fila[i] for i in indices]
+                llegada = siguiente
 
-    def dispone_producto_espacio_sistema(self, sistema):
+    def intervalos(self, sistema):
         """
-        Identifica si hay producto o espacio disponible en el sistema para atender al camion.
+        Genera los intervalos entre los instantes de llegada del archivo.
 
         :type sistema: Sistema
         """
-        camiones_comparables_a_cargar = 0
-        camiones_comparables_a_descargar = 0
+        for intervalo, in self.filas(sistema):
+            yield intervalo
 
-        if self.tipo == "Carga":
-            camiones_comparables_a_cargar += \
-                sum(1 for c in sistema.camiones_en_sistema
-                    if c.carga == self.carga and c.tipo == "Carga" and not c.manipulado.triggered)
-            camiones_comparables_a_descargar += \
-                sum(1 for c in sistema.camiones_en_sistema
-                    if c.carga == self.carga and c.tipo == "Descarga" and not c.manipulado.triggered)
-            if not self.manipulado.triggered and self in sistema.camiones_en_sistema:
-                camiones_comparables_a_cargar -= 1
-        else:
-            camiones_comparables_a_cargar += \
-                sum(1 for c in sistema.camiones_en_sistema
-                    if self.medios_almacenamiento_destino(sistema) == c.medios_almacenamiento_destino(sistema) and
-                    c.tipo == "Carga" and not c.manipulado.triggered)
-            camiones_comparables_a_descargar += \
-                sum(1 for c in sistema.camiones_en_sistema
-                    if self.medios_almacenamiento_destino(sistema) == c.medios_almacenamiento_destino(sistema) and
-                    c.tipo == "Descarga" and not c.manipulado.triggered)
-            if not self.manipulado.triggered and self in sistema.camiones_en_sistema:
-                camiones_comparables_a_descargar -= 1
+    def __repr__(self):
+        return "%s(%r, escala=%g)" % (self.__class__.__name__, self.archivo, self.escala)
 
-        producto_espacio_disponible = 0
 
-        for almacen in self.medios_almacenamiento_destino(sistema):
+class ReproduccionDeCamiones(LlegadasDesdeArchivo):
+    """
+    Clase para la reproducción de llegadas registradas, por ejemplo en los registros de porteria, leidas de un
+    archivo .csv con el instante de llegada, la carga y el tipo (Carga o Descarga) de cada camion. Los camiones
+    se crean con la carga y el tipo registrados, leyendo el archivo a medida que llegan.
+    """
 
-            if self.tipo == "Carga":
-                producto_espacio_disponible += almacen.niveles[self.carga]
-            else:
-                producto_espacio_disponible += almacen.espacio
+    reproduce_camiones = True
 
-        if self.tipo == "Carga":
+    def __init__(self, archivo, columna="Llegada", columna_carga="Carga", columna_tipo="Tipo", escala=1.0,
+                 delimitador=";"):
+        """
+        Define el archivo y sus columnas de instante de llegada, carga y tipo.
 
-            if producto_espacio_disponible + 28 * (camiones_comparables_a_descargar - camiones_comparables_a_cargar) \
-                    >= 28:
-                return True
-            else:
-                return False
-        else:
-            if self.carga == "Fierro":
-                return True
-            elif producto_espacio_disponible + 28 * (camiones_comparables_a_cargar - camiones_comparables_a_descargar) \
-                    >= 28:
-                return True
-            else:
-                return False
+        :type archivo: str
+        :type columna: str
+        :type columna_carga: str
+        :type columna_tipo: str
+        :type escala: float
+        :type delimitador: str
+        """
+        super(ReproduccionDeCamiones, self).__init__(archivo, columna, escala, delimitador)
+        self.columna_carga = columna_carga
+        self.columna_tipo = columna_tipo
 
-    def dispone_producto_espacio_medios_almacenamiento(self, sistema):
+    def camiones(self, sistema):
         """
-        Permite identificar si se dispone producto o espacio en algun medio de almacenamiento para atender al camion.
+        Genera el intervalo hasta cada llegada del archivo junto con la carga y el tipo del camion.
 
         :type sistema: Sistema
         """
-        medios_de_almacenamiento = sistema.medios_almacenamiento.values()
-        prod_o_esp_dip = False
+        for intervalo, carga, tipo in self.filas(sistema, self.columna_carga, self.columna_tipo):
+            yield intervalo, carga, tipo
 
-        if self.transbordo == "Si" or (self.tipo == "Descarga" and self.carga == "Fierro"):
-            prod_o_esp_dip = True
-        elif any(self.carga in ma.niveles.keys() and self.dispone_producto_espacio_medio_almacenamiento(ma)
-                 for ma in medios_de_almacenamiento):
-            prod_o_esp_dip = True
 
-        return prod_o_esp_dip
+class Camion(object):
+    """Clase para el modelado de camiones presentes en el sistema"""
 
-    def dispone_producto_espacio_y_entre_primeros_medios_almacenamiento(self, sistema):  # TODO revisar posibles bugs
+    __slots__ = ("nombre", "carga", "tipo", "peso", "trailer", "medio_transbordo", "manipulado", "en_sistema",
+                 "medios_destino", "transbordo", "llegada", "espera")
+
+    def __init__(self, sistema, nombre, carga=None, tipo=None):
         """
-        Permite identificar si se dispone producto o espacio en algún medio de almacenamiento para atender al camion,
-        y si el mismo esta entre los primeros camiones a ser atendidos.
+        Define las propiedades principales de la clase Camion. La carga y el tipo que no se indican se eligen
+        al azar.
 
         :type sistema: Sistema
+        :type nombre: int
+        :type carga: str
+        :type tipo: str
         """
-        medios_de_almacenamiento = sistema.medios_almacenamiento.values()
-        prod_o_esp_dip = False
+        productos = sistema.productos
 
-        if self.transbordo == "Si" or (self.tipo == "Descarga" and self.carga == "Fierro"):
-            prod_o_esp_dip = True
-        elif any(self.carga in ma.niveles.keys() and self.dispone_producto_espacio_medio_almacenamiento(ma) and
-                 self.entre_primeros_cola_medio_de_almacenamiento(ma)
-                 for ma in medios_de_almacenamiento):
-            prod_o_esp_dip = True
+        self.nombre = nombre
 
-        return prod_o_esp_dip
+        if carga is None:
+            # TODO modificar con datos reales
+            self.carga = sistema.flujo_aleatorio("Cargas").choice(productos)
+        elif carga in productos:
+            self.carga = productos[productos.index(carga)]
+        else:
+            raise ValueError("Carga desconocida: " + carga)
 
-    def dispone_producto_espacio_medio_almacenamiento(self, medio_de_almacenamiento):
-        """
-        Permite identificar si se dispone producto o espacio en el medio de almacenamiento para atender al camion.
+        if self.carga not in CODIGOS_CARGA:
+            sistema.traza.registrar("error", Traza.ERROR, "ERROR CARGA DESCONOCIDA: %s", self.carga)
 
-        :type medio_de_almacenamiento: MedioDeAlmacenamiento
+        if tipo not in (None, "Descarga", "Carga"):
+            raise ValueError("Tipo de camion desconocido: " + tipo)
+
+        if tipo == "Descarga" or tipo is None and sistema.flujo_aleatorio("Tipos").random() <= 0.5:
+            self.tipo = "Descarga"
+            self.peso = 28  # TODO analizar eliminación
+        else:
+            self.peso = 0
+            self.tipo = "Carga"
+
+        # El nivel del trailer inicia vacio, tal como quedaba el contenedor al registrar sus niveles
+        self.trailer = Trailer(28)
+        self.medio_transbordo = None
+
+        self.manipulado = sistema.event()
+        self.en_sistema = False
+        self.medios_destino = self.medios_almacenamiento_destino(sistema)
+        self.transbordo = "No"
+
+        # Hora de llegada a la instalacion y espera acumulada en las operaciones
+        self.llegada = None
+        self.espera = 0
+
+    def medio_de_transbordo(self, sistema):
         """
+        Retorna el medio de almacenamiento que representa al trailer cuando el camion actua como origen o
+        destino de un transbordo. Se crea solo al ser requerido.
 
-        prod_o_esp_dip = False
+        :type sistema: Sistema
+        """
+        if self.medio_transbordo is None:
+            niveles = {self.carga: self.peso}
+            self.medio_transbordo = MedioDeAlmacenamiento(sistema, str(self.nombre), 1, niveles, 28, self.peso)
+        return self.medio_transbordo
 
-        if self in medio_de_almacenamiento.cola:
-            if self.tipo == "Carga":
-                camiones_comparables = \
-                    sum(1 for c in medio_de_almacenamiento.cola[0:medio_de_almacenamiento.cola.index(self)]
-                        if c.carga == self.carga and c.tipo == self.tipo and c.transbordo == "No")
+    def __repr__(self):
+        """
+        Define la forma de representación de entidades de la clase Camion
+        """
+
+        return str(self.nombre) + self.tipo[0] + CODIGOS_CARGA.get(self.carga, "")
+
+    @staticmethod
+    def llega_a_instalacion(sistema, intervalos):
+        """
+        Genera la llegada del camion luego del siguiente intervalo entre llegadas. Indica si el camion llego,
+        es decir, si el proceso de llegadas no concluyo.
+
+        :type sistema: Sistema
+        :type intervalos: types.GeneratorType
+        """
+        tell = next(intervalos, None)
+
+        if tell is None:
+            sistema.exit(False)
+
+        yield sistema.timeout(tell)
+        sistema.exit(True)
+
+    def espera_transbordo(self, sistema, tespera):
+        """
+        Simula la espera por un camion para realizar transbordo
+        Finalizada la espera se procede con una operacion de carga o descarga
+        Sin embargo, si otro camion llega se interrumpe la espera y se procede con un transbordo
+
+        :type sistema: Sistema
+        :type tespera: int
+        """
+        espera = None
+
+        # Inicia espera de camion para realizar transbordo
+        try:
+
+            sistema.traza.registrar("transbordo", Traza.INFO, "%s inicia espera Transbordo - Hora: %d",
+                                    self, sistema.now)
+            yield sistema.timeout(tespera)
+
+            # Consluida la espera verifica si hay producto o espacio disponible en almacenes.
+            prod_o_esp_disp = self.dispone_producto_espacio_medios_almacenamiento(sistema)
+
+            # Si producto o esapacio, termina su espera para realizar una carga o descarga
+            if prod_o_esp_disp:
+
+                sistema.traza.registrar("transbordo", Traza.INFO, "%s termino espera - Hora: %s", self, sistema.now)
+
+            # De lo contrario continua esperando mientras no haya producto o espacio en almacenes
             else:
-                camiones_comparables = \
-                    sum(1 for c in medio_de_almacenamiento.cola[0:medio_de_almacenamiento.cola.index(self)]
-                        if c.tipo == self.tipo and c.transbordo == "No")
+
+                sistema.traza.registrar("transbordo", Traza.INFO,
+                                        "%s continua espera Producto/Espacio no disponible - Hora:%s",
+                                        self, sistema.now)
+                while not prod_o_esp_disp:
+
+                    if not sistema.esperas_por_eventos:
+                        yield sistema.timeout(1)
+
+                    else:
+                        # Se duerme hasta que algun medio de almacenamiento alcance el nivel requerido, o hasta que
+                        # el nivel requerido cambie con la cola del medio o el inicio de un transbordo
+                        espera = sistema.reloj_esperas.dormir(
+                            [ma.cambio_cola for ma in self.medios_destino] + [sistema.inicio_transbordo])
+                        self.registra_umbrales_medios_almacenamiento(espera)
+                        yield espera
+
+                        self.cancela_umbrales_medios_almacenamiento(espera)
+                        espera = None
+
+                    prod_o_esp_disp = self.dispone_producto_espacio_medios_almacenamiento(sistema)
+
+            sistema.exit({"Resultado": "Termino espera", "Interrupcion": None})
+
+        # En caso que un camion llega, interrumpe la espera para proceder con el transbordo
+        except simpy.Interrupt as interrupcion:
+
+            if espera is not None:
+                sistema.reloj_esperas.cancelar(espera)
+                self.cancela_umbrales_medios_almacenamiento(espera)
+
+            sistema.traza.registrar("transbordo", Traza.INFO, "%s espera interrumpida por %s - Hora: %s",
+                                    self, interrupcion.cause, sistema.now)
+            self.transbordo = "Si"
+            sistema.inicio_transbordo.emitir()
+            sistema.exit({"Resultado": "Espera interrumpida", "Interrupcion": interrupcion.cause})
+
+    def interrumpe_espera_transbordo(self, proceso):
+        """
+        Interrumpe la espera de otro camion para realizar un transbordo.
+        Al interrumpir, el camion pasa a comportarse como medio de origen o destino de carga
+
+        :type proceso: simpy.events.Process
+        """
+        proceso.interrupt(self)
+
+    def espera_transbordo_o_interrumpe(self, sistema, tespera=float("Inf")):  # TODO Cambiar de nombre
+        """
+        Permite que un camion espere o interrumpa la espera de otro para realizar un transbordo
+
+        :type tespera: int
+        :type sistema: Sistema
+        :type self: Camion
+        """
+
+        if self.tipo == "Carga":
+            tipo_camion_en_esp = "Descarga"
         else:
-            if self.tipo == "Carga":
-                camiones_comparables = \
-                    sum(1 for c in medio_de_almacenamiento.cola
-                        if c.carga == self.carga and c.tipo == self.tipo and c.transbordo == "No")
-            else:
-                camiones_comparables = \
-                    sum(1 for c in medio_de_almacenamiento.cola
-                        if c.tipo == self.tipo and c.transbordo == "No")
+            tipo_camion_en_esp = "Carga"
 
-        if self.tipo == "Carga" and medio_de_almacenamiento.niveles[self.carga] >= 28 * (1 + camiones_comparables):
-            prod_o_esp_dip = True
-        elif self.tipo == "Descarga" and medio_de_almacenamiento.espacio >= 28 * (1 + camiones_comparables):
-            prod_o_esp_dip = True
+        # Si hay un camion esperando con el que se puede realizar un transbordo, se interrumpe su espera
+        if len(sistema.colas_espera_transbordo[self.carga][tipo_camion_en_esp]) != 0:
 
-        return prod_o_esp_dip
+            sistema.traza.registrar("transbordo", Traza.INFO, "%s Interrumpe espera  - Hora: %s", self, sistema.now)
+            self.transbordo = "Si"
+            sistema.inicio_transbordo.emitir()
+            camion_en_espera = sistema.colas_espera_transbordo[self.carga][tipo_camion_en_esp][0][0]
+            espera_en_proceso = sistema.colas_espera_transbordo[self.carga][tipo_camion_en_esp][0][1]
 
-    def entre_primeros_colas_medios_almacenamiento(self, sistema):
+            self.interrumpe_espera_transbordo(espera_en_proceso)
+
+            sistema.colas_espera_transbordo[self.carga][tipo_camion_en_esp].pop(0)  # TODO revisar
+            camion_interrumpido = camion_en_espera
+
+            sistema.registrar_manipuleo(self)
+            yield camion_interrumpido.manipulado
+
+            sistema.exit({"Resultado": "Interrumpio espera", "Interrupcion": None})
+
+        # Si no hay camiones esperando entonces el camion espera
+        else:
+
+            espera_transbordo = sistema.process(self.espera_transbordo(sistema, tespera))
+            sistema.colas_espera_transbordo[self.carga][self.tipo].append([self, espera_transbordo])
+
+            resultado_espera = yield espera_transbordo
+
+            # Si el camion concluyo la espera, sale de la cola
+            if resultado_espera["Resultado"] == "Termino espera":
+                sistema.colas_espera_transbordo[self.carga][self.tipo].pop(0)  # TODO revisar
+
+            sistema.exit(resultado_espera)
+
+    def espera_operacion_manipuleo(self, sistema, operacion, medio_de_almacenamiento, tpaciencia_t):
         """
-        Identifica si el camion esta entre los primeros camiones en alguna cola de medios de
-        almacenamiento relevantes en el sistema
+        Simula la espera por disponibilidad de:
+        - Espacios de atencion en medios de almacenamiento
+        - Recursos de ejecución
+        - Producto o espacio en medios de origen/destino
 
         :type sistema: Sistema
+        :type operacion: OperacionManipuleo
+        :type medio_de_almacenamiento: MedioDeAlmacenamiento
+        :type tpaciencia_t: int
         """
+        espera_p_e = 0
+        espera_r_a = 0
+        espera_m_a = 0
+        espera_t = 0
 
-        almacenes = sistema.medios_almacenamiento.values()
-        entre_primeros = False
+        while espera_t < tpaciencia_t:
 
-        if self.transbordo == "Si":
-            entre_primeros = True
-        elif any(self.carga in almacen.niveles.keys() and self.entre_primeros_cola_medio_de_almacenamiento(almacen)
-                 for almacen in almacenes):
-            entre_primeros = True
-        return entre_primeros
+            version = sistema.version_estado
+            adelanta = True
 
-    def entre_primeros_colas_recursos(self, recursos):
+            if self.entre_primeros_cola_medio_de_almacenamiento(medio_de_almacenamiento):
+
+                if self.entre_primeros_cola_recurso(operacion.recurso):
+
+                    if self.dispone_producto_espacio_medio_almacenamiento(medio_de_almacenamiento):
+                        break
+                    else:
+                        self.intenta_adelantar_camion_manipuleo(sistema, operacion, medio_de_almacenamiento)
+                        incremento_r_a, incremento_p_e, incremento_m_a = 0, 1, 0
+                else:
+                    self.intenta_adelantar_camion_manipuleo(sistema, operacion, medio_de_almacenamiento)
+
+                    if self.dispone_producto_espacio_medios_almacenamiento(sistema):
+                        incremento_r_a, incremento_p_e, incremento_m_a = 1, 0, 0
+                    else:
+                        incremento_r_a, incremento_p_e, incremento_m_a = 1, 1, 0
+            else:
+
+                if self.entre_primeros_cola_recurso(operacion.recurso):
+                    self.intenta_adelantar_camion_manipuleo(sistema, operacion, medio_de_almacenamiento)
+
+                    if self.dispone_producto_espacio_medios_almacenamiento(sistema):
+                        incremento_r_a, incremento_p_e, incremento_m_a = 0, 0, 1
+                    else:
+                        incremento_r_a, incremento_p_e, incremento_m_a = 0, 1, 1
+                else:
+                    adelanta = False
+
+                    if self.dispone_producto_espacio_medios_almacenamiento(sistema):
+                        incremento_r_a, incremento_p_e, incremento_m_a = 1, 0, 1
+                    else:
+                        incremento_r_a, incremento_p_e, incremento_m_a = 1, 1, 1
+
+            # Si se espera por un Transbordo en sistema mecanizado (C), al vencer la paciencia se sigue esperando
+            # minuto a minuto mientras no se disponga producto en almacen 1
+            prorroga = False
+
+            if not sistema.esperas_por_eventos:
+                minutos = 1
+                yield sistema.timeout(1)
+
+            else:
+                # Mientras el camion no este entre los primeros de ninguna cola, su verificación solo depende
+                # de ambas colas y de la disponibilidad en sus medios. En caso contrario, al intentar adelantar
+                # camiones depende del estado de todo el sistema
+                if adelanta:
+                    senales = [sistema.cambio_estado]
+                else:
+                    senales = [operacion.recurso.cambio_cola, medio_de_almacenamiento.cambio_cola,
+                               sistema.inicio_transbordo]
+                    for medio in self.medios_destino:
+                        senales.extend([medio.cambio_cola, medio.cambio_niveles])
+
+                paciencia = tpaciencia_t - espera_t
+
+                if paciencia == 1 and operacion.nombre == "Transbordo en sistema mecanizado (C)" \
+                        and not self.dispone_producto_espacio_medio_almacenamiento(
+                            sistema.medios_almacenamiento["Almacen 1"]):
+                    almacen_1 = sistema.medios_almacenamiento["Almacen 1"]
+                    senales.extend([almacen_1.cambio_cola, almacen_1.cambio_niveles, sistema.inicio_transbordo])
+                    paciencia = None
+                    prorroga = True
+
+                # Si la verificación cambio el estado del sistema, el camion vuelve a verificar en el siguiente
+                # minuto, igual que si alguna señal hubiese sido emitida
+                minutos = yield sistema.reloj_esperas.dormir(senales, paciencia, version != sistema.version_estado)
+
+            # Durante los minutos transcurridos el camion acumula las mismas esperas, y en prorroga la paciencia
+            # se extiende en cada minuto
+            espera_r_a += incremento_r_a * minutos
+            espera_p_e += incremento_p_e * minutos
+            espera_m_a += incremento_m_a * minutos
+            espera_t += minutos
+
+            if prorroga:
+                tpaciencia_t += minutos - 1
+
+            # Si se espera por un Transbordo en sistema mecanizado (C), se deja de esperar solo si se dispone
+            # producto en almacen 1
+            if espera_t == tpaciencia_t and operacion.nombre == "Transbordo en sistema mecanizado (C)"\
+                    and not self.dispone_producto_espacio_medio_almacenamiento(
+                        sistema.medios_almacenamiento["Almacen 1"]):
+                tpaciencia_t += 1
+
+        if self.dispone_producto_espacio_medio_almacenamiento(medio_de_almacenamiento) and espera_t <= tpaciencia_t \
+                and self.entre_primeros_cola_recurso(operacion.recurso) \
+                and self.entre_primeros_cola_medio_de_almacenamiento(medio_de_almacenamiento):
+
+            fin_espera_disponibilidad = sistema.now
+
+            yield sistema.process(self.espera_horario_atencion(sistema, operacion))
+
+            espera_r_a_extra = sistema.now - fin_espera_disponibilidad
+
+            espera_r_a += espera_r_a_extra
+            espera_t += espera_r_a_extra
+
+            sistema.exit(["Inicia", espera_r_a, espera_p_e, espera_m_a, espera_t])
+
+        else:
+
+            sistema.exit(["No inicia", espera_r_a, espera_p_e, espera_m_a, espera_t])
+
+    def espera_operacion(self, sistema, operacion):
         """
-        Identifica si el camion esta entre los primeros camiones en alguna cola de recursos
-        de manipuleo en el sistema
+        Simula la espera por disponibilidad de:
+        - Recursos de atención
+        - Producto o espacio en sistema
+        - Capacidad de sistema disponible
 
-        :type recursos: dict
+        :type sistema: Sistema
+        :type operacion: Operacion
         """
+        espera = 0
+        while True:
 
-        entre_primeros = False
-        recursos_manipuleo = [
-            recursos["Estacion Volcadora"],
-            recursos["Estacion Tolva/Balanza 3"],
-            recursos["Pala Mecanica"],
-            recursos["Cuadrilla de Estibaje"],
-            recursos["Cabina de Recepcion - T1"],
-            recursos["Cabina de Despacho - T1"],
-            recursos["Cabina de Recepcion - T2"],
-            recursos["Cabina de Despacho - T2"],
-            recursos["Grua"]]
+            version = sistema.version_estado
+            entre_primeros = self.entre_primeros_cola_recurso(operacion.recurso)
 
-        if any(self.entre_primeros_cola_recurso(recurso)
-               for recurso in recursos_manipuleo):
-            entre_primeros = True
-        return entre_primeros
+            if entre_primeros:
+
+                if self.manipulado.triggered \
+                        or operacion.recurso.nombre in ["Balanza 2", "Estacion Tolva/Balanza 3"]:
+                    break
+
+                elif self.dispone_producto_espacio_sistema(sistema) \
+                        and len(sistema.camiones_en_sistema) <= sistema.capacidad_sistema:
+                    break
+
+                else:
+                    self.intenta_adelantar_camion_operacion(sistema, operacion)
+
+            if not sistema.esperas_por_eventos:
+                minutos = 1
+                yield sistema.timeout(1)
+
+            else:
+                # Fuera de los primeros de la cola solo importa la cola del recurso. Entre los primeros importan
+                # ademas las existencias y la capacidad del sistema, de las que depende adelantar camiones
+                senales = [operacion.recurso.cambio_cola]
+                if entre_primeros:
+                    senales.extend([sistema.existencias_modificadas, sistema.capacidad_liberada])
+
+                minutos = yield sistema.reloj_esperas.dormir(senales, inmediata=version != sistema.version_estado)
+
+            espera += minutos
+
+        yield sistema.process(self.espera_horario_atencion(sistema, operacion))
+
+    def espera_horario_atencion(self, sistema, operacion):
+        """
+        Simula la espera de horarios de atención de los recursos.
+
+        :type sistema: Sistema
+        :type operacion: Operacion
+        """
+
+        espera_r_a_extra, tarde = operacion.recurso.calendario.espera(sistema.now)
+
+        if tarde:
+            sistema.traza.registrar("horario", Traza.INFO, "%s llego tarde, sale del sistema sin atención", self)
+
+        if espera_r_a_extra is not None:
+            yield sistema.timeout(espera_r_a_extra)
+
+    def intenta_adelantar_camion_operacion(self, sistema, operacion):
+        """
+        Simula el intento de adelantar camiones por detras siempre que sea factible y conveniente
+
+        :type sistema: Sistema
+        :type operacion: Operacion
+        """
+        if not self.dispone_producto_espacio_sistema(sistema):
+
+            if any(c.dispone_producto_espacio_sistema(sistema) or c.manipulado.triggered
+                   for c in operacion.recurso.cola_detras_de_camion(self)):
+                camion_adelantado = [c for c in operacion.recurso.cola_detras_de_camion(self)
+                                     if c.dispone_producto_espacio_sistema(sistema) or c.manipulado.triggered][0]
+
+                operacion.recurso.adelanta_en_cola(camion_adelantado, self)
+
+                sistema.traza.registrar("adelanto", Traza.INFO, "%s adelantado bajo criterio de %s %s",
+                                        camion_adelantado, self, sistema.now)
+                sistema.traza.registrar("cola", Traza.DEBUG, "\t%s: %s Hora: %s",
+                                        operacion.recurso.nombre, operacion.recurso.cola, sistema.now)
+        else:
+
+            if any(c.manipulado.triggered
+                   for c in operacion.recurso.cola_detras_de_camion(self)):
+                camion_adelantado = [c for c in operacion.recurso.cola_detras_de_camion(self)
+                                     if c.manipulado.triggered][0]
+
+                operacion.recurso.adelanta_en_cola(camion_adelantado, self)
+
+                sistema.traza.registrar("adelanto", Traza.INFO, "%s adelantado bajo criterio de %s %s",
+                                        camion_adelantado, self, sistema.now)
+                sistema.traza.registrar("cola", Traza.DEBUG, "\t%s: %s Hora: %s",
+                                        operacion.recurso.nombre, operacion.recurso.cola, sistema.now)
+
+    def solicita_adelanto(self, sistema, operacion, medio_de_almacenamiento):
+        """
+        Permite la solicitud de adelanto cuando un camion arriba a una operacion
+
+        :type medio_de_almacenamiento: MedioDeAlmacenamiento
+        :type operacion: Operacion
+        :type sistema: Sistema
+        """
+
+        primeros_cola_r_a = operacion.recurso.cola.primeros(operacion.recurso.capacity)
+        primeros_cola_m_a = medio_de_almacenamiento.cola.primeros(medio_de_almacenamiento.espacios_de_atencion)
+
+        primeros_cola_r_a_disponen_p_e = \
+            all(camion.dispone_producto_espacio_medios_almacenamiento(sistema)
+                for camion in primeros_cola_r_a)
+
+        primeros_cola_m_a_disponen_p_e = \
+            all(camion.dispone_producto_espacio_medio_almacenamiento(medio_de_almacenamiento)  # TODO rev. posibles bugs
+                for camion in primeros_cola_m_a)
+
+        primeros_cola_r_a_entre_primeros_colas_m_a = \
+            all(camion.entre_primeros_colas_medios_almacenamiento(sistema)
+                for camion in primeros_cola_r_a)
+
+        if operacion.nombre == "Transbordo en sistema mecanizado":
+            pass
+
+        elif self.dispone_producto_espacio_medio_almacenamiento(medio_de_almacenamiento):
+
+            # Solo se solicita adelanto si hay algun camion entre los primeros que aun no es atendido,
+            # y ese camion no es el mismo que solicita el adelanto
+            if self.entre_primeros_cola_medio_de_almacenamiento(medio_de_almacenamiento) \
+                    and (not primeros_cola_r_a_disponen_p_e or not primeros_cola_r_a_entre_primeros_colas_m_a) \
+                    and operacion.recurso.count < len(primeros_cola_r_a) \
+                    and primeros_cola_r_a[operacion.recurso.count] is not self:
+                primeros_cola_r_a[operacion.recurso.count].adelanta_camion(
+                    sistema, operacion, medio_de_almacenamiento, self, "Operacion")
+
+            if self.entre_primeros_cola_recurso(operacion.recurso) and not primeros_cola_m_a_disponen_p_e \
+                    and medio_de_almacenamiento.espacios_en_uso < len(primeros_cola_m_a) \
+                    and primeros_cola_m_a[medio_de_almacenamiento.espacios_en_uso] is not self:
+
+                primeros_cola_m_a[medio_de_almacenamiento.espacios_en_uso].adelanta_camion(
+                    sistema, operacion, medio_de_almacenamiento, self, "Almacen")
+
+    def solicita_adelanto_operacion(self, sistema, operacion, medio_de_almacenamiento=None):
+        """
+        Permite la solicitud de adelanto cuando un camion arriba a una operacion
+
+        :type medio_de_almacenamiento: MedioDeAlmacenamiento
+        :type operacion: Operacion
+        :type sistema: Sistema
+        """
+
+        primeros_cola_r_a = operacion.recurso.cola.primeros(operacion.recurso.capacity)
+        primeros_cola_r_a_disponen_p_e_s_o_manip =\
+            all(camion.dispone_producto_espacio_sistema(sistema) or camion.manipulado.triggered
+                for camion in primeros_cola_r_a)
+
+        if operacion.recurso.nombre == "Balanza 2":
+            pass
+        elif operacion.nombre == "Primer pesaje - B3" and operacion.recurso.count < len(operacion.recurso.cola) \
+                and operacion.recurso.cola.primeros(operacion.recurso.count + 1)[-1] is not self:
+            operacion.recurso.cola.primeros(operacion.recurso.count + 1)[-1].adelanta_camion(
+                sistema, operacion, medio_de_almacenamiento, self, "Operacion")
+        elif (self.dispone_producto_espacio_sistema(sistema) or self.manipulado.triggered) \
+                and not primeros_cola_r_a_disponen_p_e_s_o_manip \
+                and operacion.recurso.count < len(primeros_cola_r_a):
+            primeros_cola_r_a[operacion.recurso.count].adelanta_camion(
+                sistema, operacion, medio_de_almacenamiento, self, "Operacion")
+
+    def adelanta_camion(self, entorno, operacion, medio_de_origen_o_destino, camion, tipo):
+        """
+        Permite que el camion adelante a otro que este por detras en la cola del medio de almacenamiento
+        y/o del recurso de atencion
+
+        :type tipo: str
+        :type medio_de_origen_o_destino: MedioDeAlmacenamiento
+        :type entorno: Sistema
+        :type operacion: Operacion
+        :type camion: Camion
+        """
+        # TODO mejorar implementacion
+
+        if tipo == "Operacion":
+
+            operacion.recurso.adelanta_en_cola(camion, self)
+
+            entorno.traza.registrar("adelanto", Traza.INFO, "%s adelantado bajo criterio de %s %s",
+                                    camion, self, entorno.now)
+            entorno.traza.registrar("cola", Traza.DEBUG, "\tEn sistema: %s Hora: %s",
+                                    operacion.recurso.cola, entorno.now)
+
+        elif tipo == "Almacen":
+
+            medio_de_origen_o_destino.adelanta_en_cola(camion, self)
+
+            entorno.traza.registrar("adelanto", Traza.INFO, "%s adelantado bajo criterio de %s %s",
+                                    camion, self, entorno.now)
+            entorno.traza.registrar("cola", Traza.DEBUG, "\t%s:%s Hora: %s",
+                                    medio_de_origen_o_destino.nombre, medio_de_origen_o_destino.cola, entorno.now)
+
+    def intenta_adelantar_camion_manipuleo(self, sistema, operacion, medio_de_almacenamiento):
+        """
+        Simula el intento de adelantar camiones por detras siempre que sea factible y conveniente
+
+        :type sistema: Sistema
+        :type operacion: Operacion
+        :type medio_de_almacenamiento: MedioDeAlmacenamiento
+        """
+
+        entre_primeros_cola_m_a = \
+            self.entre_primeros_cola_medio_de_almacenamiento(medio_de_almacenamiento)
+
+        entre_primeros_cola_r_a = \
+            self.entre_primeros_cola_recurso(operacion.recurso)
+
+        # El camion verifica si puede adelantar algun camion por detras en la cola del
+        # medio de almacenamiento que disponga producto/espacio y este por detras en la
+        # cola del recurso de atención
+        if entre_primeros_cola_m_a and entre_primeros_cola_r_a and \
+                any(c.dispone_producto_espacio_medio_almacenamiento(medio_de_almacenamiento) and
+                    c.atras_de_camion_en_cola_recurso(self, operacion.recurso)
+                    for c in medio_de_almacenamiento.cola_detras_de_camion(self)):
+            c_adelantado = [ca for ca in medio_de_almacenamiento.cola_detras_de_camion(self)
+                            if ca.dispone_producto_espacio_medios_almacenamiento(sistema) and
+                            ca.atras_de_camion_en_cola_recurso(self, operacion.recurso)][0]
+
+            self.adelanta_camion(sistema, operacion, medio_de_almacenamiento, c_adelantado, "Almacen")
+
+        # El camion verifica si puede adelantar algun camion por detras en la cola del
+        # medio de almacenamiento que disponga producto/espacio y este entre los primeros
+        # en alguna cola de recursos de atención
+        if entre_primeros_cola_m_a and \
+                any(c.dispone_producto_espacio_medio_almacenamiento(medio_de_almacenamiento) and
+                    c.entre_primeros_colas_recursos(sistema.recursos_atencion)
+                    for c in medio_de_almacenamiento.cola_detras_de_camion(self)):
+            c_adelantado = [ca for ca in medio_de_almacenamiento.cola_detras_de_camion(self)
+                            if ca.dispone_producto_espacio_medios_almacenamiento(sistema) and
+                            ca.entre_primeros_colas_recursos(sistema.recursos_atencion)][0]
+
+            self.adelanta_camion(sistema, operacion, medio_de_almacenamiento, c_adelantado, "Almacen")
+
+        # El camion verifica si puede adelantar algun camion por detras en la cola del
+        # recurso de atención que disponga producto/espacio y este entre los primeros
+        # en alguna cola de medios de almacenamiento
+        if entre_primeros_cola_r_a and \
+                any(c.dispone_producto_espacio_y_entre_primeros_medios_almacenamiento(sistema)  # TODO rev. posib. bugs
+                    for c in operacion.recurso.cola_detras_de_camion(self)):
+            c_adelantado = [ca for ca in operacion.recurso.cola_detras_de_camion(self)
+                            if ca.dispone_producto_espacio_medios_almacenamiento(sistema) and
+                            ca.entre_primeros_colas_medios_almacenamiento(sistema)][0]
+
+            self.adelanta_camion(sistema, operacion, medio_de_almacenamiento, c_adelantado, "Operacion")
+
+    def medios_almacenamiento_destino(self, sistema):
+        """
+        Genera los medios de almacenamiento que puede usar el camion a partir del indice del sistema.
+
+        :type sistema: Sistema
+        """
+        return sistema.medios_por_producto.get(self.carga, ())
+
+    def dispone_camion_esperando_camion(self, sistema):
+        """
+        Identifica si hay algún camion esperando por transbordo.
+
+        :type sistema: Sistema
+        """
+
+        if self.tipo == "Carga":
+            tipo_camion_en_espera = "Descarga"
+        else:
+            tipo_camion_en_espera = "Carga"
+
+        if len(sistema.colas_espera_transbordo[self.carga][tipo_camion_en_espera]) > 0:
+            return True
+        else:
+            return False
+
+    def dispone_producto_espacio_sistema(self, sistema):
+        """
+        Identifica si hay producto o espacio disponible en el sistema para atender al camion.
+
+        :type sistema: Sistema
+        """
+        # Los camiones por cargar se comparan por carga y los camiones por descargar por medios de destino
+        if self.tipo == "Carga":
+            clave = self.carga
+        else:
+            clave = self.medios_destino
+
+        camiones_comparables_a_cargar = sistema.camiones_pendientes.get((clave, "Carga"), 0)
+        camiones_comparables_a_descargar = sistema.camiones_pendientes.get((clave, "Descarga"), 0)
+
+        if not self.manipulado.triggered and self.en_sistema:
+            if self.tipo == "Carga":
+                camiones_comparables_a_cargar -= 1
+            else:
+                camiones_comparables_a_descargar -= 1
+
+        producto_espacio_disponible = 0
+
+        for almacen in self.medios_destino:
+
+            if self.tipo == "Carga":
+                producto_espacio_disponible += almacen.niveles[self.carga]
+            else:
+                producto_espacio_disponible += almacen.espacio
+
+        if self.tipo == "Carga":
+
+            if producto_espacio_disponible + 28 * (camiones_comparables_a_descargar - camiones_comparables_a_cargar) \
+                    >= 28:
+                return True
+            else:
+                return False
+        else:
+            if self.carga == "Fierro":
+                return True
+            elif producto_espacio_disponible + 28 * (camiones_comparables_a_cargar - camiones_comparables_a_descargar) \
+                    >= 28:
+                return True
+            else:
+                return False
+
+    def dispone_producto_espacio_medios_almacenamiento(self, sistema):
+        """
+        Permite identificar si se dispone producto o espacio en algun medio de almacenamiento para atender al camion.
+
+        :type sistema: Sistema
+        """
+        prod_o_esp_dip = False
+
+        if self.transbordo == "Si" or (self.tipo == "Descarga" and self.carga == "Fierro"):
+            prod_o_esp_dip = True
+        elif any(self.dispone_producto_espacio_medio_almacenamiento(ma)
+                 for ma in self.medios_destino):
+            prod_o_esp_dip = True
+
+        return prod_o_esp_dip
+
+    def dispone_producto_espacio_y_entre_primeros_medios_almacenamiento(self, sistema):  # TODO revisar posibles bugs
+        """
+        Permite identificar si se dispone producto o espacio en algún medio de almacenamiento para atender al camion,
+        y si el mismo esta entre los primeros camiones a ser atendidos.
+
+        :type sistema: Sistema
+        """
+        prod_o_esp_dip = False
+
+        if self.transbordo == "Si" or (self.tipo == "Descarga" and self.carga == "Fierro"):
+            prod_o_esp_dip = True
+        elif any(self.dispone_producto_espacio_medio_almacenamiento(ma) and
+                 self.entre_primeros_cola_medio_de_almacenamiento(ma)
+                 for ma in self.medios_destino):
+            prod_o_esp_dip = True
+
+        return prod_o_esp_dip
+
+    def dispone_producto_espacio_medio_almacenamiento(self, medio_de_almacenamiento):
+        """
+        Permite identificar si se dispone producto o espacio en el medio de almacenamiento para atender al camion.
+
+        :type medio_de_almacenamiento: MedioDeAlmacenamiento
+        """
+
+        # Mientras no cambien la cola ni los niveles del medio, se reutiliza el resultado anterior
+        prod_o_esp_dip = medio_de_almacenamiento.consulta_disponibilidad(self)
+        if prod_o_esp_dip is not None:
+            return prod_o_esp_dip
+
+        prod_o_esp_dip = False
+        umbral = self.umbral_medio_almacenamiento(medio_de_almacenamiento)
+
+        if self.tipo == "Carga" and medio_de_almacenamiento.niveles[self.carga] >= umbral:
+            prod_o_esp_dip = True
+        elif self.tipo == "Descarga" and medio_de_almacenamiento.espacio >= umbral:
+            prod_o_esp_dip = True
+
+        medio_de_almacenamiento.guarda_disponibilidad(self, prod_o_esp_dip)
+
+        return prod_o_esp_dip
+
+    def umbral_medio_almacenamiento(self, medio_de_almacenamiento):
+        """
+        Calcula el nivel de producto o espacio que debe tener el medio de almacenamiento para atender al camion,
+        considerando los camiones comparables que estan por delante en su cola.
+
+        :type medio_de_almacenamiento: MedioDeAlmacenamiento
+        """
+
+        if self in medio_de_almacenamiento.cola:
+            if self.tipo == "Carga":
+                camiones_comparables = \
+                    sum(1 for c in medio_de_almacenamiento.cola.delante_de(self)
+                        if c.carga == self.carga and c.tipo == self.tipo and c.transbordo == "No")
+            else:
+                camiones_comparables = \
+                    sum(1 for c in medio_de_almacenamiento.cola.delante_de(self)
+                        if c.tipo == self.tipo and c.transbordo == "No")
+        else:
+            if self.tipo == "Carga":
+                camiones_comparables = \
+                    sum(1 for c in medio_de_almacenamiento.cola
+                        if c.carga == self.carga and c.tipo == self.tipo and c.transbordo == "No")
+            else:
+                camiones_comparables = \
+                    sum(1 for c in medio_de_almacenamiento.cola
+                        if c.tipo == self.tipo and c.transbordo == "No")
+
+        return 28 * (1 + camiones_comparables)
+
+    def registra_umbrales_medios_almacenamiento(self, espera):
+        """
+        Registra la espera del camion en los medios de almacenamiento de destino, para que sea despertada cuando
+        alguno alcance el nivel de producto o espacio necesario para atender al camion.
+
+        :type espera: Espera
+        """
+        producto = self.carga if self.tipo == "Carga" else None
+
+        for ma in self.medios_destino:
+            ma.registra_umbral(producto, self.umbral_medio_almacenamiento(ma), espera)
+
+    def cancela_umbrales_medios_almacenamiento(self, espera):
+        """
+        Descarta la espera del camion de los umbrales de los medios de almacenamiento de destino.
+
+        :type espera: Espera
+        """
+        for ma in self.medios_destino:
+            ma.cancela_umbral(espera)
+
+    def entre_primeros_colas_medios_almacenamiento(self, sistema):
+        """
+        Identifica si el camion esta entre los primeros camiones en alguna cola de medios de
+        almacenamiento relevantes en el sistema
+
+        :type sistema: Sistema
+        """
+
+        entre_primeros = False
+
+        if self.transbordo == "Si":
+            entre_primeros = True
+        elif any(self.entre_primeros_cola_medio_de_almacenamiento(almacen)
+                 for almacen in self.medios_destino):
+            entre_primeros = True
+        return entre_primeros
+
+    def entre_primeros_colas_recursos(self, recursos):
+        """
+        Identifica si el camion esta entre los primeros camiones en alguna cola de recursos
+        de manipuleo en el sistema
+
+        :type recursos: dict
+        """
+
+        entre_primeros = False
+        recursos_manipuleo = [
+            recursos["Estacion Volcadora"],
+            recursos["Estacion Tolva/Balanza 3"],
+            recursos["Pala Mecanica"],
+            recursos["Cuadrilla de Estibaje"],
+            recursos["Cabina de Recepcion - T1"],
+            recursos["Cabina de Despacho - T1"],
+            recursos["Cabina de Recepcion - T2"],
+            recursos["Cabina de Despacho - T2"],
+            recursos["Grua"]]
+
+        if any(self.entre_primeros_cola_recurso(recurso)
+               for recurso in recursos_manipuleo):
+            entre_primeros = True
+        return entre_primeros
+
+    def entre_primeros_cola_medio_de_almacenamiento(self, medio_de_almacenamiento):
+        """
+        Identifica si el camion esta entre los primeros camiones de la cola del medio de almacenamiento
+
+        :type medio_de_almacenamiento: MedioDeAlmacenamiento
+        """
+
+        if medio_de_almacenamiento.cola.entre_primeros(self, medio_de_almacenamiento.espacios_de_atencion):
+            return True
+        else:
+            return False
+
+    def entre_primeros_cola_recurso(self, recurso):
+        """
+        Identifica si el camion esta entre los primeros camiones de la cola del recurso de atencion
+
+        :type recurso: Recurso
+        """
+
+        if recurso.cola.entre_primeros(self, recurso.capacity):
+            return True
+        else:
+            return False
+
+    def atras_de_camion_en_cola_medio_almacenamiento(self, camion_ref, medio_de_almacenamiento):
+        """
+        Identifica si el camion esta detras de otro en la cola del medio de almacenamiento
+
+        :type camion_ref: Camion
+        :type medio_de_almacenamiento: MedioDeAlmacenamiento
+        """
+
+        if medio_de_almacenamiento.cola.esta_detras(self, camion_ref):
+            return True
+        else:
+            return False
+
+    def atras_de_camion_en_cola_recurso(self, camion_ref, recurso):
+        """
+        Identifica si el camion esta detras de otro en la cola del recurso de atención
+
+        :type camion_ref: Camion
+        :type recurso: Recurso
+        """
+
+        if recurso.cola.esta_detras(self, camion_ref):
+            return True
+        else:
+            return False
+
+
+class Operacion(object):
+    """Clase para el modelado de las operaciones presentes en el sistema."""
+
+    def __init__(self, nombre, recurso, ts_distrib, parametros):
+        """
+        Define las características principales de la clase operación.
+
+        :type nombre: str
+        :type recurso: Recurso
+        :type ts_distrib: str
+        :type parametros: tuple
+        """
+        self.nombre = nombre
+        self.recurso = recurso
+        self.ts_distrib = ts_distrib
+        self.parametros = parametros
+
+        # Flujo de números aleatorios de los tiempos de servicio, asignado por el sistema
+        self.aleatorio = random
+
+    def tiempo_de_servicio(self):  # TODO Incluir distribuciones de probabilidad
+        """
+        Genera el tiempo de servicio de la operación
+        """
+
+        if self.ts_distrib == "uniforme":
+            ts = self.aleatorio.uniform(*self.parametros)
+        elif self.ts_distrib == "triangular":
+            ts = self.aleatorio.triangular(*self.parametros)
+        else:
+            self.recurso.sistema.traza.registrar("error", Traza.ERROR, "Error, distribución no reconocida: %s",
+                                                 self.ts_distrib)
+            ts = None
+        return int(round(ts, 0))
+
+    def ejecutar(self, sistema, camion, tpaciencia_t=float("Inf"), medio_de_almacenamiento=None):
+        """
+        Simula la ejecución de la operación registrando y mostrando datos de la atención.
+
+        :type sistema: Sistema
+        :type camion: Camion.
+        :type tpaciencia_t: int
+        :type medio_de_almacenamiento: MedioDeAlmacenamiento
+        """
+
+        arribo = sistema.now
+
+        self.recurso.ingresa_a_cola(camion)
+
+        if not camion.entre_primeros_cola_recurso(self.recurso):
+            camion.solicita_adelanto_operacion(sistema, self)
+
+        yield sistema.process(camion.espera_operacion(sistema, self))
+
+        with self.recurso.request() as turno:
+
+            yield turno
+
+            # Al ingresar a las primeras operaciones, el camion ingresa al sistema
+            if self.nombre in ["Atencion recepcion 1", "Atencion despacho 1"]:
+                sistema.ingresar_camion(camion)
+
+            inicio = sistema.now
+            espera_r = inicio - arribo
+            sistema.traza.registrar("operacion", Traza.INFO, "%s Inicio %s - Hora: %s", camion, self.nombre, inicio)
+            ts = self.tiempo_de_servicio()
+            self.recurso.tiempo_ocupado += ts
+
+            yield sistema.timeout(ts)
+            self.recurso.sale_de_cola(camion)
+
+            salida = sistema.now
+
+            sistema.traza.registrar("operacion", Traza.INFO, "%s SALE DE SISTEMA - HORA: %s", camion, sistema.now)
+
+            # Al salir de las últimas operaciones, el camion sale del sistema
+            if self.nombre in ["Atencion recepcion 2", "Atencion despacho 2"]:
+                sistema.retirar_camion(camion)
+
+            dia = round(sistema.now / (24 * 60) + 0.5)
+
+            fila_de_datos = [camion.nombre, camion.carga, camion.tipo, camion.peso, self.nombre, self.recurso.nombre,
+                             dia, arribo, "-", espera_r, "-", espera_r, inicio, salida, "-", "-"]
+
+            camion.espera += espera_r
+            sistema.registrar(fila_de_datos)
+
+
+class OperacionManipuleo(Operacion):
+    """
+    Clase para el modelado de las operaciones de manipuleo presentes en el sistema.
+    Subclase de Operacion
+    """
+
+    def __init__(self, nombre, recurso, ts_distrib, parametros):
+        """
+        Define las características principales de la clase operación manipuleo.
+
+        :type nombre: str
+        :type recurso: Recurso
+        :type ts_distrib: str
+        :type parametros: tuple
+        """
+        super(OperacionManipuleo, self).__init__(nombre, recurso, ts_distrib, parametros)
+
+    def ejecutar(self, sistema, camion, tpaciencia_t=float("Inf"), medio_de_almacenamiento=None):
+        """
+        Modela la ejecución de la operación de manipuleo.
+
+        :type sistema: Sistema
+        :type camion:  Camion
+        :type tpaciencia_t: int
+        :type medio_de_almacenamiento: MedioDeAlmacenamiento
+        """
+
+        if medio_de_almacenamiento is not None:
+
+            arribo = sistema.now
+            sistema.traza.registrar("operacion", Traza.INFO, "%s arribo a - %s - Hora: %s", camion, self.nombre, arribo)
+
+            self.recurso.ingresa_a_cola(camion)
+            medio_de_almacenamiento.ingresa_a_cola(camion)
+
+            if not camion.entre_primeros_cola_recurso(self.recurso) \
+                    or not camion.entre_primeros_cola_medio_de_almacenamiento(medio_de_almacenamiento):
+                camion.solicita_adelanto(sistema, self, medio_de_almacenamiento)
+
+            espera_manipuleo = yield sistema.process(
+                camion.espera_operacion_manipuleo(sistema, self, medio_de_almacenamiento, tpaciencia_t))
+
+            if espera_manipuleo[0] == "Inicia":
+
+                espera_r = espera_manipuleo[1]
+                espera_p = espera_manipuleo[2]
+                espera_m_od = espera_manipuleo[3]
+                espera_t = espera_manipuleo[4]
+
+                with self.recurso.request() as turno:
+
+                    yield turno
+
+                    if turno.triggered:
+                        inicio = sistema.now
+                        sistema.traza.registrar("operacion", Traza.INFO, "%s Inicio %s - Hora: %s",
+                                                camion, self.nombre, inicio)
+                        ts = self.tiempo_de_servicio()
+                        sistema.traza.registrar("operacion", Traza.DEBUG, "%s ts=%s", camion, ts)
+                        self.recurso.tiempo_ocupado += ts
+
+                        # Inicia uso de estacion disp. en medio de origen/destino
+                        medio_de_almacenamiento.espacios_en_uso += 1
+
+                        atencion = sistema.timeout(ts)
+                        yield atencion
+
+                        if camion.tipo == "Carga":
+                            medio_de_almacenamiento.cargar_producto(camion, camion.carga)
+                        else:
+                            medio_de_almacenamiento.descargar_producto(camion, camion.carga)
+
+                        # Concluye uso de estacion disp. en medio de origen/destino
+                        medio_de_almacenamiento.espacios_en_uso -= 1
+
+                        self.recurso.sale_de_cola(camion)
+                        medio_de_almacenamiento.sale_de_cola(camion)
+
+                        sistema.traza.registrar("operacion", Traza.INFO, "%s SALE DE SISTEMA - HORA: %s",
+                                                camion, sistema.now)
+
+                        sistema.traza.registrar("cola", Traza.DEBUG, "\tEn sistema: %s", self.recurso.cola)
+                        sistema.traza.registrar("cola", Traza.DEBUG, "\t%s:%s",
+                                                medio_de_almacenamiento.nombre, medio_de_almacenamiento.cola)
+
+                        camion.peso = camion.trailer.nivel
+
+                        salida = sistema.now
+                        sistema.registrar_manipuleo(camion)
+
+                        dia = round(sistema.now / (24 * 60) + 0.5)
+
+                        fila_de_datos = [camion.nombre, camion.carga, camion.tipo, camion.peso, self.nombre,
+                                         self.recurso.nombre, dia, arribo, espera_m_od, espera_r, espera_p, espera_t,
+                                         inicio, salida, medio_de_almacenamiento.nombre,
+                                         medio_de_almacenamiento.niveles[camion.carga]]
+
+                        camion.espera += espera_t
+                        sistema.registrar(fila_de_datos)
+
+                        sistema.exit("Ejecutada")
+
+                    else:
+
+                        sistema.traza.registrar("error", Traza.ERROR, " ------------- 2 ---------- NO BORRAR SI SE LEE")
+
+                        medio_de_almacenamiento.sale_de_cola(camion)
+                        self.recurso.sale_de_cola(camion)
+                        sistema.traza.registrar("operacion", Traza.INFO, "%s NO EJECUTADA POR RECURSO", camion)
+                        sistema.exit("No ejecutada por recurso")
+
+            else:
+                # Si no se ejecuta Transbordo en sistema mecanizado (C) no sale de la cola del recurso
+                # porque realizara un primer pesaje en B3
+                # if self.nombre != "Transbordo en sistema mecanizado (C)":
+                #     self.recurso.cola.remove(camion)
+                self.recurso.sale_de_cola(camion)
+                medio_de_almacenamiento.sale_de_cola(camion)
+                sistema.traza.registrar("operacion", Traza.INFO, "%s SALE DE SISTEMA SIN EJECUCIÓN - HORA: %s",
+                                        camion, sistema.now)
+                sistema.traza.registrar("operacion", Traza.INFO, "%s NO EJECUTADA POR PRODUCTO", camion)
+                sistema.traza.registrar("operacion", Traza.DEBUG, "\t%s %s",
+                                        medio_de_almacenamiento.nombre, medio_de_almacenamiento.niveles[camion.carga])
+                sistema.exit("No ejecutada por producto")
+
+        else:
+            sistema.traza.registrar("error", Traza.ERROR,
+                                    "Camion %s - Error, no se definió el medio de origen o destino", camion.nombre)
+
+
+class Recurso(simpy.Resource):
+    """
+    Clase para el modelado de recursos para la ejecucion de operaciones
+    Subclase de simpy.Resource
+    Los recursos pueden ser:
+    - Mano de obra
+    - Maquinaria
+    """
+
+    def __init__(self, sistema, nombre, calendario, capacity=1):
+        """
+        Define las características principales de la clase recurso.
+
+        :type sistema: Sistema
+        :type nombre: str
+        :type calendario: Calendario
+        :type capacity: int
+        """
+        super(Recurso, self).__init__(sistema, capacity)
+        self.sistema = sistema
+        self.nombre = nombre
+        self.cola = ColaCamiones()
+        self.calendario = calendario
+        self.cambio_cola = Senal(sistema)
+
+        # Tiempo total de atención de los camiones, sumado sobre todos los puestos del recurso
+        self.tiempo_ocupado = 0
+
+    def ingresa_a_cola(self, camion):
+        """
+        Ingresa un camión al final de la cola y notifica el cambio.
+
+        :type camion: Camion
+        """
+        self.cola.append(camion)
+        self.cambio_cola.emitir()
+
+    def sale_de_cola(self, camion):
+        """
+        Retira un camión de la cola y notifica el cambio.
+
+        :type camion: Camion
+        """
+        self.cola.remove(camion)
+        self.cambio_cola.emitir()
+
+    def adelanta_en_cola(self, camion, camion_ref):
+        """
+        Ubica un camión inmediatamente delante de otro en la cola y notifica el cambio.
+
+        :type camion: Camion
+        :type camion_ref: Camion
+        """
+        self.cola.inserta_antes(camion, camion_ref)
+        self.cambio_cola.emitir()
+
+    def cola_detras_de_camion(self, camion):
+        """
+        Genera la cola detrás de un camión siempre que esté en la cola.
+
+        :type camion: Camion
+        """
+
+        if camion in self.cola:
+            return self.cola.detras_de(camion)
+        else:
+            self.sistema.traza.registrar("error", Traza.ERROR, "ERROR: %s no esta en la cola de %s",
+                                         camion, self.nombre)
+
+
+class MedioDeAlmacenamiento(simpy.Container):
+    """
+    Clase para el modelado de medios de almacenamiento.
+    Subclase de simpy.Container.
+    """
+
+    def __init__(self, sistema, nombre, espacios_de_atencion, niveles=None, capacity=float('inf'), init=0):
+        """
+        Define las caracteristicas del medio de almacenamiento
+
+        :type sistema: Sistema
+        :type nombre: str
+        :type espacios_de_atencion: int
+        :type niveles: dict
+        :type capacity: float
+        :type init: int
+        """
+
+        super(MedioDeAlmacenamiento, self).__init__(sistema, capacity, init)
+        self.sistema = sistema
+        self.nombre = nombre
+        self.espacios_de_atencion = espacios_de_atencion
+        self.espacios_en_uso = 0
+        self.cola = ColaCamiones()
+        self.cambio_cola = Senal(sistema)
+        self.cambio_niveles = Senal(sistema)
+
+        # Esperas de camiones hasta que el nivel de un producto (o el espacio, con la clave None) alcance un umbral
+        self.umbrales = {}
+
+        # Disponibilidad de producto o espacio ya calculada por camion, valida para la version de cola y niveles
+        self.version_niveles = 0
+        self.version_disponibilidad = None
+        self.disponibilidad = {}
+        self.aciertos_disponibilidad = 0
+        self.fallos_disponibilidad = 0
+
+        if niveles is not None:
+            self.niveles = niveles
+            if sum(self.niveles.values()) > 0:
+                self.get(sum(self.niveles.values()))
+            self.espacio = self.capacity - self.level
+
+    def cargar_producto(self, camion, producto):
+        """
+        Simula la carga de producto del almacen a un camión
+
+        :param camion:
+        :param producto:
+        """
+        if self.niveles[producto] >= 28:
+            self.get(28)
+            camion.trailer.cargar(28)
+            self.niveles[producto] -= 28
+            self.espacio += 28
+            self.version_niveles += 1
+            self.cambio_niveles.emitir()
+            self.sistema.existencias_modificadas.emitir()
+            self.verifica_umbrales(producto)
+        else:
+            self.sistema.traza.registrar("error", Traza.ERROR, "****ERROR EN CARGA, PRODUCTO NO DISPONIBLE**** %s",
+                                         camion)
+
+    def descargar_producto(self, camion, producto):
+        """
+        Simula la descarga de producto de un camion al almacén
+
+        :param camion:
+        :param producto:
+        """
+        if (self.capacity - self.level) >= 28:
+            self.put(camion.peso)
+            camion.trailer.descargar(camion.peso)
+            self.niveles[producto] += 28
+            self.espacio -= 28
+            self.version_niveles += 1
+            self.cambio_niveles.emitir()
+            self.sistema.existencias_modificadas.emitir()
+            self.verifica_umbrales(producto)
+        else:
+            self.sistema.traza.registrar("error", Traza.ERROR, "****ERROR DESCARGA, ESPACIO NO DISPONIBLE**** %s",
+                                         camion)
+
+    def cantidad_disponible(self, producto=None):
+        """
+        Indica el nivel disponible del producto o, si no se indica producto, el espacio disponible.
+
+        :type producto: str
+        """
+        if producto is None:
+            return self.espacio
+        else:
+            return self.niveles[producto]
+
+    def registra_umbral(self, producto, umbral, espera):
+        """
+        Registra una espera que es despertada cuando el nivel del producto alcanza el umbral.
+        Si no se indica producto, la espera es despertada cuando el espacio disponible alcanza el umbral.
+
+        :type producto: str
+        :type umbral: int
+        :type espera: Espera
+        """
+        if self.cantidad_disponible(producto) >= umbral:
+            self.sistema.reloj_esperas.despertar([espera])
+        else:
+            self.umbrales.setdefault(producto, []).append((umbral, espera))
+
+    def cancela_umbral(self, espera):
+        """
+        Descarta los umbrales de una espera que ya no duerme.
+
+        :type espera: Espera
+        """
+        for clave, pendientes in self.umbrales.items():
+            if any(e is espera for _, e in pendientes):
+                self.umbrales[clave] = [(u, e) for u, e in pendientes if e is not espera]
+
+    def verifica_umbrales(self, producto):
+        """
+        Despierta las esperas cuyo umbral del producto o del espacio disponible haya sido alcanzado.
+
+        :type producto: str
+        """
+        for clave in [producto, None]:
+            if self.umbrales.get(clave):
+                disponible = self.cantidad_disponible(clave)
+                alcanzados = [e for u, e in self.umbrales[clave] if disponible >= u]
+                self.umbrales[clave] = [(u, e) for u, e in self.umbrales[clave] if disponible < u]
+                self.sistema.reloj_esperas.despertar(alcanzados)
+
+    def consulta_disponibilidad(self, camion):
+        """
+        Recupera la disponibilidad de producto o espacio calculada para el camión, siempre que la cola y los
+        niveles del medio no hayan cambiado desde entonces. En caso contrario retorna None.
+
+        :type camion: Camion
+        """
+        version = (self.cola.version, self.version_niveles)
+
+        if version != self.version_disponibilidad:
+            self.version_disponibilidad = version
+            self.disponibilidad.clear()
+
+        if camion in self.disponibilidad:
+            self.aciertos_disponibilidad += 1
+            return self.disponibilidad[camion]
+
+        self.fallos_disponibilidad += 1
+        return None
+
+    def guarda_disponibilidad(self, camion, disponible):
+        """
+        Guarda la disponibilidad de producto o espacio calculada para el camión en la version actual del medio.
+
+        :type camion: Camion
+        :type disponible: bool
+        """
+        self.disponibilidad[camion] = disponible
+
+    def ingresa_a_cola(self, camion):
+        """
+        Ingresa un camión al final de la cola y notifica el cambio.
+
+        :type camion: Camion
+        """
+        self.cola.append(camion)
+        self.cambio_cola.emitir()
+
+    def sale_de_cola(self, camion):
+        """
+        Retira un camión de la cola y notifica el cambio.
+
+        :type camion: Camion
+        """
+        self.cola.remove(camion)
+        self.cambio_cola.emitir()
+
+    def adelanta_en_cola(self, camion, camion_ref):
+        """
+        Ubica un camión inmediatamente delante de otro en la cola y notifica el cambio.
+
+        :type camion: Camion
+        :type camion_ref: Camion
+        """
+        self.cola.inserta_antes(camion, camion_ref)
+        self.cambio_cola.emitir()
+
+    def cola_detras_de_camion(self, camion):
+        """
+        Genera la cola detrás de un camión siempre que esté en la cola.
+
+        :type camion: Camion
+        """
+
+        if camion in self.cola:
+            return self.cola.detras_de(camion)
+        else:
+            self.sistema.traza.registrar("error", Traza.ERROR, "ERROR: %s no esta en la cola de %s",
+                                         camion, self.nombre)
+
+
+class Trailer(object):
+    """
+    Clase para el modelado del trailer de un camion, del que solo interesa la carga que transporta
+    """
+
+    __slots__ = ("capacidad", "nivel")
+
+    def __init__(self, capacidad, nivel=0):
+        """
+        Define la capacidad y el nivel inicial del trailer
+
+        :type capacidad: float
+        :type nivel: float
+        """
+        self.capacidad = capacidad
+        self.nivel = nivel
+
+    def cargar(self, cantidad):
+        """
+        Agrega carga al trailer. Si no hay espacio suficiente el nivel no cambia.
+
+        :type cantidad: float
+        """
+        if self.capacidad - self.nivel >= cantidad:
+            self.nivel += cantidad
+
+    def descargar(self, cantidad):
+        """
+        Retira carga del trailer. Si la carga es insuficiente el nivel no cambia.
+
+        :type cantidad: float
+        """
+        if self.nivel >= cantidad:
+            self.nivel -= cantidad
+
+
+class Calendario(object):
+    """
+    Clase para el calendario de atención de un recurso, compilado a partir de su horario.
+    El calendario cubre un ciclo de 30 dias, en el que se repiten los sabados (cada 6 dias) y la regla de atención
+    al dia siguiente de los dias multiplos de 5. El ciclo se divide en tramos ordenados; en cada tramo el recurso
+    atiende o los camiones esperan hasta un mismo instante, de forma que la espera se obtiene por busqueda binaria.
+    """
+
+    DIAS_CICLO = 30
+
+    # Calendarios ya compilados, por horario
+    compilados = {}
+
+    def __init__(self, horario):
+        """
+        Compila el horario en tramos.
+
+        :type horario: dict
+        """
+        self.inicios = []
+        self.tramos = []
+
+        for dia in range(1, self.DIAS_CICLO + 1):
+            inicio_dia = 24 * 60 * (dia - 1)
+
+            limites = set([0.0])
+            for horas in horario.values():
+                for hora in horas.values():
+                    if 0 <= hora * 60 < 24 * 60:
+                        limites.add(hora * 60)
+
+            for limite in sorted(limites):
+                objetivo, tarde = self.regla(horario, dia, limite)
+                self.inicios.append(inicio_dia + limite)
+                self.tramos.append((inicio_dia, objetivo, tarde))
+
+    @classmethod
+    def compilar(cls, horario):
+        """
+        Obtiene el calendario compilado del horario, compilándolo solo la primera vez.
+
+        :type horario: dict
+        """
+        clave = tuple(sorted((dias, tuple(sorted(horas.items()))) for dias, horas in horario.items()))
+
+        if clave not in cls.compilados:
+            cls.compilados[clave] = cls(horario)
+
+        return cls.compilados[clave]
+
+    @staticmethod
+    def regla(horario, dia, t_dia):
+        """
+        Aplica el horario de atención a un instante del dia. Devuelve el instante del dia hasta el que se espera,
+        o None si el recurso atiende, y si el camion llego despues de la salida.
+
+        :type horario: dict
+        :type dia: int
+        :type t_dia: float
+        """
+        if dia % 6 != 0:
+            if t_dia < horario["L-V"]["Ingreso"] * 60:
+                return horario["L-V"]["Ingreso"] * 60, False
+            elif horario["L-V"]["I. Descanso"] * 60 <= t_dia < horario["L-V"]["F. Descanso"] * 60:
+                return horario["L-V"]["F. Descanso"] * 60, False
+            elif t_dia >= horario["L-V"]["Salida"] * 60:
+                if dia % 5 != 0:
+                    return (horario["L-V"]["Ingreso"] + 24) * 60, True
+                else:
+                    return (horario["SAB"]["Ingreso"] + 24) * 60, True
+        else:
+            if t_dia < horario["SAB"]["Ingreso"] * 60:
+                return horario["SAB"]["Ingreso"] * 60, False
+            elif t_dia >= horario["SAB"]["Salida"] * 60:
+                return (horario["L-V"]["Ingreso"] + 24) * 60, True
+
+        return None, False
+
+    def tramo(self, tiempo):
+        """
+        Identifica el tramo del ciclo que contiene al instante indicado.
+
+        :type tiempo: float
+        """
+        t_ciclo = tiempo % (self.DIAS_CICLO * 24 * 60)
+        return t_ciclo, self.tramos[bisect.bisect_right(self.inicios, t_ciclo) - 1]
+
+    def espera(self, tiempo):
+        """
+        Calcula la espera hasta la atención del recurso en el instante indicado, o None si el recurso atiende,
+        y si el camion llego despues de la salida.
+
+        :type tiempo: float
+        """
+        t_ciclo, (inicio_dia, objetivo, tarde) = self.tramo(tiempo)
+
+        if objetivo is None:
+            return None, tarde
+
+        return int(objetivo - (t_ciclo - inicio_dia)), tarde
+
+    def minutos_de_atencion(self, inicio, fin):
+        """
+        Calcula los minutos de atención del recurso entre dos instantes.
+
+        :type inicio: float
+        :type fin: float
+        """
+        duracion_ciclo = self.DIAS_CICLO * 24 * 60
+        minutos = 0
+
+        ciclos, resto = divmod(fin - inicio, duracion_ciclo)
+        if ciclos:
+            minutos += ciclos * self.minutos_de_atencion_en_ciclo(0, duracion_ciclo)
+
+        t_inicio = inicio % duracion_ciclo
+        t_fin = t_inicio + resto
+        if t_fin <= duracion_ciclo:
+            minutos += self.minutos_de_atencion_en_ciclo(t_inicio, t_fin)
+        else:
+            minutos += self.minutos_de_atencion_en_ciclo(t_inicio, duracion_ciclo)
+            minutos += self.minutos_de_atencion_en_ciclo(0, t_fin - duracion_ciclo)
+
+        return minutos
+
+    def minutos_de_atencion_en_ciclo(self, inicio, fin):
+        """
+        Calcula los minutos de atención del recurso entre dos instantes de un mismo ciclo.
+
+        :type inicio: float
+        :type fin: float
+        """
+        minutos = 0
+        finales = self.inicios[1:] + [self.DIAS_CICLO * 24 * 60]
+
+        for inicio_tramo, fin_tramo, (inicio_dia, objetivo, tarde) in zip(self.inicios, finales, self.tramos):
+            if objetivo is None:
+                minutos += max(0, min(fin, fin_tramo) - max(inicio, inicio_tramo))
+
+        return minutos
+
+
+class ColaCamiones(object):
+    """
+    Clase para el modelado de colas ordenadas de camiones.
+    Implementada como una lista doblemente enlazada, permite retirar y adelantar camiones sin reconstruir la cola.
+    Cada camión tiene además una etiqueta de orden entera, separada de las vecinas, con la que se compara su
+    posición con la de otro camión sin recorrer la cola. Al adelantar un camión se le asigna una etiqueta entre
+    las de sus nuevos vecinos, y solo cuando no queda espacio entre ellas se vuelven a numerar todas.
+    Las consultas sobre posiciones recorren solo los camiones que devuelven o que están por delante.
+    """
+
+    # Separación entre las etiquetas de orden de camiones consecutivos al numerarlas
+    SEPARACION = 1 << 16
+
+    def __init__(self):
+        """
+        Define las características principales de la clase cola de camiones.
+        """
+        self.anterior = {}
+        self.siguiente = {}
+        self.etiquetas = {}
+        self.primero = None
+        self.ultimo = None
+
+        # Numero de cambios realizados en la cola
+        self.version = 0
+
+    def __len__(self):
+        return len(self.siguiente)
+
+    def __contains__(self, camion):
+        return camion in self.siguiente
+
+    def __iter__(self):
+        return iter(self.lista())
+
+    def __getitem__(self, indice):
+        if indice < 0:
+            indice += len(self)
+        if not 0 <= indice < len(self):
+            raise IndexError("indice fuera de la cola")
+
+        # Se recorre la cola desde el extremo más cercano al indice
+        if indice < len(self) - indice:
+            camion = self.primero
+            for _ in range(indice):
+                camion = self.siguiente[camion]
+        else:
+            camion = self.ultimo
+            for _ in range(len(self) - 1 - indice):
+                camion = self.anterior[camion]
+        return camion
+
+    def __repr__(self):
+        return repr(self.lista())
+
+    def lista(self):
+        """
+        Genera la lista ordenada de camiones en la cola.
+        """
+        orden = []
+        camion = self.primero
+        while camion is not None:
+            orden.append(camion)
+            camion = self.siguiente[camion]
+        return orden
+
+    def verifica_camion(self, camion):
+        """
+        Verifica que un camión esté en la cola.
+
+        :type camion: Camion
+        """
+        if camion not in self.siguiente:
+            raise ValueError(str(camion) + " no esta en la cola")
+
+    def index(self, camion):
+        """
+        Identifica la posición de un camión en la cola, recorriendo solo los camiones por delante.
+
+        :type camion: Camion
+        """
+        self.verifica_camion(camion)
+
+        indice = 0
+        actual = self.anterior[camion]
+        while actual is not None:
+            indice += 1
+            actual = self.anterior[actual]
+        return indice
+
+    def numera(self):
+        """
+        Vuelve a numerar las etiquetas de orden de todos los camiones, separándolas por igual.
+        """
+        etiqueta = 0
+        camion = self.primero
+        while camion is not None:
+            self.etiquetas[camion] = etiqueta
+            etiqueta += self.SEPARACION
+            camion = self.siguiente[camion]
+
+    def append(self, camion):
+        """
+        Ingresa un camión al final de la cola.
+
+        :type camion: Camion
+        """
+        self.anterior[camion] = self.ultimo
+        self.siguiente[camion] = None
+
+        if self.ultimo is None:
+            self.primero = camion
+            self.etiquetas[camion] = 0
+        else:
+            self.siguiente[self.ultimo] = camion
+            self.etiquetas[camion] = self.etiquetas[self.ultimo] + self.SEPARACION
+        self.ultimo = camion
+
+        self.version += 1
+
+    def remove(self, camion):
+        """
+        Retira un camión de la cola.
+
+        :type camion: Camion
+        """
+        self.verifica_camion(camion)
+
+        anterior = self.anterior.pop(camion)
+        siguiente = self.siguiente.pop(camion)
+        del self.etiquetas[camion]
+
+        if anterior is None:
+            self.primero = siguiente
+        else:
+            self.siguiente[anterior] = siguiente
+
+        if siguiente is None:
+            self.ultimo = anterior
+        else:
+            self.anterior[siguiente] = anterior
+
+        self.version += 1
+
+    def inserta_antes(self, camion, camion_ref):
+        """
+        Ubica un camión inmediatamente delante de otro, retirándolo de su posición actual si está en la cola.
+
+        :type camion: Camion
+        :type camion_ref: Camion
+        """
+        if camion in self.siguiente:
+            self.remove(camion)
+
+        self.verifica_camion(camion_ref)
+
+        anterior = self.anterior[camion_ref]
+        self.anterior[camion] = anterior
+        self.siguiente[camion] = camion_ref
+        self.anterior[camion_ref] = camion
+
+        if anterior is None:
+            self.primero = camion
+            self.etiquetas[camion] = self.etiquetas[camion_ref] - self.SEPARACION
+        else:
+            self.siguiente[anterior] = camion
+            etiqueta = (self.etiquetas[anterior] + self.etiquetas[camion_ref]) // 2
+
+            if etiqueta == self.etiquetas[anterior]:
+                self.numera()
+            else:
+                self.etiquetas[camion] = etiqueta
+
+        self.version += 1
+
+    def primeros(self, cantidad):
+        """
+        Genera la lista de los primeros camiones de la cola, recorriendo solo esos camiones.
+
+        :type cantidad: int
+        """
+        primeros = []
+        camion = self.primero
+        while camion is not None and len(primeros) < cantidad:
+            primeros.append(camion)
+            camion = self.siguiente[camion]
+        return primeros
+
+    def entre_primeros(self, camion, cantidad):
+        """
+        Identifica si un camión está entre los primeros camiones de la cola, recorriendo solo esos camiones.
+
+        :type camion: Camion
+        :type cantidad: int
+        """
+        if camion not in self.siguiente:
+            return False
+
+        actual = self.primero
+        for _ in range(cantidad):
+            if actual is camion:
+                return True
+            actual = self.siguiente[actual]
+        return False
+
+    def delante_de(self, camion):
+        """
+        Genera la lista de camiones delante de un camión en la cola, recorriendo solo esos camiones.
+
+        :type camion: Camion
+        """
+        self.verifica_camion(camion)
+
+        delante = []
+        actual = self.primero
+        while actual is not camion:
+            delante.append(actual)
+            actual = self.siguiente[actual]
+        return delante
+
+    def detras_de(self, camion):
+        """
+        Genera la lista de camiones detrás de un camión en la cola, recorriendo solo esos camiones.
+
+        :type camion: Camion
+        """
+        self.verifica_camion(camion)
+
+        detras = []
+        actual = self.siguiente[camion]
+        while actual is not None:
+            detras.append(actual)
+            actual = self.siguiente[actual]
+        return detras
+
+    def esta_detras(self, camion, camion_ref):
+        """
+        Identifica si un camión está detrás de otro en la cola, comparando sus etiquetas de orden.
+
+        :type camion: Camion
+        :type camion_ref: Camion
+        """
+        self.verifica_camion(camion_ref)
+        return camion in self.etiquetas and self.etiquetas[camion] > self.etiquetas[camion_ref]
+
+
+class Registro(object):
+    """
+    Clase base para los registros a los que el sistema envia las filas de datos a medida que son generadas.
+    """
+
+    def registrar(self, fila_de_datos):
+        """
+        Registra una fila de datos.
+
+        :type fila_de_datos: list
+        """
+        raise NotImplementedError
+
+    def registrar_camion(self, fila_camion):
+        """
+        Registra el resumen de un camion que concluyo su atencion. Por defecto el resumen se ignora.
+
+        :type fila_camion: list
+        """
+        pass
+
+    def cerrar(self):
+        """
+        Concluye la escritura del registro.
+        """
+        pass
+
+
+class RegistroCSV(Registro):
+    """
+    Clase para el registro de filas de datos en un archivo .csv a medida que son generadas.
+    Las filas se escriben en un buffer que se descarga al archivo cada cierta cantidad de filas.
+    """
+
+    columnas = COLUMNAS_DATOS
+
+    def __init__(self, archivo, filas_por_descarga=1000, tamano_buffer=64 * 1024):
+        """
+        Define las características principales del registro en archivo .csv
+
+        :type archivo: str
+        :type filas_por_descarga: int
+        :type tamano_buffer: int
+        """
+        self.archivo = archivo
+        self.filas_por_descarga = filas_por_descarga
+        self.filas_pendientes = 0
+        self.filas_registradas = 0
+
+        self.csv_file = open(archivo, "wb", tamano_buffer)
+        self.writer = csv.writer(self.csv_file, delimiter=';')
+        self.writer.writerow(self.columnas)
+
+    def registrar(self, fila_de_datos):
+        """
+        Escribe una fila de datos y descarga el buffer al archivo periodicamente.
+
+        :type fila_de_datos: list
+        """
+        self.escribir(fila_de_datos)
+
+    def escribir(self, fila):
+        """
+        Escribe una fila en el archivo y descarga el buffer periodicamente.
+
+        :type fila: list
+        """
+        self.writer.writerow(fila)
+        self.filas_registradas += 1
+        self.filas_pendientes += 1
+
+        if self.filas_pendientes >= self.filas_por_descarga:
+            self.csv_file.flush()
+            self.filas_pendientes = 0
+
+    def cerrar(self):
+        """
+        Descarga las filas pendientes y cierra el archivo.
+        """
+        if not self.csv_file.closed:
+            self.csv_file.close()
+
+
+class RegistroCamionesCSV(RegistroCSV):
+    """
+    Clase para el registro en un archivo .csv del resumen de cada camion que concluye su atencion.
+    Las filas de datos de las operaciones se ignoran.
+    """
+
+    columnas = COLUMNAS_CAMIONES
+
+    def registrar(self, fila_de_datos):
+        """
+        Ignora la fila de datos de una operacion.
+
+        :type fila_de_datos: list
+        """
+        pass
+
+    def registrar_camion(self, fila_camion):
+        """
+        Escribe el resumen de un camion.
+
+        :type fila_camion: list
+        """
+        self.escribir(fila_camion)
+
+
+class RegistroColumnar(Registro):
+    """
+    Clase para el registro de filas de datos como columnas tipadas en un archivo .npz de NumPy.
+    Cada replica se agrega al archivo con sus propias columnas, con el prefijo "<replica>/", sin reescribir
+    las replicas anteriores.
+    """
+
+    def __init__(self, archivo, replica):
+        """
+        Define las características principales del registro columnar.
+
+        :type archivo: str
+        :type replica: str
+        """
+        if numpy is None:
+            raise ImportError("RegistroColumnar requiere NumPy")
+
+        self.archivo = archivo
+        self.replica = str(replica)
+        self.filas_registradas = 0
+
+        self.columnas = []
+        self.categorias = {}
+
+        for columna in COLUMNAS_DATOS:
+            tipo = TIPOS_COLUMNAS_DATOS[columna]
+            if tipo == "categoria":
+                self.columnas.append(array.array("i"))
+                self.categorias[columna] = {}
+            elif tipo == "f8":
+                self.columnas.append(array.array("d"))
+            else:
+                self.columnas.append(array.array("l"))
+
+    def registrar(self, fila_de_datos):
+        """
+        Agrega una fila de datos a las columnas.
+
+        :type fila_de_datos: list
+        """
+        for columna, valores, valor in zip(COLUMNAS_DATOS, self.columnas, fila_de_datos):
+            tipo = TIPOS_COLUMNAS_DATOS[columna]
+            if tipo == "categoria":
+                codigos = self.categorias[columna]
+                valores.append(codigos.setdefault(valor, len(codigos)))
+            elif tipo == "f8":
+                valores.append(float("nan") if valor == "-" else valor)
+            else:
+                valores.append(int(valor))
+
+        self.filas_registradas += 1
+
+    def cerrar(self):
+        """
+        Agrega las columnas de la replica al archivo.
+        """
+        if self.columnas is None:
+            return
+
+        with zipfile.ZipFile(self.archivo, "a", zipfile.ZIP_DEFLATED, allowZip64=True) as npz:
+
+            if any(nombre.startswith(self.replica + "/") for nombre in npz.namelist()):
+                raise ValueError("La replica " + self.replica + " ya esta en " + self.archivo)
+
+            for columna, valores in zip(COLUMNAS_DATOS, self.columnas):
+                tipo = TIPOS_COLUMNAS_DATOS[columna]
+                if tipo == "categoria":
+                    codigos = self.categorias[columna]
+                    categorias = sorted(codigos, key=codigos.get)
+                    self.escribir_arreglo(npz, columna, numpy.frombuffer(valores, dtype=numpy.intc).astype("i4"))
+                    self.escribir_arreglo(npz, columna + "/categorias",
+                                          numpy.array([str(c) for c in categorias], dtype=str))
+                else:
+                    self.escribir_arreglo(npz, columna, numpy.array(valores, dtype=tipo))
+
+        self.columnas = None
+
+    def escribir_arreglo(self, npz, nombre, arreglo):
+        """
+        Escribe un arreglo de la replica en el archivo .npz
+
+        :type npz: zipfile.ZipFile
+        :type nombre: str
+        :type arreglo: numpy.ndarray
+        """
+        contenido = io.BytesIO()
+        numpy.lib.format.write_array(contenido, arreglo, allow_pickle=False)
+        npz.writestr(self.replica + "/" + nombre + ".npy", contenido.getvalue())
+
+
+def cargar_registro_columnar(archivo, decodificar=False):
+    """
+    Carga las replicas de un archivo generado por RegistroColumnar como un diccionario de replicas,
+    cada una con un diccionario de columnas. Si se indica decodificar, las columnas "categoria" se entregan
+    como arreglos de texto en lugar de códigos.
+
+    :type archivo: str
+    :type decodificar: bool
+    """
+    replicas = {}
+
+    with numpy.load(archivo) as npz:
+        for nombre in npz.files:
+            replica, columna = nombre.split("/", 1)
+            replicas.setdefault(replica, {})[columna] = npz[nombre]
+
+    for columnas in replicas.values():
+        for columna in COLUMNAS_DATOS:
+            if TIPOS_COLUMNAS_DATOS[columna] == "categoria":
+                categorias = columnas.pop(columna + "/categorias")
+                if decodificar:
+                    columnas[columna] = categorias[columnas[columna]]
+                else:
+                    columnas[columna + "/categorias"] = categorias
+
+    return replicas
+
+
+class RegistroResumen(Registro):
+    """
+    Clase para el resumen de las filas de datos de una replica sin conservarlas.
+    Acumula la cantidad de filas, las esperas por operacion y la espera total de cada camion. La espera de los
+    camiones que concluyen su atencion se acumula en un total, de modo que solo se conservan los camiones en curso.
+    """
+
+    def __init__(self):
+        """
+        Define las características principales del registro de resumen.
+        """
+        self.filas_registradas = 0
+        self.esperas_operaciones = {}
+        self.esperas_camiones = {}
+        self.camiones_concluidos = 0
+        self.espera_camiones_concluidos = 0
+
+    def registrar(self, fila_de_datos):
+        """
+        Acumula la espera de la fila de datos.
+
+        :type fila_de_datos: list
+        """
+        camion = fila_de_datos[COLUMNAS_DATOS.index("Camion")]
+        operacion = fila_de_datos[COLUMNAS_DATOS.index("Operacion")]
+        espera = fila_de_datos[COLUMNAS_DATOS.index("Espera T.")]
+
+        self.filas_registradas += 1
+
+        acumulado = self.esperas_operaciones.setdefault(operacion, [0, 0])
+        acumulado[0] += 1
+        acumulado[1] += espera
+
+        self.esperas_camiones[camion] = self.esperas_camiones.get(camion, 0) + espera
+
+    def registrar_camion(self, fila_camion):
+        """
+        Traslada la espera de un camion que concluyo su atencion al total de camiones concluidos.
+
+        :type fila_camion: list
+        """
+        camion = fila_camion[COLUMNAS_CAMIONES.index("Camion")]
+
+        if camion in self.esperas_camiones:
+            self.camiones_concluidos += 1
+            self.espera_camiones_concluidos += self.esperas_camiones.pop(camion)
+
+    def resumen(self):
+        """
+        Genera el resumen de la replica.
+        """
+        camiones = self.camiones_concluidos + len(self.esperas_camiones)
+        espera = self.espera_camiones_concluidos + sum(self.esperas_camiones.values())
+
+        return {"Filas": self.filas_registradas,
+                "Camiones": camiones,
+                "Espera media por camion": float(espera) / camiones if camiones else float("nan"),
+                "Espera media por operacion":
+                    dict((operacion, float(suma) / cantidad)
+                         for operacion, (cantidad, suma) in self.esperas_operaciones.items())}
+
+
+class RegistroEstadisticas(Registro):
+    """
+    Clase para el calculo en linea de estadisticas de una replica sin conservar las filas de datos.
+    Acumula media, varianza, extremos y cuantiles de la espera por operacion, por recurso y por carga, y del
+    tiempo en sistema y la espera de los camiones que concluyen su atencion.
+    """
+
+    AGRUPACIONES = ("Operacion", "Recurso", "Carga")
+
+    def __init__(self, cuantiles=(0.5, 0.9, 0.95)):
+        """
+        Define las características principales del registro de estadisticas.
+
+        :type cuantiles: tuple
+        """
+        self.cuantiles = cuantiles
+        self.filas_registradas = 0
+        self.esperas = dict((agrupacion, {}) for agrupacion in self.AGRUPACIONES)
+        self.indices = [(self.esperas[agrupacion], COLUMNAS_DATOS.index(agrupacion))
+                        for agrupacion in self.AGRUPACIONES]
+        self.indice_espera = COLUMNAS_DATOS.index("Espera T.")
+
+        self.tiempo_en_sistema = EstadisticaEnLinea(cuantiles)
+        self.espera_camiones = EstadisticaEnLinea(cuantiles)
+        self.camiones_con_transbordo = 0
+
+    def registrar(self, fila_de_datos):
+        """
+        Agrega la espera de la fila de datos a las estadisticas de su operacion, recurso y carga.
+
+        :type fila_de_datos: list
+        """
+        espera = fila_de_datos[self.indice_espera]
+        self.filas_registradas += 1
+
+        for estadisticas, indice in self.indices:
+            clave = fila_de_datos[indice]
+            estadistica = estadisticas.get(clave)
+            if estadistica is None:
+                estadistica = estadisticas[clave] = EstadisticaEnLinea(self.cuantiles)
+            estadistica.agregar(espera)
+
+    def registrar_camion(self, fila_camion):
+        """
+        Agrega el tiempo en sistema y la espera del camion a las estadisticas de camiones.
+
+        :type fila_camion: list
+        """
+        self.tiempo_en_sistema.agregar(fila_camion[COLUMNAS_CAMIONES.index("Tiempo en sistema")])
+        self.espera_camiones.agregar(fila_camion[COLUMNAS_CAMIONES.index("Espera T.")])
+
+        if fila_camion[COLUMNAS_CAMIONES.index("Transbordo")] == "Si":
+            self.camiones_con_transbordo += 1
+
+    def resumen(self):
+        """
+        Genera el resumen de las estadisticas de la replica.
+        """
+        camiones = self.tiempo_en_sistema.cantidad
+
+        resumen = {"Filas": self.filas_registradas,
+                   "Camiones concluidos": camiones,
+                   "Tiempo en sistema": self.tiempo_en_sistema.resumen(),
+                   "Espera por camion": self.espera_camiones.resumen(),
+                   "Proporcion con transbordo":
+                       float(self.camiones_con_transbordo) / camiones if camiones else float("nan")}
+
+        for agrupacion, estadisticas in self.esperas.items():
+            resumen["Espera por " + agrupacion.lower()] = dict(
+                (clave, estadistica.resumen()) for clave, estadistica in estadisticas.items())
+
+        return resumen
+
+    def reporte(self, salida=None):
+        """
+        Escribe las estadisticas de la replica como tablas de texto, por defecto en la salida estandar.
+
+        :type salida: file
+        """
+        salida = salida if salida is not None else sys.stdout
+        columnas = ["Cantidad", "Media", "Desv. estandar", "Minimo", "Maximo"] + \
+                   ["Q" + str(int(round(c * 100))) for c in self.cuantiles]
+
+        def escribir_tabla(titulo, estadisticas):
+            salida.write("\n" + titulo + "\n")
+            salida.write("%-45s" % "" + "".join("%15s" % c for c in columnas) + "\n")
+            for clave in sorted(estadisticas):
+                estadistica = estadisticas[clave]
+                valores = [estadistica.cantidad, estadistica.media, estadistica.desviacion(), estadistica.minimo,
+                           estadistica.maximo] + [estadistica.cuantil(c) for c in self.cuantiles]
+                salida.write("%-45s" % clave + "".join("%15.2f" % v for v in valores) + "\n")
+
+        escribir_tabla("Camiones concluidos", {"Tiempo en sistema": self.tiempo_en_sistema,
+                                               "Espera": self.espera_camiones})
+        if self.tiempo_en_sistema.cantidad:
+            salida.write("Proporcion con transbordo: %.4f\n"
+                         % (float(self.camiones_con_transbordo) / self.tiempo_en_sistema.cantidad))
+
+        for agrupacion in self.AGRUPACIONES:
+            escribir_tabla("Espera por " + agrupacion.lower(), self.esperas[agrupacion])
+
+
+class EstadisticaEnLinea(object):
+    """
+    Clase para el calculo en linea de la media y la varianza (método de Welford), los extremos y los cuantiles
+    (algoritmo P²) de una serie de valores, sin conservarlos.
+    """
+
+    __slots__ = ("cantidad", "media", "suma_cuadrados", "minimo", "maximo", "cuantiles")
+
+    def __init__(self, cuantiles=()):
+        """
+        Define la estadistica vacía y los cuantiles a estimar.
+
+        :type cuantiles: tuple
+        """
+        self.cantidad = 0
+        self.media = 0.0
+        self.suma_cuadrados = 0.0
+        self.minimo = float("nan")
+        self.maximo = float("nan")
+        self.cuantiles = dict((c, CuantilP2(c)) for c in cuantiles)
+
+    def agregar(self, valor):
+        """
+        Agrega un valor a la estadistica.
+
+        :type valor: float
+        """
+        self.cantidad += 1
+        delta = valor - self.media
+        self.media += delta / float(self.cantidad)
+        self.suma_cuadrados += delta * (valor - self.media)
+
+        if self.cantidad == 1:
+            self.minimo = self.maximo = valor
+        elif valor < self.minimo:
+            self.minimo = valor
+        elif valor > self.maximo:
+            self.maximo = valor
+
+        for cuantil in self.cuantiles.values():
+            cuantil.agregar(valor)
+
+    def varianza(self):
+        """
+        Varianza muestral de los valores agregados.
+        """
+        return self.suma_cuadrados / (self.cantidad - 1) if self.cantidad > 1 else float("nan")
+
+    def desviacion(self):
+        """
+        Desviación estándar muestral de los valores agregados.
+        """
+        return self.varianza() ** 0.5
+
+    def cuantil(self, probabilidad):
+        """
+        Estimación del cuantil indicado, que debe ser uno de los cuantiles definidos al crear la estadistica.
+
+        :type probabilidad: float
+        """
+        return self.cuantiles[probabilidad].valor()
+
+    def resumen(self):
+        """
+        Genera el resumen de la estadistica.
+        """
+        resumen = {"Cantidad": self.cantidad, "Media": self.media if self.cantidad else float("nan"),
+                   "Desviacion estandar": self.desviacion(), "Minimo": self.minimo, "Maximo": self.maximo}
+        for probabilidad in sorted(self.cuantiles):
+            resumen["Cuantil %g" % probabilidad] = self.cuantil(probabilidad)
+        return resumen
+
+
+class CuantilP2(object):
+    """
+    Clase para la estimación en linea de un cuantil con el algoritmo P² (Jain y Chlamtac, 1985), que mantiene
+    solo cinco marcadores cuyas alturas se ajustan con cada valor.
+    """
+
+    __slots__ = ("probabilidad", "alturas", "posiciones", "posiciones_deseadas", "incrementos")
+
+    def __init__(self, probabilidad):
+        """
+        Define el cuantil a estimar.
+
+        :type probabilidad: float
+        """
+        if not 0 < probabilidad < 1:
+            raise ValueError("La probabilidad del cuantil debe estar entre 0 y 1")
+
+        p = probabilidad
+        self.probabilidad = p
+        self.alturas = []
+        self.posiciones = [0, 1, 2, 3, 4]
+        self.posiciones_deseadas = [0, 2 * p, 4 * p, 2 + 2 * p, 4]
+        self.incrementos = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def agregar(self, valor):
+        """
+        Agrega un valor y ajusta los marcadores.
+
+        :type valor: float
+        """
+        q = self.alturas
+        n = self.posiciones
+
+        # Los primeros cinco valores inicializan los marcadores
+        if len(q) < 5:
+            bisect.insort(q, valor)
+            return
+
+        if valor < q[0]:
+            q[0] = valor
+            k = 0
+        elif valor >= q[4]:
+            q[4] = valor
+            k = 3
+        else:
+            k = bisect.bisect_right(q, valor) - 1
+
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.posiciones_deseadas[i] += self.incrementos[i]
+
+        for i in (1, 2, 3):
+            d = self.posiciones_deseadas[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                altura = q[i] + float(d) / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * float(q[i + 1] - q[i]) / (n[i + 1] - n[i]) +
+                    (n[i + 1] - n[i] - d) * float(q[i] - q[i - 1]) / (n[i] - n[i - 1]))
+                if not q[i - 1] < altura < q[i + 1]:
+                    altura = q[i] + d * float(q[i + d] - q[i]) / (n[i + d] - n[i])
+                q[i] = altura
+                n[i] += d
+
+    def valor(self):
+        """
+        Estimación actual del cuantil. Con menos de cinco valores se usa el valor de orden más cercano.
+        """
+        if not self.alturas:
+            return float("nan")
+        if len(self.alturas) < 5:
+            return self.alturas[int(round(self.probabilidad * (len(self.alturas) - 1)))]
+        return self.alturas[2]
+
+
+def ejecutar_replica(tarea):
+    """
+    Ejecuta una replica en un sistema nuevo y devuelve su resumen, sin conservar las filas de datos.
+    La tarea es una tupla (horizonte, semilla, opciones), donde opciones son los argumentos de Sistema.
+
+    :type tarea: tuple
+    """
+    horizonte, semilla, opciones = tarea
+
+    inicio = time.time()
+    sistema = Sistema(conservar_datos=False, semilla=semilla, **opciones)
+    registro = sistema.agregar_registro(RegistroResumen())
+    construccion = time.time()
+
+    sistema.ejecutar_replica(horizonte)
+    fin = time.time()
+
+    resumen = registro.resumen()
+    resumen["Semilla"] = semilla
+    resumen["Tiempo de construccion"] = construccion - inicio
+    resumen["Tiempo de simulacion"] = fin - construccion
+
+    return resumen
+
+
+def simular_replicas(horizonte, replicas, semilla=55, procesos=None, **opciones):
+    """
+    Ejecuta replicas independientes de la simulación en un grupo de procesos y devuelve sus resúmenes en orden.
+    La semilla de cada replica se genera a partir de la semilla indicada. Si no se indica la cantidad de procesos
+    se usan todos los núcleos; con un proceso las replicas se ejecutan en el proceso actual, y solo entonces
+    pueden indicarse un perfilador o una traza.
+
+    :type horizonte: str
+    :type replicas: int
+    :type semilla: int
+    :type procesos: int
+    """
+    tareas = [(horizonte, semilla_replica, opciones) for semilla_replica in semillas_replicas(semilla, replicas)]
+
+    return ejecutar_tareas(tareas, procesos)
+
+
+def semillas_replicas(semilla, replicas):
+    """
+    Genera las semillas de las replicas a partir de una semilla.
+
+    :type semilla: int
+    :type replicas: int
+    """
+    generador = random.Random(semilla)
+    return [generador.randint(0, 2 ** 31 - 1) for _ in range(replicas)]
+
+
+def ejecutar_tareas(tareas, procesos=None):
+    """
+    Ejecuta las replicas indicadas por las tareas en un grupo de procesos y devuelve sus resúmenes en orden.
+    Los perfiladores, trazas y registros solo pueden usarse con un proceso: en el grupo se copiarían a cada
+    proceso y sus resultados se perderían.
+
+    :type tareas: list
+    :type procesos: int
+    """
+    if procesos == 1:
+        return [ejecutar_replica(tarea) for tarea in tareas]
+
+    for horizonte, semilla, opciones in tareas:
+        for opcion, valor in opciones.items():
+            if isinstance(valor, (Perfilador, Traza, Registro)):
+                raise ValueError("La opcion " + opcion + " solo puede usarse con procesos=1")
+
+    grupo = multiprocessing.Pool(procesos)
+    try:
+        resumenes = grupo.map(ejecutar_replica, tareas)
+    finally:
+        grupo.close()
+        grupo.join()
+
+    return resumenes
+
+
+def comparar_escenarios(escenarios, horizonte, replicas, semilla=55, procesos=None,
+                        indicadores=("Espera media por camion",), confianza=0.95):
+    """
+    Compara escenarios con números aleatorios comunes: todos los escenarios se simulan con las mismas semillas
+    por replica, de forma que comparten llegadas, cargas, tipos y tiempos de servicio por operación.
+    Cada escenario es un par (nombre, opciones de Sistema); el primero es la base de la comparación.
+    Para cada indicador y cada escenario se reporta la media, y para cada escenario distinto de la base
+    la diferencia media pareada respecto a la base con su intervalo de confianza.
+
+    :type escenarios: list
+    :type horizonte: str
+    :type replicas: int
+    :type semilla: int
+    :type procesos: int
+    :type indicadores: tuple
+    :type confianza: float
+    """
+    semillas = semillas_replicas(semilla, replicas)
+
+    tareas = [(horizonte, semilla_replica, opciones)
+              for nombre, opciones in escenarios
+              for semilla_replica in semillas]
+
+    resumenes = ejecutar_tareas(tareas, procesos)
+
+    resumenes_escenarios = dict(
+        (nombre, resumenes[k * replicas:(k + 1) * replicas]) for k, (nombre, opciones) in enumerate(escenarios))
+
+    base = escenarios[0][0]
+    comparacion = {"Base": base, "Replicas": replicas, "Confianza": confianza, "Indicadores": {}}
+
+    for indicador in indicadores:
+
+        medias = dict((nombre, media([r[indicador] for r in resumenes_escenarios[nombre]]))
+                      for nombre, opciones in escenarios)
+
+        diferencias = {}
+        for nombre, opciones in escenarios[1:]:
+            diferencias[nombre] = diferencia_pareada(
+                [r[indicador] for r in resumenes_escenarios[nombre]],
+                [r[indicador] for r in resumenes_escenarios[base]],
+                confianza)
+
+        comparacion["Indicadores"][indicador] = {"Medias": medias, "Diferencias": diferencias}
+
+    return comparacion
+
+
+def media(valores):
+    """
+    Calcula la media de los valores.
+
+    :type valores: list
+    """
+    return float(sum(valores)) / len(valores)
+
+
+def diferencia_pareada(valores, valores_base, confianza=0.95):
+    """
+    Calcula la diferencia media entre valores pareados por replica y su intervalo de confianza t de Student.
+
+    :type valores: list
+    :type valores_base: list
+    :type confianza: float
+    """
+    diferencias = [valor - valor_base for valor, valor_base in zip(valores, valores_base)]
+    n = len(diferencias)
+    diferencia_media = media(diferencias)
+
+    if n > 1:
+        desviacion = (sum((d - diferencia_media) ** 2 for d in diferencias) / (n - 1)) ** 0.5
+        semiamplitud = valor_t(n - 1, confianza) * desviacion / n ** 0.5
+    else:
+        desviacion = float("nan")
+        semiamplitud = float("nan")
+
+    return {"Diferencia media": diferencia_media,
+            "Desviacion": desviacion,
+            "Semiamplitud": semiamplitud,
+            "Intervalo": (diferencia_media - semiamplitud, diferencia_media + semiamplitud)}
+
+
+# Cuantiles bilaterales de la distribución t de Student para 1 a 30 grados de libertad, y para 40, 60 y 120
+VALORES_T = {
+    0.90: [6.314, 2.920, 2.353, 2.132, 2.015, 1.943, 1.895, 1.860, 1.833, 1.812,
+           1.796, 1.782, 1.771, 1.761, 1.753, 1.746, 1.740, 1.734, 1.729, 1.725,
+           1.721, 1.717, 1.714, 1.711, 1.708, 1.706, 1.703, 1.701, 1.699, 1.697],
+    0.95: [12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+           2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+           2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042],
+    0.99: [63.657, 9.925, 5.841, 4.604, 4.032, 3.707, 3.499, 3.355, 3.250, 3.169,
+           3.106, 3.055, 3.012, 2.977, 2.947, 2.921, 2.898, 2.878, 2.861, 2.845,
+           2.831, 2.819, 2.807, 2.797, 2.787, 2.779, 2.771, 2.763, 2.756, 2.750]}
+VALORES_T_GRANDES = {
+    0.90: {40: 1.684, 60: 1.671, 120: 1.658},
+    0.95: {40: 2.021, 60: 2.000, 120: 1.980},
+    0.99: {40: 2.704, 60: 2.660, 120: 2.617}}
+
+
+def valor_t(grados_de_libertad, confianza=0.95):
+    """
+    Obtiene el cuantil bilateral de la distribución t de Student. Para grados de libertad que no están en la tabla
+    se usa el mayor tabulado que no los supera, lo que da intervalos algo conservadores.
+
+    :type grados_de_libertad: int
+    :type confianza: float
+    """
+    if confianza not in VALORES_T:
+        raise ValueError("Confianza no tabulada: " + str(confianza))
+
+    if grados_de_libertad <= 30:
+        return VALORES_T[confianza][grados_de_libertad - 1]
+
+    tabulados = [g for g in sorted(VALORES_T_GRANDES[confianza]) if g <= grados_de_libertad]
+    if tabulados:
+        return VALORES_T_GRANDES[confianza][tabulados[-1]]
+    else:
+        return VALORES_T[confianza][-1]
+
+
+class Traza(object):
+    """
+    Clase para el registro de mensajes de la simulación.
+    Cada mensaje tiene una categoría y un nivel, y solo se formatea y escribe si su categoría está habilitada
+    y su nivel alcanza el nivel mínimo. Por defecto solo se registran los errores.
+    """
+
+    DEBUG = 10
+    INFO = 20
+    ERROR = 40
+
+    # Cambios en colas, adelantos, inicio y fin de operaciones, esperas de transbordo, atención fuera de horario
+    # y errores
+    CATEGORIAS = ("cola", "adelanto", "operacion", "transbordo", "horario", "error")
+
+    def __init__(self, categorias=("error",), nivel=INFO, salida=None):
+        """
+        Define las características principales de la clase traza.
+
+        :type categorias: collections.Iterable
+        :type nivel: int
+        :type salida: file
+        """
+        self.categorias = set(categorias)
+        self.nivel = nivel
+        self.salida = salida
+
+    def habilitar(self, *categorias):
+        """
+        Habilita el registro de mensajes de las categorías indicadas.
+
+        :type categorias: str
+        """
+        self.categorias.update(categorias)
+
+    def deshabilitar(self, *categorias):
+        """
+        Deshabilita el registro de mensajes de las categorías indicadas.
+
+        :type categorias: str
+        """
+        self.categorias.difference_update(categorias)
+
+    def activa(self, categoria, nivel=INFO):
+        """
+        Indica si se registran los mensajes de la categoría y nivel indicados.
+
+        :type categoria: str
+        :type nivel: int
+        """
+        return nivel >= self.nivel and categoria in self.categorias
+
+    def registrar(self, categoria, nivel, mensaje, *argumentos):
+        """
+        Registra un mensaje. Los argumentos se formatean en el mensaje solo si el mensaje es registrado.
+
+        :type categoria: str
+        :type nivel: int
+        :type mensaje: str
+        """
+        if nivel >= self.nivel and categoria in self.categorias:
+
+            if argumentos:
+                mensaje = mensaje % argumentos
+
+            salida = self.salida if self.salida is not None else sys.stdout
+            salida.write(mensaje + "\n")
+
+
+class Perfilador(object):
+    """
+    Clase para la medición de la ejecución de la simulación: cantidad de llamadas y tiempo acumulado de los
+    métodos de decisión y disponibilidad de los camiones, de las operaciones y de los procesos del sistema,
+    y cantidad de eventos programados por cada tipo de proceso.
+    Los métodos se instrumentan solo mientras el perfilador está activo, por lo que sin perfilador la
+    simulación no tiene costo adicional. Los tiempos son inclusivos: el tiempo de un método incluye el de los
+    métodos que llama, y el de un proceso el de cada reanudación de su generador.
+    """
+
+    # Métodos instrumentados, por nombre de clase
+    METODOS = (
+        ("Sistema", ("generar_camiones", "atender_camion")),
+        ("Camion", ("espera_operacion", "espera_operacion_manipuleo", "espera_transbordo", "espera_horario_atencion",
+                    "intenta_adelantar_camion_operacion", "intenta_adelantar_camion_manipuleo",
+                    "solicita_adelanto", "solicita_adelanto_operacion", "adelanta_camion",
+                    "dispone_camion_esperando_camion", "dispone_producto_espacio_sistema",
+                    "dispone_producto_espacio_medios_almacenamiento",
+                    "dispone_producto_espacio_y_entre_primeros_medios_almacenamiento",
+                    "dispone_producto_espacio_medio_almacenamiento", "entre_primeros_colas_medios_almacenamiento",
+                    "entre_primeros_colas_recursos", "entre_primeros_cola_medio_de_almacenamiento",
+                    "entre_primeros_cola_recurso", "atras_de_camion_en_cola_medio_almacenamiento",
+                    "atras_de_camion_en_cola_recurso")),
+        ("Operacion", ("ejecutar",)),
+        ("OperacionManipuleo", ("ejecutar",)),
+        ("ColaCamiones", ("primeros", "entre_primeros", "delante_de", "detras_de", "esta_detras")))
+
+    # Perfilador con los métodos instrumentados en este momento
+    activo = None
+
+    def __init__(self):
+        """
+        Define las características principales del perfilador.
+        """
+        self.llamadas = {}
+        self.tiempos = {}
+        self.eventos = {}
+        self.originales = []
+
+        # Nombres "Clase.metodo" de los procesos, por código de su función generadora
+        self.nombres_procesos = {}
+
+    def activar(self, sistema):
+        """
+        Instrumenta los métodos y la programación de eventos del sistema.
+
+        :type sistema: Sistema
+        """
+        if Perfilador.activo is not None:
+            raise RuntimeError("Ya hay un perfilador activo")
+        Perfilador.activo = self
+
+        modulo = sys.modules[__name__]
+
+        # Los procesos no instrumentados se identifican con el mismo nombre calificado que los instrumentados
+        for nombre_clase, clase in inspect.getmembers(modulo, inspect.isclass):
+            if clase.__module__ == __name__:
+                for metodo, funcion in clase.__dict__.items():
+                    funcion = getattr(funcion, "__func__", funcion)
+                    if inspect.isgeneratorfunction(funcion):
+                        self.nombres_procesos[funcion.__code__] = nombre_clase + "." + metodo
+
+        for nombre_clase, metodos in self.METODOS:
+            clase = getattr(modulo, nombre_clase)
+            for metodo in metodos:
+                original = clase.__dict__[metodo]
+                self.originales.append((clase, metodo, original))
+                if isinstance(original, staticmethod):
+                    envuelto = staticmethod(self.envolver(nombre_clase + "." + metodo, original.__func__))
+                else:
+                    envuelto = self.envolver(nombre_clase + "." + metodo, original)
+                setattr(clase, metodo, envuelto)
+
+        programar = sistema.schedule
+        eventos = self.eventos
+        nombres_procesos = self.nombres_procesos
+
+        def programar_contando(evento, *argumentos):
+            proceso = sistema.active_process
+            if proceso is None:
+                tipo = "(sin proceso)"
+            else:
+                generador = proceso._generator
+                tipo = nombres_procesos.get(getattr(generador, "gi_code", None), generador.__name__)
+            eventos[tipo] = eventos.get(tipo, 0) + 1
+            programar(evento, *argumentos)
+
+        sistema.schedule = programar_contando
 
-    def entre_primeros_cola_medio_de_almacenamiento(self, medio_de_almacenamiento):
+    def desactivar(self, sistema):
         """
-        Identifica si el camion esta entre los primeros camiones de la cola del medio de almacenamiento
+        Restituye los métodos originales y la programación de eventos del sistema.
 
-        :type medio_de_almacenamiento: MedioDeAlmacenamiento
+        :type sistema: Sistema
         """
+        for clase, metodo, original in reversed(self.originales):
+            setattr(clase, metodo, original)
+        self.originales = []
 
-        if self in medio_de_almacenamiento.cola[0:medio_de_almacenamiento.espacios_de_atencion]:
-            return True
-        else:
-            return False
+        if "schedule" in sistema.__dict__:
+            del sistema.schedule
 
-    def entre_primeros_cola_recurso(self, recurso):
-        """
-        Identifica si el camion esta entre los primeros camiones de la cola del recurso de atencion
+        Perfilador.activo = None
 
-        :type recurso: Recurso
+    def acumular(self, nombre, tiempo):
         """
+        Acumula una llamada y su tiempo de ejecución.
 
-        if self in recurso.cola[0:recurso.capacity]:
-            return True
-        else:
-            return False
+        :type nombre: str
+        :type tiempo: float
+        """
+        self.llamadas[nombre] = self.llamadas.get(nombre, 0) + 1
+        self.tiempos[nombre] = self.tiempos.get(nombre, 0.0) + tiempo
 
-    def atras_de_camion_en_cola_medio_almacenamiento(self, camion_ref, medio_de_almacenamiento):
+    def envolver(self, nombre, funcion):
         """
-        Identifica si el camion esta detras de otro en la cola del medio de almacenamiento
+        Genera la versión instrumentada de una función. Si la función es un generador, se mide cada reanudación
+        del generador resultante.
 
-        :type camion_ref: Camion
-        :type medio_de_almacenamiento: MedioDeAlmacenamiento
+        :type nombre: str
+        :type funcion: function
         """
+        perfilador = self
 
-        if self in medio_de_almacenamiento.cola[medio_de_almacenamiento.cola.index(camion_ref) + 1:]:
-            return True
+        if inspect.isgeneratorfunction(funcion):
+            @functools.wraps(funcion)
+            def envuelto(*argumentos, **opciones):
+                perfilador.llamadas[nombre] = perfilador.llamadas.get(nombre, 0) + 1
+                return GeneradorPerfilado(perfilador, nombre, funcion(*argumentos, **opciones))
         else:
-            return False
+            @functools.wraps(funcion)
+            def envuelto(*argumentos, **opciones):
+                inicio = time.time()
+                try:
+                    return funcion(*argumentos, **opciones)
+                finally:
+                    perfilador.acumular(nombre, time.time() - inicio)
 
-    def atras_de_camion_en_cola_recurso(self, camion_ref, recurso):
+        return envuelto
+
+    def reporte(self, salida=None):
         """
-        Identifica si el camion esta detras de otro en la cola del recurso de atención
+        Escribe los métodos ordenados por tiempo acumulado y los tipos de proceso ordenados por cantidad de
+        eventos programados, por defecto en la salida estandar.
 
-        :type camion_ref: Camion
-        :type recurso: Recurso
+        :type salida: file
         """
+        salida = salida if salida is not None else sys.stdout
 
-        if self in recurso.cola[recurso.cola.index(camion_ref) + 1:]:
-            return True
-        else:
-            return False
+        salida.write("\n%-75s%12s%15s%18s\n" % ("Metodo", "Llamadas", "Tiempo (s)", "Por llamada (us)"))
+        for nombre in sorted(self.llamadas, key=lambda n: (-self.tiempos.get(n, 0.0), n)):
+            llamadas = self.llamadas[nombre]
+            tiempo = self.tiempos.get(nombre, 0.0)
+            salida.write("%-75s%12d%15.3f%18.1f\n" % (nombre, llamadas, tiempo, 1e6 * tiempo / llamadas))
 
+        salida.write("\n%-75s%12s\n" % ("Proceso", "Eventos"))
+        for tipo in sorted(self.eventos, key=lambda t: (-self.eventos[t], t)):
+            salida.write("%-75s%12d\n" % (tipo, self.eventos[tipo]))
 
-class Operacion(object):
-    """Clase para el modelado de las operaciones presentes en el sistema."""
 
-    def __init__(self, nombre, recurso, ts_distrib, parametros, datos):
+class GeneradorPerfilado(object):
+    """
+    Clase para la medición de las reanudaciones de un generador de proceso, usada por Perfilador.
+    Expone la interfaz de generador que requiere simpy.
+    """
+
+    __slots__ = ("perfilador", "nombre", "generador", "__name__")
+
+    def __init__(self, perfilador, nombre, generador):
         """
-        Define las características principales de la clase operación.
+        Define el generador medido.
 
+        :type perfilador: Perfilador
         :type nombre: str
-        :type recurso: Recurso
-        :type ts_distrib: str
-        :type parametros: list
-        :type datos: list
+        :type generador: types.GeneratorType
         """
+        self.perfilador = perfilador
         self.nombre = nombre
-        self.recurso = recurso
-        self.ts_distrib = ts_distrib
-        self.parametros = parametros
-        self.datos = datos
+        self.generador = generador
+        self.__name__ = nombre
 
-    def tiempo_de_servicio(self):  # TODO Incluir distribuciones de probabilidad
+    @property
+    def gi_frame(self):
         """
-        Genera el tiempo de servicio de la operación
+        Marco de ejecución del generador medido.
         """
+        return self.generador.gi_frame
 
-        if self.ts_distrib == "uniforme":
-            ts = random.uniform(*self.parametros)
-        elif self.ts_distrib == "triangular":
-            ts = random.triangular(*self.parametros)
-        else:
-            print "Error, distribución no reconocida"
-            ts = None
-        return int(round(ts, 0))
+    def __iter__(self):
+        return self
 
-    def ejecutar(self, sistema, camion, tpaciencia_t=float("Inf"), medio_de_almacenamiento=None):
+    def next(self):
         """
-        Simula la ejecución de la operación registrando y mostrando datos de la atención.
-
-        :type sistema: Sistema
-        :type camion: Camion.
-        :type tpaciencia_t: int
-        :type medio_de_almacenamiento: MedioDeAlmacenamiento
+        Reanuda el generador sin valor.
         """
+        return self.send(None)
 
-        arribo = sistema.now
-
-        self.recurso.cola.append(camion)
-
-        if self.recurso.nombre == "Estacion Tolva/Balanza 3":
-            print self.recurso.cola
+    def send(self, valor):
+        """
+        Reanuda el generador con un valor.
+        """
+        inicio = time.time()
+        try:
+            return self.generador.send(valor)
+        finally:
+            self.perfilador.tiempos[self.nombre] = self.perfilador.tiempos.get(self.nombre, 0.0) + \
+                time.time() - inicio
 
-        if not camion.entre_primeros_cola_recurso(self.recurso):
-            camion.solicita_adelanto_operacion(sistema, self)
+    def throw(self, *excepcion):
+        """
+        Reanuda el generador lanzando una excepción en él.
+        """
+        inicio = time.time()
+        try:
+            return self.generador.throw(*excepcion)
+        finally:
+            self.perfilador.tiempos[self.nombre] = self.perfilador.tiempos.get(self.nombre, 0.0) + \
+                time.time() - inicio
 
-        yield sistema.process(
-            camion.espera_operacion(sistema, self))
+    def close(self):
+        """
+        Concluye el generador.
+        """
+        self.generador.close()
 
-        with self.recurso.request() as turno:
 
-            yield turno
+class FlujoPorBloques(object):
+    """
+    Clase para flujos de números aleatorios generados por bloques con NumPy.
+    Cada distribución, con sus parámetros, tiene su propio bloque de muestras que se regenera al agotarse,
+    de forma que cada muestra se obtiene de una lista ya generada.
+    Ofrece los métodos de random.Random usados para llegadas y tiempos de servicio.
+    """
 
-            # Al ingresar a las primeras operaciones, el camion ingresa al sistema
-            if self.nombre in ["Atencion recepcion 1", "Atencion despacho 1"]:
-                sistema.camiones_en_sistema.append(camion)
+    def __init__(self, semilla, tamano_bloque=4096):
+        """
+        Define las características principales del flujo por bloques.
 
-            inicio = sistema.now
-            espera_r = inicio - arribo
-            print str(camion) + " Inicio " + self.nombre + " - Hora: " + str(inicio)
-            ts = self.tiempo_de_servicio()
+        :type semilla: int
+        :type tamano_bloque: int
+        """
+        if numpy is None:
+            raise ImportError("FlujoPorBloques requiere NumPy")
 
-            yield sistema.timeout(ts)
-            self.recurso.cola.remove(camion)
+        self.generador = numpy.random.RandomState(semilla)
+        self.tamano_bloque = tamano_bloque
+        self.bloques = {}
 
-            salida = sistema.now
+    def nuevo_bloque(self, clave, distribucion, *parametros):
+        """
+        Genera un bloque de muestras de la distribución. Las muestras se entregan desde el final de la lista.
 
-            print str(camion) + " SALE DE SISTEMA - HORA: " + str(sistema.now)
+        :type clave: tuple
+        """
+        bloque = distribucion(*parametros, size=self.tamano_bloque).tolist()
+        bloque.reverse()
+        self.bloques[clave] = bloque
+        return bloque
 
-            # Al salir de las últimas operaciones, el camion sale del sistema
-            if self.nombre in ["Atencion recepcion 2", "Atencion despacho 2"]:
-                sistema.camiones_en_sistema.remove(camion)
+    def uniform(self, a, b):
+        """
+        Obtiene una muestra de la distribución uniforme entre a y b.
 
-            dia = round(sistema.now / (24 * 60) + 0.5)
+        :type a: float
+        :type b: float
+        """
+        bloque = self.bloques.get(("uniforme", a, b))
+        if not bloque:
+            bloque = self.nuevo_bloque(("uniforme", a, b), self.generador.uniform, a, b)
+        return bloque.pop()
 
-            fila_de_datos = [camion.nombre, camion.carga, camion.tipo, camion.peso, self.nombre, self.recurso.nombre,
-                             dia, arribo, "-", espera_r, "-", espera_r, inicio, salida, "-", "-"]
+    def triangular(self, low, high, mode):
+        """
+        Obtiene una muestra de la distribución triangular, con los parámetros en el orden de random.triangular.
 
-            self.datos.append(fila_de_datos)
+        :type low: float
+        :type high: float
+        :type mode: float
+        """
+        bloque = self.bloques.get(("triangular", low, high, mode))
+        if not bloque:
+            bloque = self.nuevo_bloque(("triangular", low, high, mode), self.generador.triangular, low, mode, high)
+        return bloque.pop()
 
 
-class OperacionManipuleo(Operacion):
+class Senal(object):
     """
-    Clase para el modelado de las operaciones de manipuleo presentes en el sistema.
-    Subclase de Operacion
+    Clase para el modelado de señales de cambio de estado en el sistema.
+    Los camiones en espera se suscriben a las señales de las que depende su verificación, y el reloj de esperas
+    los despierta en su siguiente verificación cuando alguna de ellas es emitida.
     """
 
-    def __init__(self, nombre, recurso, ts_distrib, parametros, datos):
+    def __init__(self, sistema):
         """
-        Define las características principales de la clase operación manipuleo.
+        Define las características principales de la clase señal.
 
-        :type nombre: str
-        :type recurso: Recurso
-        :type ts_distrib: str
-        :type parametros: list
+        :type sistema: Sistema
         """
-        super(OperacionManipuleo, self).__init__(nombre, recurso, ts_distrib, parametros, datos)
+        self.sistema = sistema
+        self.suscripciones = []
+        self.limite_suscripciones = 64
 
-    def ejecutar(self, sistema, camion, tpaciencia_t=float("Inf"), medio_de_almacenamiento=None):
+    def suscribir(self, espera):
         """
-        Modela la ejecución de la operación de manipuleo.
+        Suscribe una espera para que sea despertada en la siguiente emisión de la señal. Las esperas que ya no
+        duermen se descartan cuando se acumulan demasiadas.
 
-        :type sistema: Sistema
-        :type camion:  Camion
-        :type tpaciencia_t: int
-        :type medio_de_almacenamiento: MedioDeAlmacenamiento
+        :type espera: Espera
         """
+        self.suscripciones.append(espera)
 
-        if medio_de_almacenamiento is not None:
-
-            arribo = sistema.now
-            print str(camion) + " arribo a - " + self.nombre + " - Hora: " + str(arribo)
-
-            self.recurso.cola.append(camion)
-            medio_de_almacenamiento.cola.append(camion)
+        if len(self.suscripciones) > self.limite_suscripciones:
+            self.suscripciones = [e for e in self.suscripciones if e.dormida]
+            self.limite_suscripciones = max(64, 2 * len(self.suscripciones))
 
-            if not camion.entre_primeros_cola_recurso(self.recurso) \
-                    or not camion.entre_primeros_cola_medio_de_almacenamiento(medio_de_almacenamiento):
-                camion.solicita_adelanto(sistema, self, medio_de_almacenamiento)
+    def despertar(self):
+        """
+        Despierta las esperas suscritas a la señal.
+        """
+        if self.suscripciones:
+            suscripciones = self.suscripciones
+            self.suscripciones = []
+            self.sistema.reloj_esperas.despertar(suscripciones)
 
-            espera_manipuleo = yield sistema.process(
-                camion.espera_operacion_manipuleo(sistema, self, medio_de_almacenamiento, tpaciencia_t))
+    def emitir(self):
+        """
+        Emite la señal, incrementando la versión de estado del sistema y despertando las esperas suscritas a ella
+        y a la señal de cambio de estado del sistema.
+        """
+        self.sistema.version_estado += 1
+        self.despertar()
 
-            if espera_manipuleo[0] == "Inicia":
+        if self is not self.sistema.cambio_estado:
+            self.sistema.cambio_estado.despertar()
 
-                espera_r = espera_manipuleo[1]
-                espera_p = espera_manipuleo[2]
-                espera_m_od = espera_manipuleo[3]
-                espera_t = espera_manipuleo[4]
 
-                with self.recurso.request() as turno:
+class Espera(simpy.events.Event):
+    """
+    Clase para el modelado de la espera de un camion que duerme hasta que se emite alguna señal o vence su paciencia.
+    Su valor es el número de minutos transcurridos, contados como las verificaciones minuto a minuto que reemplaza.
+    """
 
-                    yield turno
+    def __init__(self, sistema):
+        """
+        Define las características principales de la clase espera.
 
-                    if turno.triggered:
-                        inicio = sistema.now
-                        print str(camion) + " Inicio " + self.nombre + " - Hora: " + str(inicio)
-                        ts = self.tiempo_de_servicio()
-                        print str(camion) + " ts=" + str(ts)
+        :type sistema: Sistema
+        """
+        super(Espera, self).__init__(sistema)
+        # Grupo de esperas con el que se verifica y posición en el mismo
+        self.grupo = None
+        self.indice = 0
+        # Minuto del grupo en que se inicia la espera y minuto en que vence, si tiene paciencia
+        self.inicio = 0
+        self.vencimiento = None
+        self.despierta = False
+        self.cancelada = False
+
+    @property
+    def dormida(self):
+        """
+        Indica si la espera aún no fue despertada ni cancelada.
+        """
+        return not self.despierta and not self.cancelada
 
-                        # Inicia uso de estacion disp. en medio de origen/destino
-                        medio_de_almacenamiento.espacios_en_uso += 1
 
-                        atencion = sistema.timeout(ts)
-                        yield atencion
+class GrupoDeEsperas(object):
+    """
+    Clase para el modelado de las esperas cuya siguiente verificación se ubica en la misma posición de la cola de
+    eventos: las verificaciones que programan los camiones a un mismo tiempo sin que se programen otros eventos
+    entre ellas.
+    """
 
-                        if camion.tipo == "Carga":
-                            medio_de_almacenamiento.cargar_producto(camion, camion.carga)
-                        else:
-                            medio_de_almacenamiento.descargar_producto(camion, camion.carga)
+    __slots__ = ("tiempo", "orden", "minuto", "esperas", "siguiente", "inactivas", "vencimiento", "sello")
 
-                        # Concluye uso de estacion disp. en medio de origen/destino
-                        medio_de_almacenamiento.espacios_en_uso -= 1
+    def __init__(self, tiempo, orden, minuto):
+        """
+        Define las características principales del grupo de esperas.
 
-                        self.recurso.cola.remove(camion)
-                        medio_de_almacenamiento.cola.remove(camion)
+        :type tiempo: float
+        :type orden: float
+        :type minuto: int
+        """
+        self.tiempo = tiempo
+        self.orden = orden
+        # Número de verificaciones del grupo, con el que se cuentan los minutos de sus esperas
+        self.minuto = minuto
+        self.esperas = []
+        # Posición de la primera espera que aún no verifica en el tiempo actual del grupo
+        self.siguiente = 0
+        # Esperas despertadas o canceladas en el grupo
+        self.inactivas = 0
+        # Minuto del primer vencimiento de paciencia de las esperas del grupo
+        self.vencimiento = None
+        # Identificador de la entrada vigente del grupo en las verificaciones pendientes
+        self.sello = 0
+
+    def agregar(self, esperas, minuto):
+        """
+        Agrega al final del grupo esperas que verificaban en el minuto indicado de su grupo anterior.
 
-                        print str(camion) + " SALE DE SISTEMA - HORA: " + str(sistema.now)
+        :type esperas: list
+        :type minuto: int
+        """
+        desfase = self.minuto - minuto
 
-                        print "\tEn sistema: " + str(self.recurso.cola)
-                        print "\t" + medio_de_almacenamiento.nombre + ":" \
-                              + str(medio_de_almacenamiento.cola)
+        for espera in esperas:
+            espera.grupo = self
+            espera.indice = len(self.esperas)
+            espera.inicio += desfase
+            if espera.vencimiento is not None:
+                espera.vencimiento += desfase
+                if self.vencimiento is None or espera.vencimiento < self.vencimiento:
+                    self.vencimiento = espera.vencimiento
+            self.esperas.append(espera)
 
-                        camion.peso = camion.trailer.level
 
-                        salida = sistema.now
-                        camion.manipulado.succeed()
+class RelojDeEsperas(object):
+    """
+    Clase para el modelado del reloj con el que duermen los camiones en espera.
+    Cada espera reemplaza las verificaciones minuto a minuto del camion, que no se programan como eventos: el reloj
+    ubica la posición que hubiese tenido cada verificación entre los eventos de la cola, y solo programa la
+    verificación en la que el camion despierta, por la emisión de una señal o el vencimiento de su paciencia.
+    """
 
-                        dia = round(sistema.now / (24 * 60) + 0.5)
+    # Separación entre las posiciones de las esperas de un mismo grupo, menor que la que hay entre dos eventos
+    SEPARACION = 1e-6
 
-                        fila_de_datos = [camion.nombre, camion.carga, camion.tipo, camion.peso, self.nombre,
-                                         self.recurso.nombre, dia, arribo, espera_m_od, espera_r, espera_p, espera_t,
-                                         inicio, salida, medio_de_almacenamiento.nombre,
-                                         medio_de_almacenamiento.niveles[camion.carga]]
+    def __init__(self, sistema):
+        """
+        Define las características principales del reloj de esperas.
 
-                        self.datos.append(fila_de_datos)
+        :type sistema: Sistema
+        """
+        self.sistema = sistema
+        # Grupos que aún pueden recibir esperas, por tiempo y orden de su siguiente verificación
+        self.grupos = {}
+        # Verificaciones pendientes de los grupos, ordenadas como los eventos de la cola
+        self.pendientes = []
+        self.sellos = 0
+
+    def dormir(self, senales, minutos=None, inmediata=False):
+        """
+        Genera la espera de un camion que despierta en la verificación siguiente a la emisión de alguna de las
+        señales, o en la que vence su paciencia en minutos. Si es inmediata, despierta en la siguiente
+        verificación.
+
+        :type senales: list
+        :type minutos: int
+        :type inmediata: bool
+        :rtype: Espera
+        """
+        sistema = self.sistema
+        espera = Espera(sistema)
+        # La siguiente verificación se ubica donde se hubiese programado la verificación minuto a minuto
+        grupo = self.grupo(sistema.now + 1, sistema.eventos_programados - 0.5, 1)
 
-                        sistema.exit("Ejecutada")
+        espera.inicio = grupo.minuto - 1
+        if minutos is not None and minutos != float("Inf"):
+            espera.vencimiento = espera.inicio + minutos
+        grupo.agregar([espera], grupo.minuto)
 
-                    else:
+        for senal in senales:
+            senal.suscribir(espera)
 
-                        print " ------------- 2 ---------- NO BORRAR SI SE LEE"
+        if inmediata or espera.vencimiento == grupo.minuto:
+            self.despertar([espera])
 
-                        medio_de_almacenamiento.cola.remove(camion)
-                        self.recurso.cola.remove(camion)
-                        print "%s NO EJECUTADA POR RECURSO" % camion
-                        sistema.exit("No ejecutada por recurso")
+        return espera
 
-            else:
-                # Si no se ejecuta Transbordo en sistema mecanizado (C) no sale de la cola del recurso
-                # porque realizara un primer pesaje en B3
-                # if self.nombre != "Transbordo en sistema mecanizado (C)":
-                #     self.recurso.cola.remove(camion)
-                self.recurso.cola.remove(camion)
-                medio_de_almacenamiento.cola.remove(camion)
-                print str(camion) + " SALE DE SISTEMA SIN EJECUCIÓN - HORA: " + str(sistema.now)
-                print "%s NO EJECUTADA POR PRODUCTO" % camion
-                print "\t" + medio_de_almacenamiento.nombre + " " \
-                      + str(medio_de_almacenamiento.niveles[camion.carga])
-                sistema.exit("No ejecutada por producto")
+    def despertar(self, esperas):
+        """
+        Programa la siguiente verificación de las esperas que aún duermen, en la posición que le corresponde.
 
-        else:
-            print "Camion " + str(camion.nombre) + " - Error, no se definió el medio de origen o destino"
+        :type esperas: list
+        """
+        separacion = self.SEPARACION
 
+        for espera in esperas:
+            if espera.despierta or espera.cancelada:
+                continue
 
-class Recurso(simpy.Resource):
-    """
-    Clase para el modelado de recursos para la ejecucion de operaciones
-    Subclase de simpy.Resource
-    Los recursos pueden ser:
-    - Mano de obra
-    - Maquinaria
-    """
+            grupo = espera.grupo
+            espera.despierta = True
+            grupo.inactivas += 1
+            self.sistema.programar_en(espera, grupo.tiempo, grupo.orden + separacion * (espera.indice + 1),
+                                      grupo.minuto - espera.inicio)
 
-    def __init__(self, sistema, nombre, horario, capacity=1):
+    def cancelar(self, espera):
         """
-        Define las características principales de la clase recurso.
+        Cancela una espera interrumpida, que ya no será despertada.
 
-        :type sistema: Sistema
-        :type nombre: str
-        :type horario: dict
-        :type capacity: int
+        :type espera: Espera
         """
-        super(Recurso, self).__init__(sistema, capacity)
-        self.nombre = nombre
-        self.cola = []
-        self.horario = horario
+        if not espera.despierta and not espera.cancelada:
+            espera.grupo.inactivas += 1
+        espera.cancelada = True
 
-    def cola_detras_de_camion(self, camion):
+    def grupo(self, tiempo, orden, minuto):
         """
-        Genera la cola detrás de un camión siempre que esté en la cola.
+        Obtiene el grupo que verifica en el tiempo y orden indicados, creándolo si no existe.
 
-        :type camion: Camion
+        :type tiempo: float
+        :type orden: float
+        :type minuto: int
+        :rtype: GrupoDeEsperas
         """
+        grupo = self.grupos.get((tiempo, orden))
 
-        if camion in self.cola:
-            return self.cola[self.cola.index(camion) + 1:]
-        else:
-            print "ERROR: " + str(camion) + " no esta en la cola de " + self.nombre
+        if grupo is None:
+            grupo = GrupoDeEsperas(tiempo, orden, minuto)
+            self.grupos[(tiempo, orden)] = grupo
+            self.pendiente(grupo)
 
+        return grupo
 
-class MedioDeAlmacenamiento(simpy.Container):
-    """
-    Clase para el modelado de medios de almacenamiento.
-    Subclase de simpy.Container.
-    """
+    def pendiente(self, grupo):
+        """
+        Registra la siguiente verificación del grupo entre las pendientes.
 
-    def __init__(self, sistema, nombre, espacios_de_atencion, niveles=None, capacity=float('inf'), init=0):
+        :type grupo: GrupoDeEsperas
         """
-        Define las caracteristicas del medio de almacenamiento
+        self.sellos += 1
+        grupo.sello = self.sellos
+        heapq.heappush(self.pendientes, (grupo.tiempo, simpy.events.NORMAL,
+                                         grupo.orden + self.SEPARACION * (grupo.siguiente + 1), grupo.sello, grupo))
 
-        :type sistema: Sistema
-        :type nombre: str
-        :type espacios_de_atencion: int
-        :type niveles: dict
-        :type capacity: float
-        :type init: int
+    def vencer(self, grupo):
         """
+        Despierta las esperas del grupo cuya paciencia vence en su minuto actual.
 
-        super(MedioDeAlmacenamiento, self).__init__(sistema, capacity, init)
-        self.nombre = nombre
-        self.espacios_de_atencion = espacios_de_atencion
-        self.espacios_en_uso = 0
-        self.cola = []
+        :type grupo: GrupoDeEsperas
+        """
+        if grupo.vencimiento != grupo.minuto:
+            return
 
-        if niveles is not None:
-            self.niveles = niveles
-            if sum(self.niveles.values()) > 0:
-                self.get(sum(self.niveles.values()))
-            self.espacio = self.capacity - self.level
+        vencidas = [e for e in grupo.esperas[grupo.siguiente:] if e.vencimiento == grupo.minuto]
+        self.despertar(vencidas)
+        grupo.vencimiento = min([e.vencimiento for e in grupo.esperas[grupo.siguiente:]
+                                 if e.dormida and e.vencimiento is not None] or [None])
 
-    def cargar_producto(self, camion, producto):
+    def antes_de_procesar(self, cola):
         """
-        Simula la carga de producto del almacen a un camión
+        Realiza las verificaciones de las esperas que se ubican antes del siguiente evento de la cola. Las esperas
+        que siguen durmiendo pasan a su verificación del minuto siguiente, ubicada después de los eventos
+        programados hasta el momento.
 
-        :param camion:
-        :param producto:
+        :type cola: list
         """
-        if self.niveles[producto] >= 28:
-            self.get(28) & camion.trailer.put(28)
-            self.niveles[producto] -= 28
-            self.espacio += 28
-        else:
-            print "****ERROR EN CARGA, PRODUCTO NO DISPONIBLE**** " + str(camion)
+        pendientes = self.pendientes
+        separacion = self.SEPARACION
 
-    def descargar_producto(self, camion, producto):
-        """
-        Simula la descarga de producto de un camion al almacén
+        while pendientes:
+            tiempo, _, orden, sello, grupo = pendientes[0]
 
-        :param camion:
-        :param producto:
-        """
-        if (self.capacity - self.level) >= 28:
-            self.put(camion.peso) & camion.trailer.get(camion.peso)
-            self.niveles[producto] += 28
-            self.espacio -= 28
-        else:
-            print "****ERROR DESCARGA, ESPACIO NO DISPONIBLE**** " + str(camion)
+            if sello != grupo.sello:
+                heapq.heappop(pendientes)
+                continue
 
-    def cola_detras_de_camion(self, camion):
-        """
-        Genera la cola detrás de un camión siempre que esté en la cola.
+            if cola:
+                evento = cola[0]
+                if (tiempo, simpy.events.NORMAL, orden) >= evento[:3]:
+                    break
+                siguiente = evento
+            elif any(g.vencimiento is not None for _, _, _, s, g in pendientes if s == g.sello):
+                siguiente = None
+            else:
+                break
 
-        :type camion: Camion
-        """
+            heapq.heappop(pendientes)
+            self.grupos.pop((grupo.tiempo, grupo.orden), None)
+            orden_siguiente = self.sistema.eventos_programados - 0.5
 
-        if camion in self.cola:
-            return self.cola[self.cola.index(camion) + 1:]
-        else:
-            print "ERROR: " + str(camion) + " no esta en la cola de " + self.nombre
+            # Esperas del grupo que verifican antes del siguiente evento
+            esperas = grupo.esperas
+            if siguiente is None or siguiente[0] > tiempo or \
+                    (siguiente[0] == tiempo and siguiente[1] > simpy.events.NORMAL):
+                fin = len(esperas)
+            else:
+                fin = grupo.siguiente
+                while fin < len(esperas) and grupo.orden + separacion * (fin + 1) < siguiente[2]:
+                    fin += 1
+
+            if grupo.siguiente == 0 and fin == len(esperas) and grupo.inactivas == 0:
+                # Todas las esperas siguen durmiendo y el grupo completo pasa al minuto siguiente
+                grupo.tiempo += 1
+                grupo.orden = orden_siguiente
+                grupo.minuto += 1
+                destino = self.grupos.get((grupo.tiempo, grupo.orden))
+
+                if destino is None:
+                    self.grupos[(grupo.tiempo, grupo.orden)] = grupo
+                    self.pendiente(grupo)
+                    self.vencer(grupo)
+                else:
+                    destino.agregar(esperas, grupo.minuto)
+                    self.vencer(destino)
+                continue
+
+            movidas = [e for e in esperas[grupo.siguiente:fin] if e.dormida]
+
+            if fin < len(esperas):
+                # Las esperas restantes verifican después del siguiente evento
+                grupo.siguiente = fin
+                self.pendiente(grupo)
+
+            if movidas:
+                destino = self.grupo(grupo.tiempo + 1, orden_siguiente, grupo.minuto + 1)
+                destino.agregar(movidas, grupo.minuto + 1)
+                self.vencer(destino)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,300 @@
+# coding=utf-8
+import os
+import random
+import shutil
+import sys
+import tempfile
+import unittest
+from StringIO import StringIO
+
+import logix
+
+
+def simular(horizonte, **opciones):
+    """
+    Ejecuta una replica del sistema hasta el horizonte indicado, en minutos.
+
+    :type horizonte: int
+    """
+    sistema = logix.Sistema(**opciones)
+    sistema.iniciar()
+    sistema.run(until=horizonte)
+    return sistema
+
+
+class TestEsperasPorEventos(unittest.TestCase):
+    """Las esperas por eventos deben generar los mismos datos que las esperas minuto a minuto."""
+
+    def verificar_mismos_datos(self, **opciones):
+        for semilla in [55, 7]:
+            por_minuto = simular(24 * 60, semilla=semilla, **opciones)
+            por_eventos = simular(24 * 60, semilla=semilla, esperas_por_eventos=True, **opciones)
+
+            self.assertTrue(por_minuto.datos)
+            self.assertEqual(por_minuto.datos, por_eventos.datos)
+            self.assertEqual(por_minuto.datos_camiones, por_eventos.datos_camiones)
+
+    def test_flujos_independientes(self):
+        self.verificar_mismos_datos()
+
+    def test_flujo_compartido(self):
+        self.verificar_mismos_datos(flujos_independientes=False)
+
+    def test_sin_verificaciones_minuto_a_minuto(self):
+        por_minuto = simular(24 * 60)
+        por_eventos = simular(24 * 60, esperas_por_eventos=True)
+
+        self.assertLess(10 * por_eventos.eventos_programados, por_minuto.eventos_programados)
+
+
+class TestUmbrales(unittest.TestCase):
+    """Una espera en un umbral despierta en la verificación minuto a minuto que sigue a que el nivel lo alcanza."""
+
+    def test_umbral_alcanzado(self):
+        sistema = logix.Sistema(esperas_por_eventos=True)
+        medio = sistema.medios_almacenamiento["Almacen 1"]
+        producto = "Harina de Soya - Hi Pro/Pellet de Soya"
+        camion = logix.Camion(sistema, 1, producto, "Descarga")
+        despertares = []
+
+        def esperar():
+            espera = sistema.reloj_esperas.dormir([])
+            medio.registra_umbral(producto, medio.niveles[producto] + 28, espera)
+            minutos = yield espera
+            despertares.append((minutos, sistema.now))
+
+        def descargar():
+            yield sistema.timeout(2.5)
+            medio.descargar_producto(camion, producto)
+
+        sistema.process(esperar())
+        sistema.process(descargar())
+        sistema.run(until=10)
+
+        self.assertEqual(despertares, [(3, 3)])
+        self.assertEqual(medio.umbrales[producto], [])
+
+
+class TestColaCamiones(unittest.TestCase):
+    """La cola de camiones debe mantener el mismo orden que una lista, aun al agotar el espacio entre etiquetas."""
+
+    def test_adelantos_repetidos(self):
+        cola = logix.ColaCamiones()
+        lista = []
+
+        for camion in range(5):
+            cola.append(camion)
+            lista.append(camion)
+
+        # Cada camion adelantado ocupa la mitad del espacio que queda delante del camion 3
+        for camion in range(5, 45):
+            cola.inserta_antes(camion, 3)
+            lista.insert(lista.index(3), camion)
+
+        cola.inserta_antes(4, 0)
+        lista.remove(4)
+        lista.insert(0, 4)
+
+        self.assertEqual(cola.lista(), lista)
+        for indice, camion in enumerate(lista):
+            self.assertEqual(cola.index(camion), indice)
+            self.assertIs(cola[indice], camion)
+            self.assertEqual(cola.delante_de(camion), lista[:indice])
+            self.assertEqual(cola.detras_de(camion), lista[indice + 1:])
+            self.assertTrue(all(cola.esta_detras(otro, camion) == (lista.index(otro) > indice) for otro in lista))
+        self.assertEqual(cola.primeros(3), lista[:3])
+
+
+class TestSimular(unittest.TestCase):
+    """La simulación debe guardar los mismos datos conserve o no las filas en memoria."""
+
+    def setUp(self):
+        self.directorio = tempfile.mkdtemp()
+        self.salida = sys.stdout
+        sys.stdout = open(os.devnull, "w")
+
+    def tearDown(self):
+        sys.stdout.close()
+        sys.stdout = self.salida
+        shutil.rmtree(self.directorio)
+
+    def leer(self, archivo):
+        with open(archivo, "rb") as csv_file:
+            return csv_file.read()
+
+    def test_sin_conservar_datos(self):
+        en_memoria = os.path.join(self.directorio, "en_memoria.csv")
+        en_registro = os.path.join(self.directorio, "en_registro.csv")
+
+        logix.Sistema().simular("dia", archivo=en_memoria)
+        logix.Sistema(conservar_datos=False).simular("dia", archivo=en_registro)
+
+        self.assertEqual(self.leer(en_memoria), self.leer(en_registro))
+
+    def test_semilla_del_sistema(self):
+        sistema = logix.Sistema(semilla=7)
+        sistema.simular("dia", archivo=os.path.join(self.directorio, "datos.csv"))
+
+        self.assertEqual(sistema.semilla, 7)
+        self.assertEqual(sistema.datos, simular(24 * 60, semilla=7).datos)
+
+    def test_guardar_datos_sin_conservar_datos(self):
+        sistema = logix.Sistema(conservar_datos=False)
+        archivo = os.path.join(self.directorio, "datos.csv")
+        self.assertRaises(ValueError, sistema.guardar_datos, archivo)
+
+
+class TestReplicas(unittest.TestCase):
+    """Las replicas en un grupo de procesos no aceptan objetos cuyos resultados se perderían."""
+
+    def test_perfilador_en_grupo_de_procesos(self):
+        self.assertRaises(ValueError, logix.simular_replicas, "dia", 2, procesos=2, perfilador=logix.Perfilador())
+        self.assertRaises(ValueError, logix.simular_replicas, "dia", 2, procesos=2, traza=logix.Traza())
+
+
+class RegistroEnMemoria(logix.Registro):
+    """Registro que conserva las filas recibidas."""
+
+    def __init__(self):
+        self.filas = []
+
+    def registrar(self, fila_de_datos):
+        self.filas.append(fila_de_datos)
+
+
+class TestPuntoDeControl(unittest.TestCase):
+    """Un sistema restaurado debe continuar la simulación igual que el original."""
+
+    def test_restaurar(self):
+        original = simular(600)
+        punto = original.punto_de_control()
+        original.run(until=1200)
+
+        registro = RegistroEnMemoria()
+        restaurado = punto.restaurar(registros=[registro])
+        restaurado.run(until=1200)
+
+        self.assertEqual(original.datos, restaurado.datos)
+        self.assertEqual(original.datos, registro.filas)
+        self.assertEqual(original.estado(), restaurado.estado())
+
+    def test_restaurar_con_cambio_de_politica(self):
+        restaurado = simular(600).punto_de_control().restaurar(capacidad_sistema=30)
+        restaurado.run(until=900)
+
+        repetido = restaurado.punto_de_control().restaurar()
+
+        self.assertEqual(repetido.capacidad_sistema, 30)
+        self.assertEqual(restaurado.datos, repetido.datos)
+        self.assertEqual(restaurado.estado(), repetido.estado())
+
+    def test_politica_desconocida(self):
+        punto = simular(60).punto_de_control()
+        self.assertRaises(ValueError, punto.restaurar, esperas_por_eventos=True)
+
+
+class TestLlegadas(unittest.TestCase):
+    """Los procesos de llegada deben respetar la tasa indicada."""
+
+    def test_llegadas_uniformes_escaladas(self):
+        for escala in [2, 30]:
+            sistema = logix.Sistema(llegadas=logix.LlegadasUniformes(escala=escala))
+            intervalos = sistema.llegadas.intervalos(sistema)
+            total = sum(next(intervalos) for _ in range(3000))
+
+            self.assertAlmostEqual(total / 3000.0, 10.0 / escala, delta=0.03 * 10.0 / escala)
+
+    def test_perfil_sin_tasas_positivas(self):
+        self.assertRaises(ValueError, logix.LlegadasPorPerfil.desde_horario, "Recepcion", 0, 0)
+        self.assertRaises(ValueError, logix.LlegadasPorPerfil, [0] * 24)
+
+
+def espera_horario_por_llamada(horario, tiempo):
+    """
+    Aplica el horario de atención tal como se calculaba en cada llamada antes de compilar los calendarios.
+
+    :type horario: dict
+    :type tiempo: float
+    """
+    dia = round(tiempo / (24 * 60) + 0.5)
+    t_dia = tiempo - 24 * 60 * (dia - 1)
+
+    if dia % 6 != 0:
+        if t_dia < horario["L-V"]["Ingreso"] * 60:
+            return int(horario["L-V"]["Ingreso"] * 60 - t_dia), False
+        elif horario["L-V"]["I. Descanso"] * 60 <= t_dia < horario["L-V"]["F. Descanso"] * 60:
+            return int(horario["L-V"]["F. Descanso"] * 60 - t_dia), False
+        elif t_dia >= horario["L-V"]["Salida"] * 60:
+            if dia % 5 != 0:
+                return int((horario["L-V"]["Ingreso"] + 24) * 60 - t_dia), True
+            else:
+                return int((horario["SAB"]["Ingreso"] + 24) * 60 - t_dia), True
+    else:
+        if t_dia < horario["SAB"]["Ingreso"] * 60:
+            return int(horario["SAB"]["Ingreso"] * 60 - t_dia), False
+        elif t_dia >= horario["SAB"]["Salida"] * 60:
+            return int((horario["L-V"]["Ingreso"] + 24) * 60 - t_dia), True
+
+    return None, False
+
+
+class TestCalendario(unittest.TestCase):
+    """El calendario compilado debe dar la misma espera que la regla calculada en cada llamada."""
+
+    def test_espera_en_cada_minuto(self):
+        configuracion = logix.cargar_configuracion()
+        horarios = configuracion.crear_horarios()
+        self.assertEqual(len(horarios), 2)
+
+        # Dos ciclos de 30 dias, para cubrir tambien el paso de un ciclo al siguiente
+        for nombre, horario in horarios.items():
+            calendario = configuracion.calendarios[nombre]
+            for minuto in range(2 * logix.Calendario.DIAS_CICLO * 24 * 60):
+                self.assertEqual(calendario.espera(float(minuto)), espera_horario_por_llamada(horario, float(minuto)),
+                                 "%s en el minuto %s" % (nombre, minuto))
+
+
+class TestEstadisticaEnLinea(unittest.TestCase):
+    """Las estadisticas en linea deben coincidir con las calculadas sobre la muestra completa."""
+
+    def setUp(self):
+        generador = random.Random(1)
+        self.muestra = [generador.expovariate(1 / 30.0) for _ in range(20000)]
+        self.estadistica = logix.EstadisticaEnLinea((0.5, 0.9, 0.95))
+        for valor in self.muestra:
+            self.estadistica.agregar(valor)
+
+    def test_media_y_varianza(self):
+        # Cálculo en dos pasadas: primero la media y luego la suma de cuadrados de las desviaciones
+        media = sum(self.muestra) / len(self.muestra)
+        varianza = sum((valor - media) ** 2 for valor in self.muestra) / (len(self.muestra) - 1)
+
+        self.assertEqual(self.estadistica.cantidad, len(self.muestra))
+        self.assertAlmostEqual(self.estadistica.media, media, delta=1e-9 * media)
+        self.assertAlmostEqual(self.estadistica.varianza(), varianza, delta=1e-9 * varianza)
+        self.assertEqual(self.estadistica.minimo, min(self.muestra))
+        self.assertEqual(self.estadistica.maximo, max(self.muestra))
+
+    def test_cuantiles_p2(self):
+        ordenada = sorted(self.muestra)
+
+        for probabilidad in (0.5, 0.9, 0.95):
+            exacto = ordenada[int(round(probabilidad * (len(ordenada) - 1)))]
+            self.assertAlmostEqual(self.estadistica.cuantil(probabilidad), exacto, delta=0.003 * exacto)
+
+
+class TestTraza(unittest.TestCase):
+    """Por defecto la traza solo registra los errores."""
+
+    def test_errores_por_defecto(self):
+        salida = StringIO()
+        traza = logix.Traza(salida=salida)
+
+        traza.registrar("operacion", logix.Traza.INFO, "%s Inicio", "1DHP")
+        traza.registrar("error", logix.Traza.ERROR, "ERROR %s NO FUE MANIPULADO", "1DHP")
+
+        self.assertEqual(salida.getvalue(), "ERROR 1DHP NO FUE MANIPULADO\n")
+
+
+if __name__ == "__main__":
+    unittest.main()